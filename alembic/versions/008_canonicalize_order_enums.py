@@ -0,0 +1,28 @@
+"""Canonicalize order status/side/type casing.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Order.status/side are stored upper-case and Order.type lower-case so lookups
+    # can use plain equality (and the indexes on those columns) instead of UPPER().
+    op.execute("UPDATE orders SET status = UPPER(status) WHERE status <> UPPER(status)")
+    op.execute("UPDATE orders SET side = UPPER(side) WHERE side <> UPPER(side)")
+    op.execute("UPDATE orders SET type = LOWER(type) WHERE type <> LOWER(type)")
+
+
+def downgrade() -> None:
+    # Casing normalization is not reversible; the canonical values remain valid.
+    pass
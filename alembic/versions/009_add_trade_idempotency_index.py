@@ -0,0 +1,23 @@
+"""Add composite index for SL/TP exit idempotency lookups.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_trades_idem", "trades", ["symbol", "exit_ts", "exit_reason"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trades_idem", table_name="trades")
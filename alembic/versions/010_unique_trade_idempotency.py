@@ -0,0 +1,46 @@
+"""Make the SL/TP exit idempotency key unique (partial: SL/TP exits only).
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the earliest of any duplicated SL/TP exit before enforcing uniqueness.
+    # Manual and netting closes may legitimately share a candle and are left alone.
+    op.execute(
+        """
+        DELETE FROM trades
+        WHERE exit_reason IN ('stop_loss', 'take_profit')
+          AND id NOT IN (
+            SELECT MIN(id) FROM trades
+            WHERE exit_reason IN ('stop_loss', 'take_profit')
+            GROUP BY symbol, exit_ts, exit_reason
+        )
+        """
+    )
+    op.drop_index("ix_trades_idem", table_name="trades")
+    op.create_index(
+        "uq_trade_idem",
+        "trades",
+        ["symbol", "exit_ts", "exit_reason"],
+        unique=True,
+        postgresql_where=sa.text("exit_reason IN ('stop_loss', 'take_profit')"),
+        sqlite_where=sa.text("exit_reason IN ('stop_loss', 'take_profit')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_trade_idem", table_name="trades")
+    op.create_index("ix_trades_idem", "trades", ["symbol", "exit_ts", "exit_reason"])
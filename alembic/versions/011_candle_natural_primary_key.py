@@ -0,0 +1,49 @@
+"""Use (symbol, timeframe, open_time) as the candles primary key.
+
+Drops the surrogate id column and the indexes the composite key makes
+redundant, and adds a BRIN index for open_time range scans.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_candle_lookup", table_name="candles")
+    op.drop_index("ix_candle_open_time", table_name="candles")
+    op.drop_index("ix_candle_timeframe", table_name="candles")
+    op.drop_index("ix_candle_symbol", table_name="candles")
+    op.drop_constraint("candles_pkey", "candles", type_="primary")
+    op.drop_column("candles", "id")
+    op.drop_constraint("uq_candle_time", "candles", type_="unique")
+    op.create_primary_key("candles_pkey", "candles", ["symbol", "timeframe", "open_time"])
+    op.create_index(
+        "ix_candle_open_time_brin",
+        "candles",
+        ["open_time"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_candle_open_time_brin", table_name="candles")
+    op.drop_constraint("candles_pkey", "candles", type_="primary")
+    op.create_unique_constraint("uq_candle_time", "candles", ["symbol", "timeframe", "open_time"])
+    op.add_column("candles", sa.Column("id", sa.Integer(), sa.Identity(), nullable=False))
+    op.create_primary_key("candles_pkey", "candles", ["id"])
+    op.create_index("ix_candle_symbol", "candles", ["symbol"])
+    op.create_index("ix_candle_timeframe", "candles", ["timeframe"])
+    op.create_index("ix_candle_open_time", "candles", ["open_time"])
+    op.create_index("ix_candle_lookup", "candles", ["symbol", "timeframe", "open_time"], unique=False)
@@ -0,0 +1,78 @@
+"""Range-partition candles by month on open_time.
+
+Existing rows are copied into monthly partitions covering their range (and the
+current month onward). Retention then drops whole partitions instead of
+deleting rows.
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def _month_start(ts: datetime) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE candles RENAME TO candles_unpartitioned")
+    op.execute("ALTER INDEX candles_pkey RENAME TO candles_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_candle_open_time_brin RENAME TO ix_candle_unpartitioned_open_time_brin")
+    op.execute(
+        "CREATE TABLE candles (LIKE candles_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (open_time)"
+    )
+    op.execute("ALTER TABLE candles ADD CONSTRAINT candles_pkey PRIMARY KEY (symbol, timeframe, open_time)")
+    op.execute(
+        "CREATE INDEX ix_candle_open_time_brin ON candles USING brin (open_time) WITH (pages_per_range = 32)"
+    )
+
+    bind = op.get_bind()
+    earliest = bind.execute(sa.text("SELECT min(open_time) FROM candles_unpartitioned")).scalar()
+    now = datetime.now(timezone.utc)
+    month = _month_start(earliest or now)
+    stop = _next_month(_month_start(now))
+    while month <= stop:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE candles_{month.year:04d}_{month.month:02d} PARTITION OF candles "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    op.execute("INSERT INTO candles SELECT * FROM candles_unpartitioned")
+    op.execute("DROP TABLE candles_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE candles RENAME TO candles_partitioned")
+    op.execute("ALTER INDEX candles_pkey RENAME TO candles_partitioned_pkey")
+    op.execute("ALTER INDEX ix_candle_open_time_brin RENAME TO ix_candle_partitioned_open_time_brin")
+    op.execute(
+        "CREATE TABLE candles (LIKE candles_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("ALTER TABLE candles ADD CONSTRAINT candles_pkey PRIMARY KEY (symbol, timeframe, open_time)")
+    op.execute(
+        "CREATE INDEX ix_candle_open_time_brin ON candles USING brin (open_time) WITH (pages_per_range = 32)"
+    )
+    op.execute("INSERT INTO candles SELECT * FROM candles_partitioned")
+    op.execute("DROP TABLE candles_partitioned")
@@ -0,0 +1,29 @@
+"""Add a composite (symbol, status, ts DESC) index for the OMS order list.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Status casing was canonicalized in 008, so the filter is a plain equality.
+    op.create_index(
+        "ix_orders_symbol_status_ts",
+        "orders",
+        ["symbol", "status", sa.text("ts DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_symbol_status_ts", table_name="orders")
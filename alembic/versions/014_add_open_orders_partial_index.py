@@ -0,0 +1,31 @@
+"""Add a partial index over open (NEW) orders.
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Status is canonical upper-case (008), so the predicate matches every open order.
+    op.create_index(
+        "ix_orders_open_ts",
+        "orders",
+        [sa.text("ts DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("status = 'NEW'"),
+        sqlite_where=sa.text("status = 'NEW'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_open_ts", table_name="orders")
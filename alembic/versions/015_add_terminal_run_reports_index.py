@@ -0,0 +1,31 @@
+"""Add a partial index over terminal (OK/NOOP) run reports.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the orchestrator's per-cycle idempotency check for finished runs.
+    op.create_index(
+        "ix_run_reports_terminal",
+        "run_reports",
+        ["symbol", "timeframe", "candle_ts"],
+        postgresql_where=sa.text("status IN ('OK', 'NOOP')"),
+        sqlite_where=sa.text("status IN ('OK', 'NOOP')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_reports_terminal", table_name="run_reports")
@@ -0,0 +1,43 @@
+"""Store run report payloads as JSONB.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+_PAYLOAD_COLUMNS = ("intent_json", "risk_json", "order_json", "fill_json", "positions_json", "account_json")
+
+
+def upgrade() -> None:
+    for column in _PAYLOAD_COLUMNS:
+        op.alter_column(
+            "run_reports",
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+
+
+def downgrade() -> None:
+    for column in _PAYLOAD_COLUMNS:
+        op.alter_column(
+            "run_reports",
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
@@ -31,6 +31,11 @@ class Config:
     INITIAL_BACKFILL_DAYS: int = 7
     MARKET_DATA_PROVIDER: str = os.getenv("MARKET_DATA_PROVIDER", "mock")
     CANDLE_RETENTION_DAYS: int = 180
+    LATEST_CANDLE_CACHE_TTL_SEC: float = float(os.getenv("LATEST_CANDLE_CACHE_TTL_SEC", "5.0"))
+    CANDLE_WINDOW_CACHE_TTL_SEC: float = float(os.getenv("CANDLE_WINDOW_CACHE_TTL_SEC", "5.0"))
+    # "durable" waits for every commit to reach disk; "batch" lets the database
+    # flush commits in the background (backtests, where rows can be regenerated).
+    PERSIST_MODE: str = os.getenv("PERSIST_MODE", "durable")
     # Execution parameters
     SPREAD_PIPS: float = float(os.getenv("SPREAD_PIPS", "1.0"))
     EXECUTION_SLIPPAGE_PIPS: float = float(os.getenv("EXECUTION_SLIPPAGE_PIPS", "0.0"))
@@ -203,6 +208,9 @@ class Config:
         if cls.MARGIN_MODE != "simple":
             raise ValueError("MARGIN_MODE must be 'simple'")
 
+        if cls.PERSIST_MODE not in ("durable", "batch"):
+            raise ValueError("PERSIST_MODE must be 'durable' or 'batch'")
+
         try:
             oms_min_qty = float(os.getenv("OMS_MIN_QTY", str(cls.OMS_MIN_QTY)))
             if oms_min_qty <= 0:
@@ -22,9 +22,9 @@ class MarginCheckResult:
 
 
 def derive_bid_ask(candle: Candle, spread_pips: float) -> tuple[float, float]:
-    mid = float(candle.close)
-    spread_price = spread_pips * PIP_VALUE
-    return mid - spread_price / 2.0, mid + spread_price / 2.0
+    mid = candle.close
+    half_spread = spread_pips * PIP_VALUE / 2.0
+    return mid - half_spread, mid + half_spread
 
 
 def _position_mark_price(qty_signed: float, bid: float, ask: float) -> float:
@@ -86,14 +86,24 @@ async def compute_margin_used(session: AsyncSession, candle: Candle) -> float:
     return margin_used
 
 
-async def compute_account_state(session: AsyncSession, candle: Candle) -> dict:
-    """Compute account state for a candle without persisting snapshots."""
-    acct = await _ensure_account(session, candle.open_time)
+async def compute_account_state(
+    session: AsyncSession,
+    candle: Candle,
+    acct: Optional[Account] = None,
+    positions: Optional[list[Position]] = None,
+) -> dict:
+    """Compute account state for a candle without persisting snapshots.
+
+    Callers that already hold the account row or the positions can pass them to skip the lookups.
+    """
+    if acct is None:
+        acct = await _ensure_account(session, candle.open_time)
     bid, ask = derive_bid_ask(candle, Config.SPREAD_PIPS)
 
-    stmt_pos = select(Position)
-    res_pos = await session.execute(stmt_pos)
-    positions = list(res_pos.scalars().all())
+    if positions is None:
+        stmt_pos = select(Position)
+        res_pos = await session.execute(stmt_pos)
+        positions = list(res_pos.scalars().all())
 
     unrealized = 0.0
     margin_used = 0.0
@@ -0,0 +1,52 @@
+"""Scalar kernels for batched SL/TP sweeps.
+
+Inputs are parallel float sequences (one entry per position/candle pair) so the
+hot loop only touches local floats, never ORM attributes. A missing stop loss or
+take profit is passed as NaN, which fails every comparison and needs no branch.
+Longs and shorts share one code path: prices are multiplied by the position's
+direction (+1/-1) so every level check becomes the same pair of comparisons.
+"""
+from typing import Sequence
+
+NO_TRIGGER = 0
+STOP_LOSS = 1
+TAKE_PROFIT = 2
+
+EXIT_REASONS = {STOP_LOSS: "stop_loss", TAKE_PROFIT: "take_profit"}
+
+# Indexed [sl_hit][tp_hit]; stop loss wins when both levels are hit.
+_TRIGGER_BY_HITS = ((NO_TRIGGER, TAKE_PROFIT), (STOP_LOSS, STOP_LOSS))
+
+
+def scan_triggers(
+    qty: Sequence[float],
+    avg: Sequence[float],
+    sl: Sequence[float],
+    tp: Sequence[float],
+    high: Sequence[float],
+    low: Sequence[float],
+    close: Sequence[float],
+    half_spread: float,
+) -> tuple[list[int], list[float], list[float]]:
+    """Evaluate SL/TP hits for each pair.
+
+    Returns (trigger, exit_price, pnl) lists where trigger is NO_TRIGGER,
+    STOP_LOSS or TAKE_PROFIT. Stop loss wins when both levels are inside the
+    candle range. Longs exit at bid, shorts at ask.
+    """
+    triggers: list[int] = []
+    exit_prices: list[float] = []
+    pnls: list[float] = []
+    for q, a, s, t, h, l, c in zip(qty, avg, sl, tp, high, low, close):
+        is_short = q <= 0
+        d = 1.0 - 2.0 * is_short
+        # Adverse extreme is the low for longs and the high for shorts.
+        adverse = (l, h)[is_short]
+        favourable = (h, l)[is_short]
+        trigger = _TRIGGER_BY_HITS[d * adverse <= d * s][d * favourable >= d * t]
+        price = c - d * half_spread
+        triggers.append(trigger)
+        exit_prices.append(price)
+        # Short pnl (a - price) * -q equals (price - a) * q, so one formula covers both.
+        pnls.append((price - a) * q * (trigger != NO_TRIGGER))
+    return triggers, exit_prices, pnls
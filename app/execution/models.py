@@ -1,11 +1,42 @@
 """SQLAlchemy models for execution/paper broker."""
 from datetime import datetime
+from enum import Enum
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, ForeignKey, PrimaryKeyConstraint, UniqueConstraint
+    Column, Integer, String, Float, DateTime, ForeignKey, Index, PrimaryKeyConstraint, UniqueConstraint
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from app.marketdata.models import Base
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column, text
+
+
+class OrderStatus(str, Enum):
+    NEW = "NEW"
+    FILLED = "FILLED"
+    REJECTED = "REJECTED"
+    CANCELED = "CANCELED"
+
+
+class CanonicalString(TypeDecorator):
+    """String column that stores values in one canonical case.
+
+    Bound values (inserts, updates and WHERE comparisons) are case-folded, so
+    queries can use plain equality instead of wrapping the column in UPPER().
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, length: int, *, upper: bool = True):
+        super().__init__(length)
+        self.upper = upper
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, str):
+            return value.upper() if self.upper else value.lower()
+        return value
 
 
 class Account(Base):
@@ -30,15 +61,32 @@ class Order(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     ts = Column(DateTime(timezone=True), nullable=False, default=func.now())
     symbol = Column(String(20), nullable=False)
-    side = Column(String(4), nullable=False)  # 'BUY' or 'SELL'
-    type = Column(String(20), nullable=False, default="market")
+    side = Column(CanonicalString(4), nullable=False)  # 'BUY' or 'SELL'
+    type = Column(CanonicalString(20, upper=False), nullable=False, default="market")
     qty = Column(Float, nullable=False)
-    status = Column(String(20), nullable=False, default="filled")
+    status = Column(CanonicalString(20), nullable=False, default=OrderStatus.FILLED.value)
     reason = Column(String(255), nullable=True)
     requested_price = Column(Float, nullable=True)
     idempotency_key = Column(String(128), nullable=True)
 
 
+# Serves the OMS order list: optional symbol/status filters, newest first
+Index("ix_orders_symbol_status_ts", Order.symbol, Order.status, Order.ts.desc())
+# Partial index over the small set of open orders: the NEW-order listing and the
+# execution sweep (ts, id ascending, read as a backward scan) seek only these rows
+_OPEN_ORDER_PREDICATE = text("status = 'NEW'")
+# Query-side form of the predicate. 'NEW' is rendered inline rather than bound so
+# the planner can match the partial index even under generic prepared plans.
+OPEN_ORDER_FILTER = Order.status == literal_column("'NEW'")
+Index(
+    "ix_orders_open_ts",
+    Order.ts.desc(),
+    Order.id.desc(),
+    postgresql_where=_OPEN_ORDER_PREDICATE,
+    sqlite_where=_OPEN_ORDER_PREDICATE,
+)
+
+
 class Fill(Base):
     __tablename__ = "fills"
     __table_args__ = (
@@ -88,6 +136,20 @@ class Trade(Base):
     exit_order_id = Column(Integer, ForeignKey("orders.id", ondelete="SET NULL"), nullable=True)
 
 
+# One SL/TP exit per candle and reason; SL/TP inserts use ON CONFLICT DO NOTHING against it.
+# Manual and netting closes are excluded: several partial closes may share a candle.
+SLTP_EXIT_PREDICATE = text("exit_reason IN ('stop_loss', 'take_profit')")
+Index(
+    "uq_trade_idem",
+    Trade.symbol,
+    Trade.exit_ts,
+    Trade.exit_reason,
+    unique=True,
+    postgresql_where=SLTP_EXIT_PREDICATE,
+    sqlite_where=SLTP_EXIT_PREDICATE,
+)
+
+
 class AccountSnapshot(Base):
     __tablename__ = "account_snapshots"
     __table_args__ = (
@@ -18,11 +18,9 @@ class PricingModel:
 
     @staticmethod
     def quote(candle, spread_pips: float) -> tuple[float, float]:
-        mid = float(candle.open)
-        spread = float(spread_pips) * PIP_VALUE_EURUSD
-        bid = mid - (spread / 2.0)
-        ask = mid + (spread / 2.0)
-        return bid, ask
+        mid = candle.open
+        half_spread = spread_pips * PIP_VALUE_EURUSD / 2.0
+        return mid - half_spread, mid + half_spread
 
     @staticmethod
     def apply_slippage(side: str, bid: float, ask: float, slippage_pips: float) -> float:
@@ -1,23 +1,113 @@
 """Paper broker execution service."""
 import logging
+import time
+import weakref
+from collections import defaultdict
 from contextlib import asynccontextmanager
 from typing import Optional, Tuple
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Config
 from app.equity.service import compute_account_state, compute_additional_margin_for_netting
 from app.execution.engine import CandleInput, ExecutionEngine, OrderInput
-from app.execution.models import Account, Order, Fill, Position, Trade
+from app.execution.kernels import EXIT_REASONS, NO_TRIGGER, scan_triggers
+from app.execution.models import (
+    OPEN_ORDER_FILTER,
+    SLTP_EXIT_PREDICATE,
+    Account,
+    Order,
+    OrderStatus,
+    Fill,
+    Position,
+    Trade,
+)
+from app.marketdata import latest_cache
 from app.marketdata.models import Candle
+from app.marketdata.write_hooks import on_table_write
 
 logger = logging.getLogger(__name__)
 
 
 PIP_VALUE = 0.0001  # EURUSD pip size
+ACCOUNT_ID = 1  # singleton paper-trading account
+_NAN = float("nan")
+# Canonical side lookup; a dict hit avoids str.upper() for the spellings callers actually send.
+_SIDES = {"BUY": "BUY", "buy": "BUY", "SELL": "SELL", "sell": "SELL"}
+PENDING_ORDERS_BATCH_SIZE = 100  # rows fetched per round trip when streaming NEW orders
+KNOWN_SERIES_TTL_SECONDS = 60.0  # staleness bound for the has-market-data cache
+MTM_CACHE_MAX_ENTRIES = 256  # per engine; bid/ask only move once per candle
+MTM_CACHE_TTL_SECONDS = 2.0  # staleness bound for account/position writes by other processes
+
+# Hot-path lookups are built once at import and bound per call; only the
+# parameters change, so there is no per-call Core construction.
+_LATEST_CANDLE_STMT = (
+    select(Candle)
+    .where(Candle.symbol == bindparam("symbol"), Candle.timeframe == bindparam("timeframe"))
+    .order_by(Candle.open_time.desc())
+    .limit(1)
+)
+_NEXT_CANDLE_STMT = (
+    select(Candle)
+    .where(
+        Candle.symbol == bindparam("symbol"),
+        Candle.timeframe == bindparam("timeframe"),
+        Candle.open_time > bindparam("after"),
+    )
+    .order_by(Candle.open_time.asc())
+    .limit(1)
+)
+_CANDLE_AT_STMT = select(Candle).where(
+    Candle.symbol == bindparam("symbol"),
+    Candle.timeframe == bindparam("timeframe"),
+    Candle.open_time == bindparam("open_time"),
+)
+_POS_BY_SYMBOL = select(Position).where(Position.symbol == bindparam("sym"))
+_POS_BY_SYMBOL_FOR_UPDATE = _POS_BY_SYMBOL.with_for_update()
+_POS_BY_SYMBOLS = select(Position).where(Position.symbol.in_(bindparam("syms", expanding=True)))
+_POS_BY_SYMBOLS_FOR_UPDATE = _POS_BY_SYMBOLS.with_for_update()
+_ACCOUNT_BY_ID = select(Account).where(Account.id == ACCOUNT_ID)
+_ACCOUNT_FOR_UPDATE = _ACCOUNT_BY_ID.with_for_update()
+_ORDER_BY_ID = select(Order).where(Order.id == bindparam("order_id"))
+_ORDER_BY_ID_FOR_UPDATE = _ORDER_BY_ID.with_for_update()
+_ORDER_BY_IDEMPOTENCY_KEY = select(Order).where(Order.idempotency_key == bindparam("idempotency_key"))
+_FILL_BY_ORDER = select(Fill).where(Fill.order_id == bindparam("order_id"))
+# Account and the symbol's position are independent rows; one LEFT JOIN reads both.
+_ACCOUNT_WITH_POSITION_STMT = (
+    select(Account, Position)
+    .select_from(Account)
+    .outerjoin(Position, Position.symbol == bindparam("symbol"))
+    .where(Account.id == ACCOUNT_ID)
+)
+_ANY_CANDLE_STMT = (
+    select(Candle.open_time)
+    .where(Candle.symbol == bindparam("symbol"), Candle.timeframe == bindparam("timeframe"))
+    .limit(1)
+)
+
+# Per-engine cache of (symbol, timeframe) -> (checked_at, has_candles). Keyed by
+# engine so separate databases (e.g. test fixtures) never share answers.
+_known_series_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Per-engine cache of (symbol, bid, ask) -> (cached_at, mark_to_market result). Any
+# write to the tables it is derived from (orders fill into positions and the balance)
+# drops the engine's entries and bumps its generation; a read that overlapped such a
+# write (generation changed while it ran) is not stored.
+_mtm_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_mtm_generation: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _invalidate_mtm(bind) -> None:
+    _mtm_cache.pop(bind, None)
+    _mtm_generation[bind] = _mtm_generation.get(bind, 0) + 1
+
+
+on_table_write(("orders", "positions", "accounts"), _invalidate_mtm)
 
 
 @asynccontextmanager
@@ -35,17 +125,25 @@ def _supports_for_update(session: AsyncSession) -> bool:
     return bind is not None and bind.dialect.name == "postgresql"
 
 
-def _maybe_for_update(session: AsyncSession, stmt):
-    return stmt.with_for_update() if _supports_for_update(session) else stmt
+def _pick_for_update(session: AsyncSession, stmt, stmt_for_update):
+    """Choose between prebuilt plain and FOR UPDATE variants of a statement."""
+    return stmt_for_update if _supports_for_update(session) else stmt
+
+
+def _dialect_insert(session: AsyncSession, model):
+    """Return an INSERT construct that supports ON CONFLICT for the bound dialect."""
+    bind = session.get_bind()
+    if bind is not None and bind.dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
 
 
 def derive_bid_ask(candle: Candle, spread_pips: float) -> tuple[float, float]:
     """Derive bid/ask from candle close (mid) and spread in pips."""
-    mid = float(candle.close)
-    spread_price = spread_pips * PIP_VALUE
-    bid = mid - spread_price / 2.0
-    ask = mid + spread_price / 2.0
-    return bid, ask
+    # Candle prices are Float columns already; no per-call coercion needed.
+    mid = candle.close
+    half_spread = spread_pips * PIP_VALUE / 2.0
+    return mid - half_spread, mid + half_spread
 
 
 def _build_trade(
@@ -73,30 +171,52 @@ def _build_trade(
     )
 
 
+async def _series_has_candles(session: AsyncSession, symbol: str, timeframe: str) -> bool:
+    """Return whether any candle exists for symbol/timeframe, cached for a short TTL."""
+    bind = session.get_bind()
+    series = _known_series_cache.setdefault(bind, {})
+    key = (symbol, timeframe)
+    now = time.monotonic()
+    cached = series.get(key)
+    if cached is not None and now - cached[0] < KNOWN_SERIES_TTL_SECONDS:
+        return cached[1]
+
+    res_any = await session.execute(_ANY_CANDLE_STMT, {"symbol": symbol, "timeframe": timeframe})
+    has_candles = res_any.scalar_one_or_none() is not None
+    series[key] = (now, has_candles)
+    return has_candles
+
+
 async def _get_latest_candle(session: AsyncSession, symbol: str, timeframe: str) -> Optional[Candle]:
-    stmt = (
-        select(Candle)
-        .where(Candle.symbol == symbol, Candle.timeframe == timeframe)
-        .order_by(Candle.open_time.desc())
-        .limit(1)
-    )
-    res = await session.execute(stmt)
-    return res.scalar_one_or_none()
+    bind = session.get_bind()
+    cached = latest_cache.get(bind, symbol, timeframe)
+    if cached is not None:
+        return cached
 
+    res = await session.execute(_LATEST_CANDLE_STMT, {"symbol": symbol, "timeframe": timeframe})
+    candle = res.scalar_one_or_none()
+    if candle is not None:
+        latest_cache.set(bind, candle)
+    return candle
 
-async def _ensure_account_row(session: AsyncSession, for_update: bool = False) -> Account:
-    stmt = select(Account).limit(1)
+
+async def _get_account_row(session: AsyncSession, for_update: bool) -> Optional[Account]:
     if for_update:
-        stmt = _maybe_for_update(session, stmt)
+        stmt = _pick_for_update(session, _ACCOUNT_BY_ID, _ACCOUNT_FOR_UPDATE)
+        res = await session.execute(stmt)
+        return res.scalar_one_or_none()
+    # Served from the identity map after the first load in this session.
+    return await session.get(Account, ACCOUNT_ID)
 
-    res = await session.execute(stmt)
-    acct = res.scalar_one_or_none()
+
+async def _ensure_account_row(session: AsyncSession, for_update: bool = False) -> Account:
+    acct = await _get_account_row(session, for_update)
     if acct is not None:
         return acct
 
     # Singleton account row.
     acct = Account(
-        id=1,
+        id=ACCOUNT_ID,
         balance=Config.INITIAL_BALANCE,
         equity=Config.INITIAL_BALANCE,
         margin_used=0.0,
@@ -111,13 +231,21 @@ async def _ensure_account_row(session: AsyncSession, for_update: bool = False) -
             await session.flush()
         return acct
     except IntegrityError:
-        res_retry = await session.execute(stmt)
-        acct_retry = res_retry.scalar_one_or_none()
+        acct_retry = await _get_account_row(session, for_update)
         if acct_retry is None:
             raise
         return acct_retry
 
 
+async def _apply_realized_pnl(session: AsyncSession, pnl: float) -> None:
+    """Add realized pnl to the singleton account balance server-side."""
+    stmt = update(Account).where(Account.id == ACCOUNT_ID).values(balance=Account.balance + pnl)
+    res = await session.execute(stmt)
+    if res.rowcount == 0:
+        await _ensure_account_row(session, for_update=True)
+        await session.execute(stmt)
+
+
 async def ensure_account(session: AsyncSession) -> Account:
     async with _transaction_scope(session):
         return await _ensure_account_row(session)
@@ -138,198 +266,285 @@ async def place_market_order(
 
     Returns (order, fill).
     """
-    side_upper = side.upper()
-
-    # Retry once if concurrent position creation causes an integrity race.
-    for attempt in range(2):
-        try:
-            order: Optional[Order] = None
-            fill: Optional[Fill] = None
-
-            async with _transaction_scope(session):
-                if idempotency_key:
-                    stmt_existing_order = select(Order).where(Order.idempotency_key == idempotency_key)
-                    res_existing_order = await session.execute(stmt_existing_order)
-                    existing_order = res_existing_order.scalar_one_or_none()
-                    if existing_order is not None:
-                        stmt_existing_fill = select(Fill).where(Fill.order_id == existing_order.id)
-                        res_existing_fill = await session.execute(stmt_existing_fill)
-                        existing_fill = res_existing_fill.scalar_one_or_none()
-                        if existing_fill is None:
-                            raise RuntimeError("Idempotency key matched order without fill")
-                        return existing_order, existing_fill
-
-                candle = await _get_latest_candle(session, symbol, Config.TIMEFRAME)
-                if candle is None:
-                    raise RuntimeError(
-                        "No market data available for fills: deterministic execution requires latest candle.open_time"
-                    )
+    side_upper = _SIDES.get(side) or _SIDES.get(side.upper())
+    if side_upper is None:
+        raise RuntimeError(f"Unsupported side for deterministic execution: {side}")
 
-                bid, ask = derive_bid_ask(candle, Config.SPREAD_PIPS)
-                fill_price = ask if side_upper == "BUY" else bid
-
-                stmt_pos = _maybe_for_update(session, select(Position).where(Position.symbol == symbol))
-                res_pos = await session.execute(stmt_pos)
-                pos = res_pos.scalar_one_or_none()
-                qty_signed = qty if side_upper == "BUY" else -qty
-                current_qty = pos.qty_signed if pos is not None else 0.0
-
-                mtm_state = await compute_account_state(session, candle)
-                acct_locked = await _ensure_account_row(session, for_update=True)
-                additional_margin = compute_additional_margin_for_netting(
-                    current_qty_signed=current_qty,
-                    order_qty_signed=qty_signed,
-                    fill_price=fill_price,
-                    leverage=acct_locked.leverage,
-                )
-                free_margin = float(mtm_state["free_margin"])
-                if free_margin < additional_margin:
-                    raise RuntimeError(
-                        f"Insufficient free margin: required={additional_margin:.6f}, free={free_margin:.6f}"
-                    )
+    async with _transaction_scope(session):
+        if idempotency_key:
+            existing_pair = await _find_idempotent_order(session, idempotency_key)
+            if existing_pair is not None:
+                return existing_pair
+
+        candle = await _get_latest_candle(session, symbol, Config.TIMEFRAME)
+        if candle is None:
+            raise RuntimeError(
+                "No market data available for fills: deterministic execution requires latest candle.open_time"
+            )
 
-                if existing_order_id is not None:
-                    stmt_order = _maybe_for_update(session, select(Order).where(Order.id == existing_order_id))
-                    res_order = await session.execute(stmt_order)
-                    order = res_order.scalar_one_or_none()
-                    if order is None:
-                        raise RuntimeError(f"existing_order_id {existing_order_id} not found")
-                    if order.status.upper() == "FILLED":
-                        stmt_existing_fill = select(Fill).where(Fill.order_id == order.id)
-                        res_existing_fill = await session.execute(stmt_existing_fill)
-                        existing_fill = res_existing_fill.scalar_one_or_none()
-                        if existing_fill is None:
-                            raise RuntimeError("FILLED order exists without fill row")
-                        return order, existing_fill
-                    order.symbol = symbol
-                    order.side = side_upper
-                    order.qty = qty
-                    order.reason = reason
-                    order.status = "FILLED"
-                    order.ts = candle.open_time
-                    if idempotency_key is not None:
-                        order.idempotency_key = idempotency_key
-                    await session.flush()
-                else:
-                    order = Order(
-                        symbol=symbol,
-                        side=side_upper,
-                        qty=qty,
-                        reason=reason,
-                        status="filled",
-                        ts=candle.open_time,
-                        idempotency_key=idempotency_key,
-                    )
-                    session.add(order)
-                    await session.flush()
+        bid, ask = derive_bid_ask(candle, Config.SPREAD_PIPS)
+        fill_price = ask if side_upper == "BUY" else bid
 
-                fill = Fill(
-                    order_id=order.id,
+        stmt_pos = _pick_for_update(session, _POS_BY_SYMBOL, _POS_BY_SYMBOL_FOR_UPDATE)
+        res_pos = await session.execute(stmt_pos, {"sym": symbol})
+        pos = res_pos.scalar_one_or_none()
+        qty_signed = qty if side_upper == "BUY" else -qty
+        current_qty = pos.qty_signed if pos is not None else 0.0
+
+        # Create/lock the singleton account first: its insert is the only conflict
+        # guarded by a savepoint, so the MTM read below never races on it.
+        acct_locked = await _ensure_account_row(session, for_update=True)
+        mtm_state = await compute_account_state(session, candle, acct=acct_locked)
+        additional_margin = compute_additional_margin_for_netting(
+            current_qty_signed=current_qty,
+            order_qty_signed=qty_signed,
+            fill_price=fill_price,
+            leverage=acct_locked.leverage,
+        )
+        free_margin = float(mtm_state["free_margin"])
+        if free_margin < additional_margin:
+            raise RuntimeError(
+                f"Insufficient free margin: required={additional_margin:.6f}, free={free_margin:.6f}"
+            )
+
+        if existing_order_id is not None:
+            stmt_order = _pick_for_update(session, _ORDER_BY_ID, _ORDER_BY_ID_FOR_UPDATE)
+            res_order = await session.execute(stmt_order, {"order_id": existing_order_id})
+            order = res_order.scalar_one_or_none()
+            if order is None:
+                raise RuntimeError(f"existing_order_id {existing_order_id} not found")
+            if order.status == OrderStatus.FILLED:
+                res_existing_fill = await session.execute(_FILL_BY_ORDER, {"order_id": order.id})
+                existing_fill = res_existing_fill.scalar_one_or_none()
+                if existing_fill is None:
+                    raise RuntimeError("FILLED order exists without fill row")
+                return order, existing_fill
+            order.symbol = symbol
+            order.side = side_upper
+            order.qty = qty
+            order.reason = reason
+            order.status = OrderStatus.FILLED
+            order.ts = candle.open_time
+            if idempotency_key is not None:
+                order.idempotency_key = idempotency_key
+            await session.flush()
+        elif idempotency_key:
+            # A concurrent request may claim the same key between the lookup above and
+            # this insert; let the unique constraint decide instead of retrying the transaction.
+            stmt_insert_order = (
+                _dialect_insert(session, Order)
+                .values(
                     symbol=symbol,
                     side=side_upper,
                     qty=qty,
-                    price=fill_price,
-                    fee=0.0,
-                    slippage=0.0,
+                    reason=reason,
+                    status=OrderStatus.FILLED,
                     ts=candle.open_time,
+                    idempotency_key=idempotency_key,
                 )
-                session.add(fill)
-                await session.flush()
-
-                if pos is None:
-                    pos = Position(
-                        symbol=symbol,
-                        qty_signed=qty_signed,
-                        avg_price=fill_price,
-                        stop_loss=sl,
-                        take_profit=tp,
-                        opened_at=candle.open_time,
-                        entry_order_id=order.id,
-                    )
-                    session.add(pos)
-                else:
-                    existing = pos.qty_signed
-                    if existing == 0 or (existing > 0 and qty_signed > 0) or (existing < 0 and qty_signed < 0):
-                        new_qty = existing + qty_signed
-                        if new_qty != 0:
-                            avg = (existing * pos.avg_price + qty_signed * fill_price) / new_qty
-                        else:
-                            avg = fill_price
-                        pos.qty_signed = new_qty
-                        pos.avg_price = avg
-                        pos.stop_loss = sl if sl is not None else pos.stop_loss
-                        pos.take_profit = tp if tp is not None else pos.take_profit
-                    else:
-                        exit_reason = reason or "manual_close"
-                        acct = await _ensure_account_row(session, for_update=True)
-                        if abs(qty_signed) < abs(existing):
-                            closed_qty = qty
-                            if existing > 0:
-                                pnl = (fill_price - pos.avg_price) * closed_qty
-                            else:
-                                pnl = (pos.avg_price - fill_price) * closed_qty
-                            pos.qty_signed = existing + qty_signed
-                            pos.realized_pnl = pos.realized_pnl + pnl
-                            acct.balance = acct.balance + pnl
-                            session.add(
-                                _build_trade(
-                                    pos=pos,
-                                    candle_time=candle.open_time,
-                                    qty=closed_qty,
-                                    exit_price=fill_price,
-                                    pnl=pnl,
-                                    exit_reason=exit_reason,
-                                    exit_order_id=order.id,
-                                )
-                            )
-                        else:
-                            closed_qty = abs(existing)
-                            if existing > 0:
-                                pnl = (fill_price - pos.avg_price) * closed_qty
-                            else:
-                                pnl = (pos.avg_price - fill_price) * closed_qty
-                            pos.realized_pnl = pos.realized_pnl + pnl
-                            acct.balance = acct.balance + pnl
-                            session.add(
-                                _build_trade(
-                                    pos=pos,
-                                    candle_time=candle.open_time,
-                                    qty=closed_qty,
-                                    exit_price=fill_price,
-                                    pnl=pnl,
-                                    exit_reason=exit_reason,
-                                    exit_order_id=order.id,
-                                )
-                            )
-                            remaining = qty_signed + existing
-                            if remaining == 0:
-                                await session.delete(pos)
-                            else:
-                                pos.qty_signed = remaining
-                                pos.avg_price = fill_price
-                                pos.opened_at = candle.open_time
-                                pos.stop_loss = sl
-                                pos.take_profit = tp
-                                pos.entry_order_id = order.id
-
-            return order, fill
-
-        except IntegrityError:
-            if attempt == 0:
-                await session.rollback()
-                continue
-            raise
+                .on_conflict_do_nothing(index_elements=["idempotency_key"])
+                .returning(Order)
+            )
+            order = (await session.scalars(stmt_insert_order)).one_or_none()
+            if order is None:
+                existing_pair = await _find_idempotent_order(session, idempotency_key)
+                if existing_pair is None:
+                    raise RuntimeError("Idempotency key conflict without committed order")
+                return existing_pair
+        else:
+            order = Order(
+                symbol=symbol,
+                side=side_upper,
+                qty=qty,
+                reason=reason,
+                status=OrderStatus.FILLED,
+                ts=candle.open_time,
+                idempotency_key=idempotency_key,
+            )
+            session.add(order)
+            await session.flush()
+
+        fill = Fill(
+            order_id=order.id,
+            symbol=symbol,
+            side=side_upper,
+            qty=qty,
+            price=fill_price,
+            fee=0.0,
+            slippage=0.0,
+            ts=candle.open_time,
+        )
+        session.add(fill)
+        await session.flush()
+
+        if pos is None or pos.qty_signed == 0 or (pos.qty_signed > 0) == (qty_signed > 0):
+            # Opening or adding to a position is a single atomic upsert; reductions and
+            # flips realize pnl and may delete the row, so they stay in Python below.
+            stmt_upsert_pos = _dialect_insert(session, Position).values(
+                symbol=symbol,
+                qty_signed=qty_signed,
+                avg_price=fill_price,
+                stop_loss=sl,
+                take_profit=tp,
+                opened_at=candle.open_time,
+                entry_order_id=order.id,
+            )
+            excluded = stmt_upsert_pos.excluded
+            stmt_upsert_pos = stmt_upsert_pos.on_conflict_do_update(
+                index_elements=["symbol"],
+                set_={
+                    "qty_signed": Position.qty_signed + excluded.qty_signed,
+                    "avg_price": (Position.qty_signed * Position.avg_price + excluded.qty_signed * excluded.avg_price)
+                    / (Position.qty_signed + excluded.qty_signed),
+                    "stop_loss": func.coalesce(excluded.stop_loss, Position.stop_loss),
+                    "take_profit": func.coalesce(excluded.take_profit, Position.take_profit),
+                    # ON CONFLICT updates skip Column.onupdate, so set it explicitly.
+                    "updated_at": func.now(),
+                },
+                where=(Position.qty_signed == 0) | (Position.qty_signed * excluded.qty_signed > 0),
+            )
+            res_upsert_pos = await session.execute(stmt_upsert_pos)
+            if res_upsert_pos.rowcount > 0:
+                if pos is not None:
+                    session.expire(pos)
+                pos = None
+            else:
+                # A concurrent order left an opposite-direction row: net into it.
+                res_pos = await session.execute(stmt_pos.execution_options(populate_existing=True))
+                pos = res_pos.scalar_one()
+
+        if pos is not None:
+            await _apply_fill_to_position(
+                session,
+                pos,
+                order=order,
+                candle_time=candle.open_time,
+                qty=qty,
+                qty_signed=qty_signed,
+                fill_price=fill_price,
+                sl=sl,
+                tp=tp,
+                reason=reason,
+            )
+
+    return order, fill
+
+
+async def _find_idempotent_order(session: AsyncSession, idempotency_key: str) -> Optional[Tuple[Order, Fill]]:
+    res_existing_order = await session.execute(_ORDER_BY_IDEMPOTENCY_KEY, {"idempotency_key": idempotency_key})
+    existing_order = res_existing_order.scalar_one_or_none()
+    if existing_order is None:
+        return None
+    res_existing_fill = await session.execute(_FILL_BY_ORDER, {"order_id": existing_order.id})
+    existing_fill = res_existing_fill.scalar_one_or_none()
+    if existing_fill is None:
+        raise RuntimeError("Idempotency key matched order without fill")
+    return existing_order, existing_fill
+
+
+async def _apply_fill_to_position(
+    session: AsyncSession,
+    pos: Position,
+    *,
+    order: Order,
+    candle_time: datetime,
+    qty: float,
+    qty_signed: float,
+    fill_price: float,
+    sl: Optional[float],
+    tp: Optional[float],
+    reason: str,
+) -> None:
+    """Net a fill into an existing position row, realizing pnl on reductions/flips."""
+    existing = pos.qty_signed
+    if existing == 0 or (existing > 0 and qty_signed > 0) or (existing < 0 and qty_signed < 0):
+        new_qty = existing + qty_signed
+        if new_qty != 0:
+            avg = (existing * pos.avg_price + qty_signed * fill_price) / new_qty
+        else:
+            avg = fill_price
+        pos.qty_signed = new_qty
+        pos.avg_price = avg
+        pos.stop_loss = sl if sl is not None else pos.stop_loss
+        pos.take_profit = tp if tp is not None else pos.take_profit
+        return
+
+    exit_reason = reason or "manual_close"
+    if abs(qty_signed) < abs(existing):
+        closed_qty = qty
+        if existing > 0:
+            pnl = (fill_price - pos.avg_price) * closed_qty
+        else:
+            pnl = (pos.avg_price - fill_price) * closed_qty
+        pos.qty_signed = existing + qty_signed
+        pos.realized_pnl = pos.realized_pnl + pnl
+        await _apply_realized_pnl(session, pnl)
+        session.add(
+            _build_trade(
+                pos=pos,
+                candle_time=candle_time,
+                qty=closed_qty,
+                exit_price=fill_price,
+                pnl=pnl,
+                exit_reason=exit_reason,
+                exit_order_id=order.id,
+            )
+        )
+        return
 
-    raise RuntimeError("Failed to place order due to repeated integrity errors")
+    closed_qty = abs(existing)
+    if existing > 0:
+        pnl = (fill_price - pos.avg_price) * closed_qty
+    else:
+        pnl = (pos.avg_price - fill_price) * closed_qty
+    pos.realized_pnl = pos.realized_pnl + pnl
+    await _apply_realized_pnl(session, pnl)
+    session.add(
+        _build_trade(
+            pos=pos,
+            candle_time=candle_time,
+            qty=closed_qty,
+            exit_price=fill_price,
+            pnl=pnl,
+            exit_reason=exit_reason,
+            exit_order_id=order.id,
+        )
+    )
+    remaining = qty_signed + existing
+    if remaining == 0:
+        await session.delete(pos)
+    else:
+        pos.qty_signed = remaining
+        pos.avg_price = fill_price
+        pos.opened_at = candle_time
+        pos.stop_loss = sl
+        pos.take_profit = tp
+        pos.entry_order_id = order.id
 
 
 async def mark_to_market(session: AsyncSession, symbol: str, bid: float, ask: float) -> dict:
-    """Compute account equity/unrealized pnl for symbol using provided bid/ask."""
-    acct = await ensure_account(session)
+    """Compute account equity/unrealized pnl for symbol using provided bid/ask.
 
-    stmt = select(Position).where(Position.symbol == symbol)
-    res = await session.execute(stmt)
-    pos = res.scalar_one_or_none()
+    Results are memoized per engine for MTM_CACHE_TTL_SECONDS or until the next
+    write to orders, positions or accounts; sessions holding unflushed changes
+    always compute afresh.
+    """
+    bind = session.get_bind()
+    key = (symbol, bid, ask)
+    cacheable = not (session.new or session.dirty or session.deleted)
+    if cacheable:
+        cached = _mtm_cache.get(bind, {}).get(key)
+        if cached is not None and time.monotonic() - cached[0] < MTM_CACHE_TTL_SECONDS:
+            return dict(cached[1])
+        generation = _mtm_generation.get(bind, 0)
+
+    row = (await session.execute(_ACCOUNT_WITH_POSITION_STMT, {"symbol": symbol})).first()
+    if row is not None:
+        acct, pos = row
+    else:
+        # First call on a fresh database: create the account, then read the position directly.
+        acct = await ensure_account(session)
+        pos = await session.get(Position, symbol)
 
     unrealized = 0.0
     if pos is not None:
@@ -339,7 +554,93 @@ async def mark_to_market(session: AsyncSession, symbol: str, bid: float, ask: fl
             unrealized = (pos.avg_price - ask) * abs(pos.qty_signed)
 
     equity = acct.balance + unrealized
-    return {"balance": acct.balance, "equity": equity, "unrealized": unrealized}
+    result = {"balance": acct.balance, "equity": equity, "unrealized": unrealized}
+    if cacheable and _mtm_generation.get(bind, 0) == generation:
+        entries = _mtm_cache.setdefault(bind, {})
+        if len(entries) >= MTM_CACHE_MAX_ENTRIES:
+            entries.clear()
+        entries[key] = (time.monotonic(), dict(result))
+    return result
+
+
+async def bulk_record_trades(session: AsyncSession, rows: list[dict]) -> list[Optional[int]]:
+    """Persist the closing Order/Fill/Trade for many SL/TP exits in three statements.
+
+    Each row carries symbol, side, qty, exit_price, exit_reason, ts, entry_ts,
+    entry_price, pnl and entry_order_id. The trade insert skips exits already
+    recorded for the same (symbol, exit_ts, exit_reason); their order and fill
+    are removed again. Returns the new order ids in row order, None for skipped
+    rows. Runs inside the caller's transaction; nothing is committed here.
+    """
+    if not rows:
+        return []
+
+    order_ids = list(
+        await session.scalars(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            [
+                {
+                    "symbol": row["symbol"],
+                    "side": row["side"],
+                    "qty": row["qty"],
+                    "status": OrderStatus.FILLED,
+                    "reason": row["exit_reason"],
+                    "ts": row["ts"],
+                }
+                for row in rows
+            ],
+        )
+    )
+    await session.execute(
+        insert(Fill),
+        [
+            {
+                "order_id": order_id,
+                "symbol": row["symbol"],
+                "side": row["side"],
+                "qty": row["qty"],
+                "price": row["exit_price"],
+                "fee": 0.0,
+                "slippage": 0.0,
+                "ts": row["ts"],
+            }
+            for row, order_id in zip(rows, order_ids)
+        ],
+    )
+    stmt_trades = (
+        _dialect_insert(session, Trade)
+        .on_conflict_do_nothing(
+            index_elements=["symbol", "exit_ts", "exit_reason"],
+            index_where=SLTP_EXIT_PREDICATE,
+        )
+        .returning(Trade.exit_order_id)
+    )
+    recorded = set(
+        await session.scalars(
+            stmt_trades,
+            [
+                {
+                    "entry_ts": row["entry_ts"],
+                    "exit_ts": row["ts"],
+                    "symbol": row["symbol"],
+                    "qty": row["qty"],
+                    "entry_price": row["entry_price"],
+                    "exit_price": row["exit_price"],
+                    "pnl": row["pnl"],
+                    "exit_reason": row["exit_reason"],
+                    "entry_order_id": row["entry_order_id"],
+                    "exit_order_id": order_id,
+                }
+                for row, order_id in zip(rows, order_ids)
+            ],
+        )
+    )
+    duplicates = [order_id for order_id in order_ids if order_id not in recorded]
+    if duplicates:
+        # Replays only: the exit was already recorded, so drop the rows made for it.
+        await session.execute(delete(Fill).where(Fill.order_id.in_(duplicates)))
+        await session.execute(delete(Order).where(Order.id.in_(duplicates)))
+    return [order_id if order_id in recorded else None for order_id in order_ids]
 
 
 async def update_on_candle(session: AsyncSession, candle: Candle) -> list:
@@ -347,111 +648,90 @@ async def update_on_candle(session: AsyncSession, candle: Candle) -> list:
 
     Returns list of executed trades (as dicts).
     """
-    symbol = candle.symbol
-    bid, ask = derive_bid_ask(candle, Config.SPREAD_PIPS)
+    return await update_on_candles(session, [candle])
 
-    executed = []
-    async with _transaction_scope(session):
-        stmt_pos = _maybe_for_update(session, select(Position).where(Position.symbol == symbol))
-        res_pos = await session.execute(stmt_pos)
-        pos = res_pos.scalar_one_or_none()
-        if pos is None:
-            return executed
 
-        triggered = None
-        exit_price = None
-        exit_reason = None
+async def update_on_candles(session: AsyncSession, candles: list[Candle]) -> list:
+    """Check SL/TP for a batch of candles and close every triggered position.
 
-        if pos.qty_signed > 0:
-            if pos.stop_loss is not None and candle.low <= pos.stop_loss:
-                triggered = "SL"
-                exit_price = bid
-                exit_reason = "stop_loss"
-            elif pos.take_profit is not None and candle.high >= pos.take_profit:
-                triggered = "TP"
-                exit_price = bid
-                exit_reason = "take_profit"
-        else:
-            if pos.stop_loss is not None and candle.high >= pos.stop_loss:
-                triggered = "SL"
-                exit_price = ask
-                exit_reason = "stop_loss"
-            elif pos.take_profit is not None and candle.low <= pos.take_profit:
-                triggered = "TP"
-                exit_price = ask
-                exit_reason = "take_profit"
-
-        if not triggered:
-            return executed
+    Candles are applied in order; a position closed by one candle is not
+    revisited by later candles in the same batch. All reads and writes are
+    batched into a fixed number of statements regardless of batch size.
+    Returns list of executed trades (as dicts).
+    """
+    executed = []
+    if not candles:
+        return executed
 
-        stmt_check = select(Trade).where(
-            Trade.symbol == symbol,
-            Trade.exit_ts == candle.open_time,
-            Trade.exit_reason == exit_reason,
-        )
-        res_check = await session.execute(stmt_check)
-        existing_trade = res_check.scalar_one_or_none()
-        if existing_trade is not None:
+    symbols = {c.symbol for c in candles}
+    async with _transaction_scope(session):
+        stmt_pos = _pick_for_update(session, _POS_BY_SYMBOLS, _POS_BY_SYMBOLS_FOR_UPDATE)
+        res_pos = await session.execute(stmt_pos, {"syms": list(symbols)})
+        open_positions = {pos.symbol: pos for pos in res_pos.scalars()}
+        if not open_positions:
             return executed
 
-        qty = abs(pos.qty_signed)
-        entry_price = pos.avg_price
-        if pos.qty_signed > 0:
-            pnl = (exit_price - entry_price) * qty
-        else:
-            pnl = (entry_price - exit_price) * qty
-
-        order = Order(
-            symbol=symbol,
-            side=("SELL" if pos.qty_signed > 0 else "BUY"),
-            qty=qty,
-            status="filled",
-            reason=exit_reason,
-            ts=candle.open_time,
-        )
-        session.add(order)
-        await session.flush()
-
-        fill = Fill(
-            order_id=order.id,
-            symbol=symbol,
-            side=order.side,
-            qty=qty,
-            price=exit_price,
-            fee=0.0,
-            slippage=0.0,
-            ts=candle.open_time,
-        )
-        session.add(fill)
-
-        trade = Trade(
-            entry_ts=pos.opened_at,
-            exit_ts=candle.open_time,
-            symbol=symbol,
-            qty=qty,
-            entry_price=entry_price,
-            exit_price=exit_price,
-            pnl=pnl,
-            exit_reason=exit_reason,
-            entry_order_id=pos.entry_order_id,
-            exit_order_id=order.id,
+        # Lay the (position, candle) pairs out column-wise and scan them in one pass.
+        pairs = [(open_positions[c.symbol], c) for c in candles if c.symbol in open_positions]
+        triggers, exit_prices, pnls = scan_triggers(
+            [pos.qty_signed for pos, _ in pairs],
+            [pos.avg_price for pos, _ in pairs],
+            [_NAN if pos.stop_loss is None else pos.stop_loss for pos, _ in pairs],
+            [_NAN if pos.take_profit is None else pos.take_profit for pos, _ in pairs],
+            [c.high for _, c in pairs],
+            [c.low for _, c in pairs],
+            [c.close for _, c in pairs],
+            Config.SPREAD_PIPS * PIP_VALUE / 2.0,
         )
-        session.add(trade)
 
-        acct = await _ensure_account_row(session, for_update=True)
-        acct.balance = acct.balance + pnl
+        # (pos, candle, exit_price, exit_reason, pnl) for the first hit per position, in candle order.
+        hits = []
+        closed = set()
+        for (pos, candle), trigger, exit_price, pnl in zip(pairs, triggers, exit_prices, pnls):
+            if trigger == NO_TRIGGER or pos.symbol in closed:
+                continue
+            closed.add(pos.symbol)
+            hits.append((pos, candle, exit_price, EXIT_REASONS[trigger], pnl))
 
-        await session.delete(pos)
+        if not hits:
+            return executed
 
-        executed.append(
+        exit_rows = [
             {
-                "symbol": symbol,
-                "qty": qty,
+                "symbol": pos.symbol,
+                "side": "SELL" if pos.qty_signed > 0 else "BUY",
+                "qty": abs(pos.qty_signed),
                 "exit_price": exit_price,
+                "exit_reason": exit_reason,
+                "ts": candle.open_time,
+                "entry_ts": pos.opened_at,
+                "entry_price": pos.avg_price,
                 "pnl": pnl,
-                "reason": exit_reason,
+                "entry_order_id": pos.entry_order_id,
             }
-        )
+            for pos, candle, exit_price, exit_reason, pnl in hits
+        ]
+        # Idempotency is enforced by uq_trade_idem: exits already recorded for
+        # the same candle and reason come back as None and leave the position open.
+        order_ids = await bulk_record_trades(session, exit_rows)
+        exit_rows = [row for row, order_id in zip(exit_rows, order_ids) if order_id is not None]
+        if not exit_rows:
+            return executed
+        total_pnl = 0.0
+        for row in exit_rows:
+            total_pnl += row["pnl"]
+            executed.append(
+                {
+                    "symbol": row["symbol"],
+                    "qty": row["qty"],
+                    "exit_price": row["exit_price"],
+                    "pnl": row["pnl"],
+                    "reason": row["exit_reason"],
+                }
+            )
+
+        await _apply_realized_pnl(session, total_pnl)
+        await session.execute(delete(Position).where(Position.symbol.in_([row["symbol"] for row in exit_rows])))
 
     return executed
 
@@ -470,12 +750,9 @@ async def process_new_orders_for_candle(
     symbol = (symbol or Config.SYMBOL).upper()
     timeframe = timeframe or Config.TIMEFRAME
 
-    stmt_fill_candle = select(Candle).where(
-        Candle.symbol == symbol,
-        Candle.timeframe == timeframe,
-        Candle.open_time == fill_candle_open_time,
+    res_fill_candle = await session.execute(
+        _CANDLE_AT_STMT, {"symbol": symbol, "timeframe": timeframe, "open_time": fill_candle_open_time}
     )
-    res_fill_candle = await session.execute(stmt_fill_candle)
     fill_candle = res_fill_candle.scalar_one_or_none()
     if fill_candle is None:
         raise RuntimeError(
@@ -493,61 +770,53 @@ async def process_new_orders_for_candle(
             select(Order)
             .where(
                 Order.symbol == symbol,
-                func.upper(Order.status) == "NEW",
-                func.lower(Order.type) == "market",
+                OPEN_ORDER_FILTER,
+                Order.type == "market",
             )
             .order_by(Order.ts.asc(), Order.id.asc())
         )
-        res_orders = await session.execute(stmt_orders)
-        orders = list(res_orders.scalars().all())
+        # Stream the backlog in chunks so a large queue (e.g. first tick after
+        # downtime) starts filling without materializing every row up front.
+        orders = await session.stream_scalars(stmt_orders.execution_options(yield_per=PENDING_ORDERS_BATCH_SIZE))
 
-        for order in orders:
+        # Status transitions are collected and written with one UPDATE per outcome
+        # after the loop instead of one UPDATE per order.
+        repaired_ids: list[int] = []
+        filled_ids: list[int] = []
+        rejected_ids_by_reason: dict[str, list[int]] = defaultdict(list)
+
+        async for order in orders:
             # Idempotency: one fill per order.
-            res_existing_fill = await session.execute(select(Fill).where(Fill.order_id == order.id))
+            res_existing_fill = await session.execute(_FILL_BY_ORDER, {"order_id": order.id})
             existing_fill = res_existing_fill.scalar_one_or_none()
             if existing_fill is not None:
-                if (order.status or "").upper() != "FILLED":
-                    order.status = "FILLED"
+                if order.status != OrderStatus.FILLED:
+                    repaired_ids.append(order.id)
                 created_fills.append(existing_fill)
                 continue
 
             if order.qty <= 0:
-                order.status = "REJECTED"
-                order.reason = "Invalid qty for deterministic execution: qty must be > 0"
+                rejected_ids_by_reason["Invalid qty for deterministic execution: qty must be > 0"].append(order.id)
                 continue
 
-            if (order.side or "").upper() not in ("BUY", "SELL"):
-                order.status = "REJECTED"
-                order.reason = f"Unsupported side for deterministic execution: {order.side}"
+            if order.side not in ("BUY", "SELL"):
+                rejected_ids_by_reason[f"Unsupported side for deterministic execution: {order.side}"].append(order.id)
                 continue
 
-            stmt_next_candle = (
-                select(Candle)
-                .where(
-                    Candle.symbol == order.symbol,
-                    Candle.timeframe == timeframe,
-                    Candle.open_time > order.ts,
-                )
-                .order_by(Candle.open_time.asc())
-                .limit(1)
+            res_next_candle = await session.execute(
+                _NEXT_CANDLE_STMT,
+                {"symbol": order.symbol, "timeframe": timeframe, "after": order.ts},
             )
-            res_next_candle = await session.execute(stmt_next_candle)
             next_candle = res_next_candle.scalar_one_or_none()
 
             if next_candle is None:
-                stmt_any = select(Candle.id).where(
-                    Candle.symbol == order.symbol,
-                    Candle.timeframe == timeframe,
-                ).limit(1)
-                res_any = await session.execute(stmt_any)
-                has_any_candle = res_any.scalar_one_or_none() is not None
-                if has_any_candle:
-                    order.reason = (
+                if await _series_has_candles(session, order.symbol, timeframe):
+                    reject_reason = (
                         "No market data available for fills: deterministic execution requires latest candle.open_time"
                     )
                 else:
-                    order.reason = f"Unknown symbol for deterministic execution: {order.symbol}"
-                order.status = "REJECTED"
+                    reject_reason = f"Unknown symbol for deterministic execution: {order.symbol}"
+                rejected_ids_by_reason[reject_reason].append(order.id)
                 continue
 
             # Not due for this runner candle yet.
@@ -577,17 +846,27 @@ async def process_new_orders_for_candle(
                 order_id=order.id,
                 ts=next_candle.open_time,
                 symbol=order.symbol,
-                side=order.side.upper(),
+                side=order.side,
                 qty=order.qty,
                 price=fill_output.price,
                 fee=0.0,
                 slippage=Config.EXECUTION_SLIPPAGE_PIPS,
             )
             session.add(fill)
-            await session.flush()
-
-            order.status = "FILLED"
-            order.reason = None
+            filled_ids.append(order.id)
             created_fills.append(fill)
 
+        await session.flush()
+
+        if repaired_ids:
+            await session.execute(update(Order).where(Order.id.in_(repaired_ids)).values(status=OrderStatus.FILLED))
+        if filled_ids:
+            await session.execute(
+                update(Order).where(Order.id.in_(filled_ids)).values(status=OrderStatus.FILLED, reason=None)
+            )
+        for reject_reason, rejected_ids in rejected_ids_by_reason.items():
+            await session.execute(
+                update(Order).where(Order.id.in_(rejected_ids)).values(status=OrderStatus.REJECTED, reason=reject_reason)
+            )
+
     return created_fills
@@ -1,13 +1,15 @@
 """FastAPI application entrypoint."""
 import logging
 import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 
 from app.config import Config
 from app.bot import TradingBot
 from app.marketdata import get_session, init_db, close_db, router as marketdata_router
+from app.marketdata.db import RequestSessionMiddleware
 from app import execution as execution_pkg
 from app.equity import router as equity_router
 from app.oms import router as oms_router
@@ -30,52 +32,10 @@ except ValueError as e:
     logger.error(f"Configuration error: {e}")
     sys.exit(1)
 
-# Initialize FastAPI and bot
-app = FastAPI(title="Forex Trading Bot", version="2.0.0")
+# Initialize bot
 bot = TradingBot(webhook_url=Config.N8N_WEBHOOK_URL, initial_balance=Config.INITIAL_BALANCE)
 
 
-class MessageResponse(BaseModel):
-    """Standard response model."""
-    message: str
-
-
-class StatusResponse(BaseModel):
-    """Status response model."""
-    state: str
-    running: bool
-    balance: float
-    equity: float
-    positions_count: int
-    iterations: int
-    started_at: str | None
-
-
-class StrategyStatusResponse(BaseModel):
-    last_candle_time: str | None
-    last_signal: Dict[str, Any] | None
-    cooldown_active: bool
-    cooldown_until: str | None
-    open_position: Dict[str, Any] | None
-
-
-# Include market data router
-app.include_router(marketdata_router)
-# Include execution router
-try:
-    from app.execution import router as execution_router
-    app.include_router(execution_router)
-except Exception:
-    logger.debug("Execution router not available at import time")
-app.include_router(equity_router)
-app.include_router(oms_router)
-app.include_router(risk_router)
-app.include_router(accounting_router)
-app.include_router(strategy_router)
-app.include_router(orchestrator_router)
-
-
-@app.on_event("startup")
 async def startup_event() -> None:
     """Initialize database on startup."""
     logger.info("Initializing market data pipeline...")
@@ -104,7 +64,6 @@ async def startup_event() -> None:
         raise
 
 
-@app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Cleanup on shutdown."""
     logger.info("Shutting down...")
@@ -112,6 +71,7 @@ async def shutdown_event() -> None:
     if bot.running:
         logger.info("Stopping bot...")
         bot.stop()
+    bot.notifier.close()
     
     logger.info("Closing database connections...")
     try:
@@ -120,6 +80,61 @@ async def shutdown_event() -> None:
         logger.warning(f"Error closing database: {e}")
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Run startup/shutdown hooks around the application's lifetime."""
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
+
+app = FastAPI(title="Forex Trading Bot", version="2.0.0", lifespan=lifespan)
+# One lazily opened DB session per request, shared by all of its dependencies
+app.add_middleware(RequestSessionMiddleware)
+
+
+class MessageResponse(BaseModel):
+    """Standard response model."""
+    message: str
+
+
+class StatusResponse(BaseModel):
+    """Status response model."""
+    state: str
+    running: bool
+    balance: float
+    equity: float
+    positions_count: int
+    iterations: int
+    started_at: str | None
+
+
+class StrategyStatusResponse(BaseModel):
+    last_candle_time: str | None
+    last_signal: Dict[str, Any] | None
+    cooldown_active: bool
+    cooldown_until: str | None
+    open_position: Dict[str, Any] | None
+
+
+# Include market data router
+app.include_router(marketdata_router)
+# Include execution router
+try:
+    from app.execution import router as execution_router
+    app.include_router(execution_router)
+except Exception:
+    logger.debug("Execution router not available at import time")
+app.include_router(equity_router)
+app.include_router(oms_router)
+app.include_router(risk_router)
+app.include_router(accounting_router)
+app.include_router(strategy_router)
+app.include_router(orchestrator_router)
+
+
 @app.post("/start", response_model=MessageResponse)
 async def start_bot() -> MessageResponse:
     """Start the trading bot."""
@@ -1,14 +1,15 @@
 """Candle ingestion service (fetch, validate, upsert, integrity checks)."""
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
-from sqlalchemy import select, func
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import bindparam, select, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.config import Config
 from app.marketdata.models import Candle
-from app.marketdata.provider_base import MarketDataProvider
+from app.marketdata.provider_base import CANDLE_COLUMNS, CandleColumns, MarketDataProvider
 from app.marketdata.integrity import check_integrity
+from app.marketdata.partitions import ensure_partitions
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,104 @@ TIMEFRAME_MINUTES = {
     "H4": 240,
     "D1": 1440,
 }
+TIMEFRAME_SECS = {tf: minutes * 60 for tf, minutes in TIMEFRAME_MINUTES.items()}
+TIMEFRAME_DELTA = {tf: timedelta(minutes=minutes) for tf, minutes in TIMEFRAME_MINUTES.items()}
+
+# Candle alignment origin
+EPOCH_2020 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+_EPOCH_2020_TS = EPOCH_2020.timestamp()
+
+# Backfills are fetched in chunks of this span, at most BACKFILL_CONCURRENCY at once.
+# Seven days is a whole number of candles for every supported timeframe.
+BACKFILL_CHUNK = timedelta(days=7)
+BACKFILL_CONCURRENCY = 4
+
+# Batches at least this large are staged with COPY on PostgreSQL; smaller ones
+# go through a single INSERT ... ON CONFLICT where COPY's setup would dominate.
+COPY_MIN_ROWS = 200
+# Rows sent per upsert statement; bounds client memory and plan size on large backfills.
+INGEST_BATCH_SIZE = 5000
+
+_COPY_COLUMNS = (
+    "symbol", "timeframe", "open_time", "open", "high", "low", "close", "volume", "source", "ingested_at",
+)
+_COLUMN_LIST = ", ".join(_COPY_COLUMNS)
+# Session-private staging table, emptied on commit so concurrent ingests never mix rows.
+_CREATE_STAGE_SQL = text(
+    "CREATE TEMP TABLE IF NOT EXISTS candles_stage "
+    "(LIKE candles INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+)
+_ON_CONFLICT_SQL = (
+    "ON CONFLICT (symbol, timeframe, open_time) DO UPDATE SET "
+    "open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low, close = EXCLUDED.close, "
+    "volume = EXCLUDED.volume, source = EXCLUDED.source, ingested_at = EXCLUDED.ingested_at"
+)
+_MERGE_STAGE_SQL = text(
+    f"INSERT INTO candles ({_COLUMN_LIST}) SELECT {_COLUMN_LIST} FROM candles_stage {_ON_CONFLICT_SQL}"
+)
+_TRUNCATE_STAGE_SQL = text("TRUNCATE candles_stage")
+
+# One fixed single-row upsert, run with executemany. Its SQL text never changes
+# with batch size, so asyncpg prepares it once per connection and reuses the plan.
+_UPSERT_COLUMNS = _COPY_COLUMNS[:-1]
+_UPSERT_SQL = text(
+    f"INSERT INTO candles ({_COLUMN_LIST}) "
+    f"VALUES ({', '.join(':' + name for name in _UPSERT_COLUMNS)}, CURRENT_TIMESTAMP) "
+    f"{_ON_CONFLICT_SQL}"
+).bindparams(*[bindparam(name, type_=Candle.__table__.c[name].type) for name in _UPSERT_COLUMNS])
+
+
+def _split_range(start: datetime, end: datetime, timeframe: str) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into BACKFILL_CHUNK pieces with candle-aligned inner boundaries."""
+    step_seconds = TIMEFRAME_SECS[timeframe]
+    candles_since = int((start.timestamp() - _EPOCH_2020_TS) / step_seconds)
+    boundary = datetime.fromtimestamp(_EPOCH_2020_TS + candles_since * step_seconds, timezone.utc)
+    chunks = []
+    chunk_start = start
+    while chunk_start < end:
+        boundary += BACKFILL_CHUNK
+        chunk_end = min(boundary, end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+    return chunks
+
+
+async def _upsert_candles(session: AsyncSession, candles: List[Dict[str, Any]]) -> None:
+    """Upsert validated candle dicts inside the caller's transaction.
+
+    Rows are sent in INGEST_BATCH_SIZE chunks; the caller commits once at the end.
+    """
+    use_copy = session.get_bind().dialect.name == "postgresql"
+    if candles:
+        open_times = [c["open_time"] for c in candles]
+        await ensure_partitions(session, min(open_times), max(open_times))
+    for offset in range(0, len(candles), INGEST_BATCH_SIZE):
+        chunk = candles[offset:offset + INGEST_BATCH_SIZE]
+        if use_copy and len(chunk) >= COPY_MIN_ROWS:
+            await _copy_upsert_candles(session, chunk)
+        else:
+            await session.execute(_UPSERT_SQL, chunk)
+
+
+async def _copy_upsert_candles(session: AsyncSession, candles: List[Dict[str, Any]]) -> None:
+    """COPY rows into a staging table, then merge them with one INSERT ... SELECT."""
+    await session.execute(_CREATE_STAGE_SQL)
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    ingested_at = datetime.now(timezone.utc)
+    await raw.driver_connection.copy_records_to_table(
+        "candles_stage",
+        records=[
+            (
+                c["symbol"], c["timeframe"], c["open_time"], c["open"], c["high"],
+                c["low"], c["close"], c["volume"], c["source"], ingested_at,
+            )
+            for c in candles
+        ],
+        columns=list(_COPY_COLUMNS),
+    )
+    await session.execute(_MERGE_STAGE_SQL)
+    await session.execute(_TRUNCATE_STAGE_SQL)
 
 
 class IngestionService:
@@ -61,10 +160,12 @@ class IngestionService:
         )
         result = await session.execute(stmt)
         latest_stored = result.scalar()
+        if latest_stored is not None and latest_stored.tzinfo is None:
+            latest_stored = latest_stored.replace(tzinfo=timezone.utc)
         
         # Step 2: Determine fetch range
         now_utc = datetime.now(timezone.utc)
-        candle_minutes = TIMEFRAME_MINUTES[timeframe]
+        candle_delta = TIMEFRAME_DELTA[timeframe]
         
         if latest_stored is None:
             # DB is empty: backfill initial days
@@ -74,7 +175,7 @@ class IngestionService:
             )
         else:
             # DB has data: overlap from previous candles
-            overlap_delta = timedelta(minutes=candle_minutes * Config.INGEST_OVERLAP_CANDLES)
+            overlap_delta = candle_delta * Config.INGEST_OVERLAP_CANDLES
             fetch_start = latest_stored - overlap_delta
             logger.info(
                 f"DB has data up to {latest_stored.isoformat()}, "
@@ -85,64 +186,50 @@ class IngestionService:
         
         # Step 3: Fetch candles from provider
         try:
-            raw_candles = await self.provider.fetch_candles(
+            columns = await self.provider.fetch_candle_columns(
                 symbol=symbol,
                 timeframe=timeframe,
                 start=fetch_start,
                 end=fetch_end,
             )
-            logger.info(f"Provider returned {len(raw_candles)} candles")
+            logger.info(f"Provider returned {len(columns['open_time'])} candles")
         except Exception as e:
             logger.error(f"Provider fetch failed: {e}", exc_info=True)
             raise
         
         # Step 4: Validate and normalize
-        validated_candles = []
-        for raw in raw_candles:
-            try:
-                candle = self._normalize_and_validate(raw, symbol, timeframe)
-                validated_candles.append(candle)
-            except ValueError as e:
-                logger.warning(f"Validation failed for candle: {e}")
-                continue
+        validated_candles = self._normalize_and_validate_columns(
+            columns, symbol, timeframe, "Validation failed for candle"
+        )
         
         logger.info(f"Validated {len(validated_candles)} candles")
         
-        # Step 5: Upsert into DB
+        # Step 5: Upsert into DB, skipping overlap candles already stored unchanged
         inserted = 0
         updated = 0
         
-        if validated_candles:
-            # PostgreSQL UPSERT
-            stmt = pg_insert(Candle).values(validated_candles)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["symbol", "timeframe", "open_time"],
-                set_={
-                    Candle.open: stmt.excluded.open,
-                    Candle.high: stmt.excluded.high,
-                    Candle.low: stmt.excluded.low,
-                    Candle.close: stmt.excluded.close,
-                    Candle.volume: stmt.excluded.volume,
-                    Candle.source: stmt.excluded.source,
-                    Candle.ingested_at: stmt.excluded.ingested_at,
-                }
+        if latest_stored is not None:
+            new_candles, dirty_candles = await self._split_new_and_dirty(
+                session, symbol, timeframe, validated_candles, latest_stored
             )
-            
-            result = await session.execute(stmt)
+        else:
+            new_candles, dirty_candles = validated_candles, []
+        
+        if new_candles or dirty_candles:
+            await _upsert_candles(session, dirty_candles + new_candles)
             await session.commit()
             
-            # Count inserted vs updated (rough estimate)
-            inserted = len(validated_candles)  # Would need DB trigger for exact count
+            inserted = len(new_candles)
+            updated = len(dirty_candles)
             
-            logger.info(f"Upserted {inserted} candles into DB")
+            logger.info(f"Upserted {inserted} new and {updated} changed candles into DB")
         
-        # Step 6: Get latest and run integrity
-        stmt = select(func.max(Candle.open_time)).where(
-            (Candle.symbol == symbol) &
-            (Candle.timeframe == timeframe)
+        # Step 6: Get latest and run integrity. Every new candle was just upserted,
+        # so the latest open_time is known without another round trip.
+        latest_after = max(
+            [c["open_time"] for c in new_candles] + ([latest_stored] if latest_stored else []),
+            default=None,
         )
-        result = await session.execute(stmt)
-        latest_after = result.scalar()
         
         # Run integrity check
         integrity = await check_integrity(session, symbol, timeframe, days=7)
@@ -191,49 +278,47 @@ class IngestionService:
         if end.tzinfo is None:
             end = end.replace(tzinfo=timezone.utc)
         
-        # Fetch exact range
-        try:
-            raw_candles = await self.provider.fetch_candles(
-                symbol=symbol,
-                timeframe=timeframe,
-                start=start,
-                end=end,
-            )
-            logger.info(f"Provider returned {len(raw_candles)} candles for backfill")
-        except Exception as e:
-            logger.error(f"Provider fetch failed during backfill: {e}", exc_info=True)
-            raise
+        # Fetch the range in concurrent chunks; validate and upsert each chunk as
+        # it arrives so DB writes overlap with the remaining fetches
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
         
-        # Validate
-        validated_candles = []
-        for raw in raw_candles:
-            try:
-                candle = self._normalize_and_validate(raw, symbol, timeframe)
-                validated_candles.append(candle)
-            except ValueError as e:
-                logger.warning(f"Validation failed during backfill: {e}")
-                continue
+        async def fetch_chunk(chunk_start: datetime, chunk_end: datetime) -> CandleColumns:
+            async with semaphore:
+                return await self.provider.fetch_candle_columns(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start=chunk_start,
+                    end=chunk_end,
+                )
         
-        # Upsert
+        tasks = [
+            asyncio.create_task(fetch_chunk(chunk_start, chunk_end))
+            for chunk_start, chunk_end in _split_range(start, end, timeframe)
+        ]
+        fetched = 0
         inserted = 0
-        if validated_candles:
-            stmt = pg_insert(Candle).values(validated_candles)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["symbol", "timeframe", "open_time"],
-                set_={
-                    Candle.open: stmt.excluded.open,
-                    Candle.high: stmt.excluded.high,
-                    Candle.low: stmt.excluded.low,
-                    Candle.close: stmt.excluded.close,
-                    Candle.volume: stmt.excluded.volume,
-                    Candle.source: stmt.excluded.source,
-                    Candle.ingested_at: stmt.excluded.ingested_at,
-                }
-            )
-            
-            await session.execute(stmt)
+        try:
+            for next_chunk in asyncio.as_completed(tasks):
+                try:
+                    columns = await next_chunk
+                except Exception as e:
+                    logger.error(f"Provider fetch failed during backfill: {e}", exc_info=True)
+                    raise
+                fetched += len(columns["open_time"])
+                
+                validated_candles = self._normalize_and_validate_columns(
+                    columns, symbol, timeframe, "Validation failed during backfill"
+                )
+                if validated_candles:
+                    await _upsert_candles(session, validated_candles)
+                    inserted += len(validated_candles)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        logger.info(f"Provider returned {fetched} candles for backfill")
+        if inserted:
             await session.commit()
-            inserted = len(validated_candles)
             logger.info(f"Backfilled {inserted} candles")
         
         # Run integrity check
@@ -244,10 +329,116 @@ class IngestionService:
             "requested_range_end": end.isoformat(),
             "inserted": inserted,
             "updated": 0,
-            "total_processed": len(validated_candles),
+            "total_processed": inserted,
             "integrity_check": integrity,
         }
     
+    async def _split_new_and_dirty(
+        self,
+        session: AsyncSession,
+        symbol: str,
+        timeframe: str,
+        candles: List[Dict[str, Any]],
+        latest_stored: datetime,
+    ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split candles into those newer than latest_stored and overlap candles
+        whose stored values differ. Overlap candles stored unchanged are dropped.
+        """
+        new_candles = [c for c in candles if c["open_time"] > latest_stored]
+        overlap = [c for c in candles if c["open_time"] <= latest_stored]
+        if not overlap:
+            return new_candles, []
+        
+        stmt = select(
+            Candle.open_time, Candle.open, Candle.high, Candle.low, Candle.close, Candle.volume, Candle.source
+        ).where(
+            Candle.symbol == symbol,
+            Candle.timeframe == timeframe,
+            Candle.open_time.in_([c["open_time"] for c in overlap]),
+        )
+        result = await session.execute(stmt)
+        stored = {}
+        for open_time, *values in result.all():
+            if open_time.tzinfo is None:
+                open_time = open_time.replace(tzinfo=timezone.utc)
+            stored[open_time] = tuple(values)
+        
+        dirty_candles = [
+            c for c in overlap
+            if stored.get(c["open_time"])
+            != (c["open"], c["high"], c["low"], c["close"], c["volume"], c["source"])
+        ]
+        return new_candles, dirty_candles
+    
+    def _normalize_and_validate_columns(
+        self,
+        columns: CandleColumns,
+        symbol: str,
+        timeframe: str,
+        warning: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Normalize and validate a columnar provider batch, dropping (and logging) invalid rows.
+        
+        Price columns are converted to float once and checked with a single fused
+        OHLC pass; rows are then read by zipping the columns rather than looking
+        keys up in a dict per candle. A batch with a non-numeric value falls back
+        to row-by-row validation so only the offending row is dropped.
+        """
+        step_seconds = TIMEFRAME_SECS[timeframe]
+        try:
+            o = list(map(float, columns["open"]))
+            h = list(map(float, columns["high"]))
+            l = list(map(float, columns["low"]))
+            c = list(map(float, columns["close"]))
+            v = [None if x is None else float(x) for x in columns["volume"]]
+        except (TypeError, ValueError):
+            return self._normalize_and_validate_rows(columns, symbol, timeframe, warning)
+        
+        validated = []
+        append = validated.append
+        for open_time, ok, o_, h_, l_, c_, v_, source in zip(
+            columns["open_time"], validate_ohlc(o, h, l, c), o, h, l, c, v, columns["source"]
+        ):
+            try:
+                open_time = _normalize_open_time(open_time, step_seconds)
+                if not ok:
+                    raise _ohlc_error(o_, h_, l_, c_)
+            except ValueError as e:
+                logger.warning(f"{warning}: {e}")
+                continue
+            append({
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "open_time": open_time,
+                "open": o_,
+                "high": h_,
+                "low": l_,
+                "close": c_,
+                "volume": v_,
+                "source": source,
+            })
+        return validated
+    
+    def _normalize_and_validate_rows(
+        self,
+        columns: CandleColumns,
+        symbol: str,
+        timeframe: str,
+        warning: str,
+    ) -> List[Dict[str, Any]]:
+        """Row-by-row fallback for batches whose columns do not convert cleanly."""
+        step_seconds = TIMEFRAME_SECS[timeframe]
+        validated = []
+        append = validated.append
+        for row in zip(*(columns[name] for name in CANDLE_COLUMNS)):
+            try:
+                append(_normalize_values(*row, symbol, timeframe, step_seconds))
+            except ValueError as e:
+                logger.warning(f"{warning}: {e}")
+        return validated
+    
     def _normalize_and_validate(
         self,
         raw: Dict[str, Any],
@@ -259,49 +450,104 @@ class IngestionService:
         
         Raises ValueError if validation fails.
         """
-        # Ensure timezone-aware UTC
-        open_time = raw.get("open_time")
-        if not isinstance(open_time, datetime):
-            raise ValueError(f"open_time must be datetime, got {type(open_time)}")
-        
-        if open_time.tzinfo is None:
-            open_time = open_time.replace(tzinfo=timezone.utc)
-        elif open_time.tzinfo != timezone.utc:
-            open_time = open_time.astimezone(timezone.utc)
-        
-        # Align to timeframe boundary
-        candle_minutes = TIMEFRAME_MINUTES.get(timeframe)
-        if candle_minutes:
-            epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
-            delta = open_time - epoch
-            candles_since = int(delta.total_seconds() / 60 / candle_minutes)
-            open_time = epoch + timedelta(minutes=candles_since * candle_minutes)
-        
-        # Extract OHLCV
-        o = float(raw.get("open", 0))
-        h = float(raw.get("high", 0))
-        l = float(raw.get("low", 0))
-        c = float(raw.get("close", 0))
-        v = raw.get("volume")
-        if v is not None:
-            v = float(v)
-        
-        # Validate OHLC constraints
-        if not (h >= l):
-            raise ValueError(f"High ({h}) must be >= Low ({l})")
-        if not (h >= o and h >= c):
-            raise ValueError(f"High ({h}) must be >= Open ({o}) and Close ({c})")
-        if not (l <= o and l <= c):
-            raise ValueError(f"Low ({l}) must be <= Open ({o}) and Close ({c})")
-        
-        return {
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "open_time": open_time,
-            "open": o,
-            "high": h,
-            "low": l,
-            "close": c,
-            "volume": v,
-            "source": raw.get("source", "provider"),
-        }
+        return _normalize_row(raw, symbol, timeframe, TIMEFRAME_SECS.get(timeframe))
+
+
+def _normalize_row(
+    raw: Dict[str, Any],
+    symbol: str,
+    timeframe: str,
+    step_seconds: Optional[int],
+) -> Dict[str, Any]:
+    """Normalize one raw candle dict; raises ValueError if validation fails."""
+    return _normalize_values(
+        raw.get("open_time"),
+        raw.get("open", 0),
+        raw.get("high", 0),
+        raw.get("low", 0),
+        raw.get("close", 0),
+        raw.get("volume"),
+        raw.get("source", "provider"),
+        symbol,
+        timeframe,
+        step_seconds,
+    )
+
+
+def _normalize_values(
+    open_time: Any,
+    o: Any,
+    h: Any,
+    l: Any,
+    c: Any,
+    v: Any,
+    source: Any,
+    symbol: str,
+    timeframe: str,
+    step_seconds: Optional[int],
+) -> Dict[str, Any]:
+    """Normalize one candle given as column values; raises ValueError if validation fails."""
+    open_time = _normalize_open_time(open_time, step_seconds)
+    
+    # Extract OHLCV
+    o = float(o)
+    h = float(h)
+    l = float(l)
+    c = float(c)
+    if v is not None:
+        v = float(v)
+    
+    # Validate OHLC constraints; one chained test covers the valid case
+    if not (l <= o <= h and l <= c <= h):
+        raise _ohlc_error(o, h, l, c)
+    
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "open_time": open_time,
+        "open": o,
+        "high": h,
+        "low": l,
+        "close": c,
+        "volume": v,
+        "source": source,
+    }
+
+
+def _normalize_open_time(open_time: Any, step_seconds: Optional[int]) -> datetime:
+    """Return open_time as UTC, floored to the timeframe boundary when step_seconds is set."""
+    if not isinstance(open_time, datetime):
+        raise ValueError(f"open_time must be datetime, got {type(open_time)}")
+    
+    if open_time.tzinfo is None:
+        open_time = open_time.replace(tzinfo=timezone.utc)
+    
+    if step_seconds:
+        # Align to timeframe boundary on epoch seconds instead of datetime arithmetic
+        candles_since = int((open_time.timestamp() - _EPOCH_2020_TS) / step_seconds)
+        return datetime.fromtimestamp(_EPOCH_2020_TS + candles_since * step_seconds, timezone.utc)
+    if open_time.tzinfo != timezone.utc:
+        open_time = open_time.astimezone(timezone.utc)
+    return open_time
+
+
+def validate_ohlc(
+    o: List[float],
+    h: List[float],
+    l: List[float],
+    c: List[float],
+) -> List[bool]:
+    """OHLC validity mask for parallel float columns, one fused pass over the batch.
+    
+    A row is valid when low <= open <= high and low <= close <= high.
+    """
+    return [lo <= op <= hi and lo <= cl <= hi for op, hi, lo, cl in zip(o, h, l, c)]
+
+
+def _ohlc_error(o: float, h: float, l: float, c: float) -> ValueError:
+    """Describe the first OHLC constraint a row violates."""
+    if not (h >= l):
+        return ValueError(f"High ({h}) must be >= Low ({l})")
+    if not (h >= o and h >= c):
+        return ValueError(f"High ({h}) must be >= Open ({o}) and Close ({c})")
+    return ValueError(f"Low ({l}) must be <= Open ({o}) and Close ({c})")
@@ -17,6 +17,8 @@ TIMEFRAME_MINUTES = {
     "H4": 240,
     "D1": 1440,
 }
+TIMEFRAME_SECS = {tf: minutes * 60 for tf, minutes in TIMEFRAME_MINUTES.items()}
+TIMEFRAME_DELTA = {tf: timedelta(minutes=minutes) for tf, minutes in TIMEFRAME_MINUTES.items()}
 
 
 async def check_integrity(
@@ -46,52 +48,31 @@ async def check_integrity(
     if timeframe not in TIMEFRAME_MINUTES:
         raise ValueError(f"Invalid timeframe: {timeframe}")
     
-    # Query candles in range
+    # Query range stats in one aggregate instead of loading every candle
     now_utc = datetime.now(timezone.utc)
     start_time = now_utc - timedelta(days=days)
-    
-    stmt = select(Candle).where(
+    in_window = (
         (Candle.symbol == symbol) &
         (Candle.timeframe == timeframe) &
         (Candle.open_time >= start_time) &
         (Candle.open_time < now_utc)
-    ).order_by(Candle.open_time.asc())
+    )
     
+    stmt = select(func.min(Candle.open_time), func.max(Candle.open_time), func.count()).where(in_window)
     result = await session.execute(stmt)
-    candles = result.scalars().all()
-    
-    # Get earliest and latest
-    earliest = candles[0].open_time if candles else None
-    latest = candles[-1].open_time if candles else None
-    
-    actual_count = len(candles)
+    earliest, latest, actual_count = result.one()
     
     # Calculate expected count based on timeframe
-    candle_minutes = TIMEFRAME_MINUTES[timeframe]
     delta_seconds = (now_utc - start_time).total_seconds()
-    expected_count = int(delta_seconds / 60 / candle_minutes)
+    expected_count = int(delta_seconds / TIMEFRAME_SECS[timeframe])
     
-    # Detect gaps and duplicates
-    missing_ranges: List[Tuple[str, str]] = []
+    # Duplicates cannot exist: (symbol, timeframe, open_time) is unique
     duplicates_count = 0
-    seen_times = set()
-    
-    if candles:
-        prev_time = earliest
-        for candle in candles:
-            # Check for duplicate
-            if candle.open_time in seen_times:
-                duplicates_count += 1
-            seen_times.add(candle.open_time)
-            
-            # Check for gap
-            expected_next = prev_time + timedelta(minutes=candle_minutes)
-            if candle.open_time > expected_next:
-                gap_start = expected_next
-                gap_end = candle.open_time
-                missing_ranges.append((gap_start.isoformat(), gap_end.isoformat()))
-            
-            prev_time = candle.open_time
+    missing_ranges: List[Tuple[str, str]] = []
+    if earliest is not None:
+        missing_ranges = await _find_missing_ranges(
+            session, symbol, timeframe, in_window, earliest, latest, TIMEFRAME_DELTA[timeframe]
+        )
     
     missing_count = len(missing_ranges)
     is_complete = missing_count == 0 and duplicates_count == 0
@@ -117,6 +98,62 @@ async def check_integrity(
     }
 
 
+async def _find_missing_ranges(
+    session: AsyncSession,
+    symbol: str,
+    timeframe: str,
+    in_window,
+    earliest: datetime,
+    latest: datetime,
+    step: timedelta,
+) -> List[Tuple[str, str]]:
+    """
+    Find gaps between earliest and latest stored candles.
+    
+    On PostgreSQL the expected slots come from generate_series and only missing
+    slots are returned; other dialects scan the open_time column in order.
+    Returns (start_inclusive, end_exclusive) ISO pairs.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        slots = func.generate_series(earliest, latest, step).table_valued("slot").render_derived()
+        stmt = (
+            select(slots.c.slot)
+            .select_from(slots)
+            .outerjoin(
+                Candle,
+                (Candle.symbol == symbol) &
+                (Candle.timeframe == timeframe) &
+                (Candle.open_time == slots.c.slot),
+            )
+            .where(Candle.open_time.is_(None))
+        )
+        # No ORDER BY: the plan stays a sort-free join; timsort restores slot
+        # order in linear time when rows already arrive ordered.
+        missing_slots = sorted((await session.scalars(stmt)).all())
+        # Coalesce consecutive missing slots into ranges
+        ranges: List[List[datetime]] = []
+        for slot in missing_slots:
+            if ranges and ranges[-1][1] == slot:
+                ranges[-1][1] = slot + step
+            else:
+                ranges.append([slot, slot + step])
+        return [(gap_start.isoformat(), gap_end.isoformat()) for gap_start, gap_end in ranges]
+    
+    # Single-column Core query: plain datetimes, no ORM objects or row tuples.
+    # The primary key (symbol, timeframe, open_time) covers it, so it is answered
+    # from the index alone; order is restored in Python rather than with ORDER BY.
+    stmt = select(Candle.open_time).where(in_window)
+    open_times = sorted((await session.scalars(stmt)).all())
+    missing_ranges: List[Tuple[str, str]] = []
+    prev_time = earliest
+    for open_time in open_times:
+        expected_next = prev_time + step
+        if open_time > expected_next:
+            missing_ranges.append((expected_next.isoformat(), open_time.isoformat()))
+        prev_time = open_time
+    return missing_ranges
+
+
 def get_missing_ranges(
     session: AsyncSession,
     symbol: str,
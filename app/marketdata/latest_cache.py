@@ -0,0 +1,49 @@
+"""In-process cache of the most recent candle per (symbol, timeframe).
+
+Entries are keyed by engine so separate databases never share state. The cache
+is only populated from database reads; any write to ``candles`` (ORM flush,
+Core upsert, raw SQL, retention delete) drops every entry for that engine via
+``write_hooks``. A short TTL bounds staleness for writes made by other processes.
+"""
+import time
+import weakref
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+
+from app.config import Config
+from app.marketdata.models import Candle
+from app.marketdata.write_hooks import on_table_write
+
+_FIELDS = (
+    "symbol", "timeframe", "open_time", "open", "high", "low", "close", "volume", "source", "ingested_at",
+)
+
+# engine -> {(symbol, timeframe): (cached_at, candle)}
+_LATEST: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get(bind: Engine, symbol: str, timeframe: str) -> Optional[Candle]:
+    """Return the cached latest candle, or None when missing or expired."""
+    entry = _LATEST.get(bind, {}).get((symbol, timeframe))
+    if entry is None:
+        return None
+    cached_at, candle = entry
+    if time.monotonic() - cached_at >= Config.LATEST_CANDLE_CACHE_TTL_SEC:
+        return None
+    return candle
+
+
+def set(bind: Engine, candle: Candle) -> None:
+    """Cache a copy of the latest candle read from the database."""
+    # Store a transient copy so callers never touch an instance owned by another session.
+    snapshot = Candle(**{name: getattr(candle, name) for name in _FIELDS})
+    _LATEST.setdefault(bind, {})[(candle.symbol, candle.timeframe)] = (time.monotonic(), snapshot)
+
+
+def invalidate(bind: Engine) -> None:
+    """Drop every cached entry for an engine."""
+    _LATEST.pop(bind, None)
+
+
+on_table_write(("candles",), invalidate)
@@ -1,7 +1,7 @@
 """SQLAlchemy ORM models for market data."""
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, UniqueConstraint, Index, CheckConstraint
+    Column, String, Float, DateTime, Index, CheckConstraint
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -14,11 +14,11 @@ class Candle(Base):
     
     __tablename__ = "candles"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    # Primary columns
-    symbol = Column(String(20), primary_key=True, index=True)
-    timeframe = Column(String(10), primary_key=True, index=True)
-    open_time = Column(DateTime(timezone=True), primary_key=True, index=True)
+    # Primary key: one candle per symbol/timeframe/time. Its btree serves
+    # every lookup, so no extra single-column or composite indexes are kept.
+    symbol = Column(String(20), primary_key=True)
+    timeframe = Column(String(10), primary_key=True)
+    open_time = Column(DateTime(timezone=True), primary_key=True)
     
     # OHLCV
     open = Column(Float, nullable=False)
@@ -33,9 +33,6 @@ class Candle(Base):
     
     # Constraints
     __table_args__ = (
-        # Unique constraint: only one candle per symbol/timeframe/time
-        UniqueConstraint("symbol", "timeframe", "open_time", name="uq_candle_time"),
-        
         # OHLC sanity checks
         CheckConstraint("high >= low", name="ck_high_gte_low"),
         CheckConstraint("high >= open", name="ck_high_gte_open"),
@@ -43,8 +40,16 @@ class Candle(Base):
         CheckConstraint("low <= open", name="ck_low_lte_open"),
         CheckConstraint("low <= close", name="ck_low_lte_close"),
         
-        # Composite index for common queries
-        Index("ix_candle_lookup", "symbol", "timeframe", "open_time"),
+        # Compact range index for time-window scans (retention prune)
+        Index(
+            "ix_candle_open_time_brin",
+            "open_time",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        
+        # Monthly range partitions (see partitions.py); retention drops whole months
+        {"postgresql_partition_by": "RANGE (open_time)"},
     )
     
     def __repr__(self) -> str:
@@ -0,0 +1,99 @@
+"""Monthly range partitions of the candles table (PostgreSQL only)."""
+import logging
+import re
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(r"candles_(\d{4})_(\d{2})")
+
+_LIST_PARTITIONS_SQL = text(
+    "SELECT c.relname FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "JOIN pg_class p ON p.oid = i.inhparent "
+    "WHERE p.relname = 'candles'"
+)
+
+
+def _month_start(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    ts = ts.astimezone(timezone.utc)
+    return datetime(ts.year, ts.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Partition table name for the month containing ``month``."""
+    return f"candles_{month.year:04d}_{month.month:02d}"
+
+
+def partition_bounds(name: str) -> Optional[Tuple[datetime, datetime]]:
+    """Return the [lower, upper) open_time bounds encoded in a partition name.
+
+    None for children not named ``candles_YYYY_MM`` (e.g. a default partition).
+    """
+    match = _PARTITION_NAME.fullmatch(name)
+    if match is None or not 1 <= int(match.group(2)) <= 12:
+        return None
+    lower = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+    return lower, _next_month(lower)
+
+
+def _is_partitioned(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+async def ensure_partitions(session: AsyncSession, start: datetime, end: datetime) -> None:
+    """Create monthly partitions covering [start, end] plus the following month.
+
+    No-op on dialects without declarative partitioning.
+    """
+    if not _is_partitioned(session):
+        return
+    # One catalog read per call; only missing months issue DDL.
+    result = await session.execute(_LIST_PARTITIONS_SQL)
+    known = {name for (name,) in result.all()}
+    month = _month_start(start)
+    stop = _next_month(_month_start(end))
+    while month <= stop:
+        name = partition_name(month)
+        if name not in known:
+            upper = _next_month(month)
+            await session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF candles "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                )
+            )
+        month = _next_month(month)
+
+
+async def drop_partitions_before(session: AsyncSession, cutoff: datetime) -> List[str]:
+    """Drop every partition whose upper bound is at or before ``cutoff``.
+
+    Returns the dropped partition names; empty on non-partitioned dialects.
+    """
+    if not _is_partitioned(session):
+        return []
+    result = await session.execute(_LIST_PARTITIONS_SQL)
+    dropped = []
+    for (name,) in result.all():
+        bounds = partition_bounds(name)
+        if bounds is None:
+            continue
+        if bounds[1] <= cutoff:
+            await session.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped candle partitions: {', '.join(sorted(dropped))}")
+    return dropped
@@ -2,19 +2,42 @@
 from typing import Protocol, List, Dict, Any
 from datetime import datetime
 
+# Columnar candle batch: equal-length lists keyed by CANDLE_COLUMNS, row i across all lists
+# being one candle. Avoids building and re-reading a dict per candle on large batches.
+CandleColumns = Dict[str, List[Any]]
+CANDLE_COLUMNS = ("open_time", "open", "high", "low", "close", "volume", "source")
+
+
+def list_of_dicts(columns: CandleColumns) -> List[Dict[str, Any]]:
+    """Compat adapter: expand a columnar batch into one dict per candle."""
+    return [dict(zip(CANDLE_COLUMNS, row)) for row in zip(*(columns[name] for name in CANDLE_COLUMNS))]
+
+
+def columns_from_dicts(candles: List[Dict[str, Any]]) -> CandleColumns:
+    """Compat adapter: collect candle dicts into a columnar batch (missing keys become defaults)."""
+    return {
+        "open_time": [c.get("open_time") for c in candles],
+        "open": [c.get("open", 0) for c in candles],
+        "high": [c.get("high", 0) for c in candles],
+        "low": [c.get("low", 0) for c in candles],
+        "close": [c.get("close", 0) for c in candles],
+        "volume": [c.get("volume") for c in candles],
+        "source": [c.get("source", "provider") for c in candles],
+    }
+
 
 class MarketDataProvider(Protocol):
     """Protocol for market data providers."""
     
-    async def fetch_candles(
+    async def fetch_candle_columns(
         self,
         symbol: str,
         timeframe: str,
         start: datetime,
         end: datetime,
-    ) -> List[Dict[str, Any]]:
+    ) -> CandleColumns:
         """
-        Fetch candles for a symbol and timeframe.
+        Fetch candles for a symbol and timeframe as a columnar batch.
         
         Args:
             symbol: Currency pair (e.g., 'EURUSD')
@@ -23,9 +46,24 @@ class MarketDataProvider(Protocol):
             end: End time (exclusive, UTC)
         
         Returns:
-            List of candle dicts with keys: open_time, open, high, low, close, volume
+            Dict of equal-length lists keyed by CANDLE_COLUMNS.
             All timestamps must be timezone-aware UTC.
-            Candles must be sorted ascending by open_time.
+            Rows must be sorted ascending by open_time.
             Candles must be complete/closed only.
         """
         ...
+    
+    async def fetch_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch candles as a list of dicts (compat; same contract as fetch_candle_columns).
+        
+        Returns:
+            List of candle dicts with keys: open_time, open, high, low, close, volume
+        """
+        ...
@@ -1,14 +1,15 @@
 """Deterministic mock market data provider."""
 import logging
 import hashlib
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Final, Mapping, Tuple
 from datetime import datetime, timedelta, timezone
-from app.marketdata.provider_base import MarketDataProvider
+from app.marketdata.provider_base import CandleColumns, MarketDataProvider, list_of_dicts
 
 logger = logging.getLogger(__name__)
 
-# Timeframe to minutes mapping
-TIMEFRAME_MINUTES = {
+# Timeframe to minutes mapping (read-only)
+TIMEFRAME_MINUTES: Final[Mapping[str, int]] = MappingProxyType({
     "M1": 1,
     "M5": 5,
     "M15": 15,
@@ -16,24 +17,54 @@ TIMEFRAME_MINUTES = {
     "H1": 60,
     "H4": 240,
     "D1": 1440,
-}
+})
+TIMEFRAME_SECS: Final[Mapping[str, int]] = MappingProxyType(
+    {tf: minutes * 60 for tf, minutes in TIMEFRAME_MINUTES.items()}
+)
+TIMEFRAME_DELTA: Final[Mapping[str, timedelta]] = MappingProxyType(
+    {tf: timedelta(minutes=minutes) for tf, minutes in TIMEFRAME_MINUTES.items()}
+)
+
+# Candle alignment origin
+EPOCH_2020 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+_MASK64 = (1 << 64) - 1
+
+# Mock prices are generated in fixed-point units of 1e-5
+PIPS_PER_UNIT = 100_000
+
+
+def _splitmix64(x: int) -> int:
+    """One SplitMix64 step: a fast, well-mixed 64-bit hash of x."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _series_seed(symbol: str, timeframe: str) -> int:
+    """Stable 64-bit seed for a symbol/timeframe series."""
+    return int.from_bytes(hashlib.blake2b(f"{symbol}:{timeframe}".encode(), digest_size=8).digest(), "big")
 
 
 class MockProvider:
     """Deterministic mock provider - same inputs produce same outputs."""
     
+    # Stateless: no per-instance __dict__
+    __slots__ = ()
+    
     def __init__(self) -> None:
         logger.info("MockProvider initialized (deterministic)")
     
-    async def fetch_candles(
+    async def fetch_candle_columns(
         self,
         symbol: str,
         timeframe: str,
         start: datetime,
         end: datetime,
-    ) -> List[Dict[str, Any]]:
+    ) -> CandleColumns:
         """
-        Generate deterministic candles for testing.
+        Generate deterministic candles for testing as a columnar batch.
         
         Ensures:
         - Same symbol/timeframe/range => same output
@@ -52,75 +83,80 @@ class MockProvider:
             end = end.replace(tzinfo=timezone.utc)
         
         # Align start to timeframe boundary (floor)
-        candle_minutes = TIMEFRAME_MINUTES[timeframe]
-        epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
-        delta = start - epoch
-        candles_since_epoch = delta.total_seconds() / 60 / candle_minutes
-        start_aligned = epoch + timedelta(minutes=int(candles_since_epoch) * candle_minutes)
-        
-        candles = []
-        current = start_aligned
+        step = TIMEFRAME_DELTA[timeframe]
+        delta = start - EPOCH_2020
+        candles_since_epoch = delta.total_seconds() / TIMEFRAME_SECS[timeframe]
+        start_aligned = EPOCH_2020 + step * int(candles_since_epoch)
         
-        while current < end:
-            candle = self._generate_candle(
-                symbol=symbol,
-                timeframe=timeframe,
-                open_time=current,
-            )
-            candles.append(candle)
-            current += timedelta(minutes=candle_minutes)
+        # Size the range up front: n = ceil((end - start) / step)
+        n_candles = max(0, -((start_aligned - end) // step))
+        open_times = [start_aligned + step * i for i in range(n_candles)]
+        base_seed = _series_seed(symbol, timeframe)
+        base_pips = 108_000 if symbol == "EURUSD" else 10_000_000
+        values = _candle_values
+        # Transpose the per-candle value tuples into columns in one pass
+        opens, highs, lows, closes, volumes = (
+            zip(*[values(base_seed, base_pips, t) for t in open_times]) if n_candles else ((),) * 5
+        )
         
         logger.debug(
-            f"MockProvider generated {len(candles)} candles "
+            f"MockProvider generated {n_candles} candles "
             f"for {symbol} {timeframe} ({start} to {end})"
         )
-        return candles
+        return {
+            "open_time": open_times,
+            "open": list(opens),
+            "high": list(highs),
+            "low": list(lows),
+            "close": list(closes),
+            "volume": list(volumes),
+            "source": ["mock"] * n_candles,
+        }
     
-    def _generate_candle(
+    async def fetch_candles(
         self,
         symbol: str,
         timeframe: str,
-        open_time: datetime,
-    ) -> Dict[str, Any]:
-        """Generate single deterministic candle."""
-        # Deterministic seed based on symbol, timeframe, time
-        seed_str = f"{symbol}:{timeframe}:{open_time.isoformat()}"
-        seed = int(hashlib.md5(seed_str.encode()).hexdigest(), 16)
-        
-        # Pseudo-random but deterministic price generation
-        # Base price depends on symbol
-        base_price = 1.08 if symbol == "EURUSD" else 100.0
-        
-        # Generate OHLC using deterministic randomness
-        price_seed = seed % 1000000
-        open_delta = (price_seed % 100 - 50) / 10000
-        open_price = base_price + open_delta
-        
-        # High/low/close offsets
-        high_offset = abs((seed // 1000000) % 100) / 10000
-        low_offset = abs((seed // 2000000) % 100) / 10000
-        close_offset = (seed // 3000000) % 100 - 50
-        close_offset = close_offset / 10000
-        
-        high_price = max(open_price, open_price + high_offset)
-        low_price = min(open_price, open_price - low_offset)
-        close_price = open_price + close_offset
-        
-        # Ensure OHLC constraints
-        high_price = max(high_price, open_price, close_price)
-        low_price = min(low_price, open_price, close_price)
-        
-        # Volume (deterministic)
-        volume = (seed % 100000) + 10000
-        
-        return {
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "open_time": open_time,
-            "open": round(open_price, 5),
-            "high": round(high_price, 5),
-            "low": round(low_price, 5),
-            "close": round(close_price, 5),
-            "volume": float(volume),
-            "source": "mock",
-        }
+        start: datetime,
+        end: datetime,
+    ) -> List[Dict[str, Any]]:
+        """Generate deterministic candles as a list of dicts (compat adapter over fetch_candle_columns)."""
+        columns = await self.fetch_candle_columns(symbol, timeframe, start, end)
+        return [
+            {"symbol": symbol, "timeframe": timeframe, **candle}
+            for candle in list_of_dicts(columns)
+        ]
+
+
+def _candle_values(base_seed: int, base_pips: int, open_time: datetime) -> Tuple[float, float, float, float, float]:
+    """Deterministic (open, high, low, close, volume) for one candle of a series.
+    
+    Prices are computed in integer pips (1e-5) and divided once on output, so no
+    rounding is needed and no float error accumulates.
+    """
+    seed = _splitmix64(base_seed ^ int(open_time.timestamp()))
+    
+    # Generate OHLC using deterministic randomness: one 16-bit lane per value
+    open_pips = base_pips + ((seed & 0xFFFF) % 100 - 50) * 10
+    
+    # High/low offsets are non-negative, so high >= open >= low already holds
+    high_pips = open_pips + ((seed >> 16) & 0xFFFF) % 100 * 10
+    low_pips = open_pips - ((seed >> 32) & 0xFFFF) % 100 * 10
+    close_pips = open_pips + ((seed >> 48) % 100 - 50) * 10
+    
+    # Ensure OHLC constraints
+    if close_pips > high_pips:
+        high_pips = close_pips
+    elif close_pips < low_pips:
+        low_pips = close_pips
+    
+    # Volume (deterministic)
+    volume = (seed >> 8) % 100000 + 10000
+    
+    return (
+        open_pips / PIPS_PER_UNIT,
+        high_pips / PIPS_PER_UNIT,
+        low_pips / PIPS_PER_UNIT,
+        close_pips / PIPS_PER_UNIT,
+        float(volume),
+    )
@@ -2,7 +2,7 @@
 import logging
 from typing import List, Dict, Any
 from datetime import datetime
-from app.marketdata.provider_base import MarketDataProvider
+from app.marketdata.provider_base import CandleColumns, MarketDataProvider, columns_from_dicts
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,16 @@ class RealProvider:
             "Implement fetch_candles() to connect to MT5, OANDA, etc."
         )
     
+    async def fetch_candle_columns(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+    ) -> CandleColumns:
+        """Columnar view of fetch_candles() until the broker client yields columns natively."""
+        return columns_from_dicts(await self.fetch_candles(symbol, timeframe, start, end))
+    
     async def fetch_candles(
         self,
         symbol: str,
@@ -1,11 +1,13 @@
 """FastAPI routes for market data endpoints."""
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import Config
+from app.marketdata import latest_cache
 from app.marketdata.db import get_session
 from app.marketdata.models import Candle
 from app.marketdata.schemas import (
@@ -35,6 +37,14 @@ ingest_service = IngestionService(provider)
 router = APIRouter(prefix="/v1/candles", tags=["market-data"])
 
 
+def _json_default(value: Any) -> str:
+    """Encode datetimes the way pydantic does (UTC offset written as Z)."""
+    if isinstance(value, datetime):
+        iso = value.isoformat()
+        return iso[:-6] + "Z" if iso.endswith("+00:00") else iso
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 # ==== PUBLIC ENDPOINTS ====
 
 @router.get("/latest", response_model=CandleSchema)
@@ -43,14 +53,19 @@ async def get_latest_candle(
     timeframe: str = Query(Config.TIMEFRAME),
     session: AsyncSession = Depends(get_session),
 ) -> CandleSchema:
-    """Get latest closed candle from database."""
-    stmt = select(Candle).where(
-        (Candle.symbol == symbol) &
-        (Candle.timeframe == timeframe)
-    ).order_by(Candle.open_time.desc()).limit(1)
-    
-    result = await session.execute(stmt)
-    candle = result.scalar()
+    """Get latest closed candle, served from the in-process cache when fresh."""
+    bind = session.get_bind()
+    candle = latest_cache.get(bind, symbol, timeframe)
+    if candle is None:
+        stmt = select(Candle).where(
+            (Candle.symbol == symbol) &
+            (Candle.timeframe == timeframe)
+        ).order_by(Candle.open_time.desc()).limit(1)
+        
+        result = await session.execute(stmt)
+        candle = result.scalar()
+        if candle is not None:
+            latest_cache.set(bind, candle)
     
     if not candle:
         raise HTTPException(
@@ -58,65 +73,65 @@ async def get_latest_candle(
             detail=f"No candles found for {symbol}/{timeframe}"
         )
     
-    return CandleSchema.from_orm(candle)
+    return CandleSchema.model_validate(candle)
 
 
-@router.get("", response_model=CandleListSchema)
+@router.get("", response_model=None, responses={200: {"model": CandleListSchema}})
 async def get_candles(
     symbol: str = Query(Config.SYMBOL),
     timeframe: str = Query(Config.TIMEFRAME),
-    start: Optional[str] = Query(None, description="Start time (ISO-8601 UTC)"),
-    end: Optional[str] = Query(None, description="End time (ISO-8601 UTC)"),
+    start: Optional[datetime] = Query(None, description="Start time (ISO-8601 UTC)"),
+    end: Optional[datetime] = Query(None, description="End time (ISO-8601 UTC)"),
+    after: Optional[datetime] = Query(
+        None, description="Keyset cursor: return candles after this open_time (ISO-8601 UTC)"
+    ),
     limit: int = Query(5000, ge=1, le=10000),
     session: AsyncSession = Depends(get_session),
-) -> CandleListSchema:
+) -> Response:
     """
     Get candles for symbol/timeframe.
     
     - start: inclusive
     - end: exclusive
+    - after: exclusive cursor; pass the previous page's `latest` to fetch the next page
     - Returns candles in ascending open_time order
     """
-    stmt = select(Candle).where(
+    # Column projection: rows skip ORM identity-map and attribute instrumentation
+    stmt = select(
+        Candle.symbol, Candle.timeframe, Candle.open_time,
+        Candle.open, Candle.high, Candle.low, Candle.close,
+        Candle.volume, Candle.source, Candle.ingested_at,
+    ).where(
         (Candle.symbol == symbol) &
         (Candle.timeframe == timeframe)
     )
     
     # Apply time filters
     if start:
-        try:
-            start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid start datetime format (use ISO-8601)"
-            )
-        stmt = stmt.where(Candle.open_time >= start_dt)
+        stmt = stmt.where(Candle.open_time >= start)
     
     if end:
-        try:
-            end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid end datetime format (use ISO-8601)"
-            )
-        stmt = stmt.where(Candle.open_time < end_dt)
+        stmt = stmt.where(Candle.open_time < end)
+    
+    if after:
+        # Seeks the (symbol, timeframe, open_time) primary key; no OFFSET scan on deep pages
+        stmt = stmt.where(Candle.open_time > after)
     
     stmt = stmt.order_by(Candle.open_time.asc()).limit(limit)
     
     result = await session.execute(stmt)
-    candles = result.scalars().all()
-    
-    candle_schemas = [CandleSchema.from_orm(c) for c in candles]
-    earliest = candle_schemas[0].open_time if candle_schemas else None
-    latest = candle_schemas[-1].open_time if candle_schemas else None
-    
-    return CandleListSchema(
-        count=len(candle_schemas),
-        candles=candle_schemas,
-        earliest=earliest,
-        latest=latest,
+    # Rows come straight from typed table columns and already match CandleSchema,
+    # so serialize them in one pass instead of building (and re-encoding) models
+    candles = [dict(row) for row in result.mappings()]
+    payload = {
+        "count": len(candles),
+        "candles": candles,
+        "earliest": candles[0]["open_time"] if candles else None,
+        "latest": candles[-1]["open_time"] if candles else None,
+    }
+    return Response(
+        content=json.dumps(payload, default=_json_default, separators=(",", ":")),
+        media_type="application/json",
     )
 
 
@@ -172,8 +187,8 @@ async def ingest_candles(
 async def backfill_candles(
     symbol: str = Query(Config.SYMBOL),
     timeframe: str = Query(Config.TIMEFRAME),
-    start: str = Query(..., description="Start time (ISO-8601 UTC, inclusive)"),
-    end: str = Query(..., description="End time (ISO-8601 UTC, exclusive)"),
+    start: datetime = Query(..., description="Start time (ISO-8601 UTC, inclusive)"),
+    end: datetime = Query(..., description="End time (ISO-8601 UTC, exclusive)"),
     session: AsyncSession = Depends(get_session),
 ) -> BackfillResultSchema:
     """
@@ -184,18 +199,8 @@ async def backfill_candles(
     - Returns integrity check result
     """
     try:
-        # Parse datetime strings
-        try:
-            start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-            end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-        except ValueError as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid datetime format: {e}"
-            )
-        
         result = await ingest_service.backfill(
-            session, symbol, timeframe, start_dt, end_dt
+            session, symbol, timeframe, start, end
         )
         
         # Add integrity check to result
@@ -205,8 +210,6 @@ async def backfill_candles(
             **result,
             integrity_check=IntegrityCheckSchema(**integrity) if integrity else None
         )
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Backfill failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Backfill failed: {str(e)}")
@@ -1,7 +1,7 @@
 """Pydantic schemas for market data API."""
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CandleSchema(BaseModel):
@@ -18,11 +18,7 @@ class CandleSchema(BaseModel):
     source: str = "provider"
     ingested_at: datetime
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CandleListSchema(BaseModel):
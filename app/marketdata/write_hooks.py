@@ -0,0 +1,62 @@
+"""Engine-level write notifications for in-process read caches.
+
+Caches register the tables they derive from together with an ``invalidate(engine)``
+callback. The callback runs whenever a statement writes to one of those tables
+(ORM flush, Core, or raw SQL), and again when the writing connection's
+transaction ends, so a value read mid-transaction is never kept.
+"""
+import weakref
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+_PENDING_KEY = "write_hooks_pending"
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "TRUNCATE", "COPY")
+
+_WATCHERS: list[tuple[tuple[str, ...], Callable[[Engine], None]]] = []
+
+
+def on_table_write(tables: tuple[str, ...], invalidate: Callable[[Engine], None]) -> None:
+    """Call ``invalidate(engine)`` whenever one of ``tables`` is written on that engine."""
+    _WATCHERS.append((tables, invalidate))
+
+
+def _fire(bind: Engine, watcher_ids) -> None:
+    for watcher_id in watcher_ids:
+        _WATCHERS[watcher_id][1](bind)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _on_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if not statement.lstrip()[:8].upper().startswith(_WRITE_VERBS):
+        return
+    hit = [i for i, (tables, _) in enumerate(_WATCHERS) if any(t in statement for t in tables)]
+    if not hit:
+        return
+    # Connection.info lives on the pooled connection record, so checkin sees it too.
+    engine_ref, pending = conn.info.setdefault(_PENDING_KEY, (weakref.ref(conn.engine), set()))
+    pending.update(hit)
+    _fire(conn.engine, hit)
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _on_transaction_end(conn) -> None:
+    entry = conn.info.get(_PENDING_KEY)
+    if entry is not None:
+        _fire(conn.engine, entry[1])
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    # The commit event fires before the DBAPI commit completes; checkin runs after it.
+    if connection_record is None:
+        return
+    entry = connection_record.info.pop(_PENDING_KEY, None)
+    if entry is None:
+        return
+    bind = entry[0]()
+    if bind is not None:
+        _fire(bind, entry[1])
@@ -1,61 +1,195 @@
 """Event notification system for n8n webhook integration."""
+import json
 import logging
-from typing import Any, Dict
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
 from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Pending events beyond this are dropped oldest-first
+QUEUE_MAX_EVENTS = 1024
+# Events drained and posted together per dispatcher wake-up
+BATCH_MAX_EVENTS = 32
+# Concurrent posts per batch; matches the keep-alive pool size
+SEND_CONCURRENCY = 4
+# Delivery attempts per event on timeouts, connection errors and 5xx responses
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_SEC = 0.5
+
+_STOP = object()
+
+# Shared encoder with the same output as requests' json= (default separators, no NaN)
+_ENCODER = json.JSONEncoder(allow_nan=False)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 
 class Notifier:
-    """Send events to n8n webhook. Never raises exceptions to protect the bot."""
+    """Send events to n8n webhook. Never raises exceptions to protect the bot.
+
+    send_event() only queues the event; a background dispatcher thread posts
+    queued events in batches, so callers never wait on webhook latency.
+    """
 
     def __init__(self, webhook_url: str) -> None:
         self.webhook_url = webhook_url
+        # Static part of every payload, serialized once
+        self._bot_name_json = _ENCODER.encode(Config.BOT_NAME)
+        # Keep-alive pool: heartbeats and events reuse warm connections to the webhook
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SEND_CONCURRENCY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=QUEUE_MAX_EVENTS)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatcher_lock = threading.Lock()
+        self._senders: Optional[ThreadPoolExecutor] = None
 
     def send_event(self, event_type: str, data: Dict[str, Any]) -> bool:
         """
-        Send event to n8n webhook.
-        
+        Queue event for delivery to n8n webhook.
+
         Args:
             event_type: Type of event (e.g., 'started', 'stopped', 'heartbeat')
             data: Event payload
-            
+
         Returns:
-            True if sent successfully, False otherwise
+            True if queued, False otherwise
         """
         try:
-            payload = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "event_type": event_type,
-                "bot_name": Config.BOT_NAME,
-                "data": data,
-            }
-            
+            # Only the clock is read here; formatting and serialization happen on send
+            payload = {"ts": time.time(), "event_type": event_type, "data": data}
+            self._ensure_dispatcher()
+            while True:
+                try:
+                    self._queue.put_nowait(payload)
+                    return True
+                except queue.Full:
+                    try:
+                        dropped = self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    if dropped is _STOP:
+                        # Notifier is closing; keep the stop marker and drop this event
+                        self._queue.put_nowait(_STOP)
+                        return False
+                    logger.warning(f"Webhook queue full, dropped {dropped['event_type']} event")
+        except Exception as e:
+            logger.error(f"Unexpected error queueing webhook event: {e}", exc_info=True)
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver queued events (bounded by timeout) and release pooled connections."""
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("Webhook queue still full at shutdown; pending events dropped")
+            dispatcher.join(timeout=timeout)
+            self._dispatcher = None
+        if self._senders is not None:
+            self._senders.shutdown(wait=False)
+            self._senders = None
+        self.session.close()
+
+    def _ensure_dispatcher(self) -> None:
+        dispatcher = self._dispatcher
+        if dispatcher is not None and dispatcher.is_alive():
+            return
+        with self._dispatcher_lock:
+            dispatcher = self._dispatcher
+            if dispatcher is None or not dispatcher.is_alive():
+                if dispatcher is not None:
+                    logger.warning("Webhook dispatcher thread died; restarting it")
+                if self._senders is None:
+                    self._senders = ThreadPoolExecutor(
+                        max_workers=SEND_CONCURRENCY, thread_name_prefix="notifier-send"
+                    )
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_loop, name="notifier-dispatch", daemon=True
+                )
+                self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= BATCH_MAX_EVENTS:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                # Bursts (e.g. heartbeat plus order events) go out concurrently
+                try:
+                    list(self._senders.map(self._deliver, batch))
+                except Exception as e:
+                    logger.error(f"Unexpected error dispatching webhook events: {e}", exc_info=True)
+
+    def _deliver(self, payload: Dict[str, Any]) -> bool:
+        try:
+            body = self._encode(payload)
+        except (TypeError, ValueError) as e:
+            # Not JSON-serializable (or NaN/inf): retrying cannot help, drop the event
+            logger.error(f"Cannot encode {payload['event_type']} event: {e}")
+            return False
+        for attempt in range(MAX_ATTEMPTS):
+            outcome = self._post(payload["event_type"], body)
+            if outcome is not None:
+                return outcome
+            if attempt + 1 < MAX_ATTEMPTS:
+                time.sleep(RETRY_BASE_DELAY_SEC * (2 ** attempt))
+        logger.warning(f"Giving up on {payload['event_type']} event after {MAX_ATTEMPTS} attempts")
+        return False
+
+    def _encode(self, payload: Dict[str, Any]) -> bytes:
+        """Serialize a queued event, splicing the dynamic fields into the static skeleton."""
+        timestamp = datetime.utcfromtimestamp(payload["ts"]).isoformat()
+        return (
+            f'{{"timestamp": "{timestamp}", "event_type": {_ENCODER.encode(payload["event_type"])}, '
+            f'"bot_name": {self._bot_name_json}, "data": {_ENCODER.encode(payload["data"])}}}'
+        ).encode("utf-8")
+
+    def _post(self, event_type: str, body: bytes) -> Optional[bool]:
+        """Post one encoded event. Returns True/False when final, None when worth retrying."""
+        try:
             response = self.session.post(
                 self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
+                data=body,
+                headers=_JSON_HEADERS,
                 timeout=5
             )
-            
+
             if response.status_code >= 400:
                 logger.warning(
                     f"Webhook returned {response.status_code}: {response.text[:200]}"
                 )
-                return False
-                
+                return None if response.status_code >= 500 else False
+
             logger.debug(f"Event sent: {event_type}")
             return True
-            
+
         except requests.exceptions.Timeout:
             logger.warning(f"Webhook timeout sending {event_type}")
-            return False
+            return None
         except requests.exceptions.ConnectionError:
             logger.warning(f"Webhook connection error sending {event_type}")
-            return False
+            return None
         except Exception as e:
             logger.error(f"Unexpected error sending webhook event: {e}", exc_info=True)
             return False
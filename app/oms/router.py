@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.marketdata.db import get_session
@@ -12,6 +13,8 @@ from app.oms.service import cancel_order, get_order, list_orders, place_order
 
 router = APIRouter(prefix="/paper", tags=["oms"])
 
+_ORDER_ROWS = TypeAdapter(list[OMSOrderRowOut])
+
 
 @router.post("/order", response_model=OMSOrderOut)
 async def post_order(payload: OMSPlaceOrderIn, session: AsyncSession = Depends(get_session)) -> OMSOrderOut:
@@ -22,7 +25,9 @@ async def post_order(payload: OMSPlaceOrderIn, session: AsyncSession = Depends(g
     return OMSOrderOut(**result)
 
 
-@router.get("/orders", response_model=list[OMSOrderRowOut])
+# Rows are built server-side from typed columns: skip response_model revalidation
+# and serialize once; the schema stays documented via `responses`.
+@router.get("/orders", response_model=None, responses={200: {"model": list[OMSOrderRowOut]}})
 async def get_orders(
     symbol: str | None = Query(default=None),
     status: str | None = Query(default=None),
@@ -30,7 +35,7 @@ async def get_orders(
     from_ts: datetime | None = Query(default=None),
     to_ts: datetime | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
-) -> list[OMSOrderRowOut]:
+) -> Response:
     rows = await list_orders(
         session,
         symbol=symbol,
@@ -39,7 +44,11 @@ async def get_orders(
         from_ts=from_ts,
         to_ts=to_ts,
     )
-    return [OMSOrderRowOut(**row) for row in rows]
+    construct = OMSOrderRowOut.model_construct
+    return Response(
+        content=_ORDER_ROWS.dump_json([construct(**row) for row in rows]),
+        media_type="application/json",
+    )
 
 
 @router.get("/orders/{order_id}", response_model=OMSOrderOut)
@@ -4,18 +4,48 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Config
 from app.equity.service import compute_account_state, compute_additional_margin_for_netting
-from app.execution.models import Fill, Order, Position
+from app.execution.models import OPEN_ORDER_FILTER, Fill, Order, OrderStatus, Position
 from app.execution.pricing import PIP_VALUE_EURUSD
 from app.execution.service import derive_bid_ask, place_market_order
+from app.marketdata import latest_cache
 from app.marketdata.models import Candle
 from app.oms.schemas import OMSPlaceOrderIn
 from app.risk.service import RiskEngine
 
+# Hot lookups are built once with bind parameters so every call reuses the same
+# statement object (and its cached compiled SQL) instead of rebuilding the tree.
+_LATEST_CANDLE_STMT = (
+    select(Candle)
+    .where(Candle.symbol == bindparam("symbol"), Candle.timeframe == bindparam("timeframe"))
+    .order_by(Candle.open_time.desc())
+    .limit(1)
+)
+# Only the columns of the order response are projected (no ORM hydration);
+# fills.order_id is unique, so the LEFT JOIN yields at most one row per order
+_ORDER_WITH_FILL = (
+    select(Order.id, Order.status, Order.reason, Fill.id.label("fill_id"))
+    .outerjoin(Fill, Fill.order_id == Order.id)
+    .limit(1)
+)
+_ORDER_WITH_FILL_BY_ID = _ORDER_WITH_FILL.where(Order.id == bindparam("order_id"))
+_ORDER_WITH_FILL_BY_IDEMPOTENCY_KEY = _ORDER_WITH_FILL.where(
+    Order.idempotency_key == bindparam("idempotency_key")
+)
+_FILL_ID_BY_ORDER = select(Fill.id).where(Fill.order_id == bindparam("order_id"))
+_CANCEL_NEW_ORDER = (
+    update(Order)
+    .where(Order.id == bindparam("order_id"), Order.status == OrderStatus.NEW.value)
+    .values(status=OrderStatus.CANCELED.value, reason="canceled_by_user")
+    .returning(Order.id, Order.reason)
+    # Matched rows come back via RETURNING, so loaded Order instances are updated too
+    .execution_options(synchronize_session="fetch")
+)
+
 
 @asynccontextmanager
 async def _transaction_scope(session: AsyncSession):
@@ -26,36 +56,44 @@ async def _transaction_scope(session: AsyncSession):
             yield
 
 
+# Canonical status for each value Order.status can hold; covers the common
+# already-canonical values without calling upper().
+_STATUS_MAP = {
+    **{status.value: status.value for status in OrderStatus},
+    **{status.value.lower(): status.value for status in OrderStatus},
+}
+
+
 def _normalize_status(status: str | None) -> str:
     if not status:
         return "NEW"
-    s = status.upper()
-    if s == "FILLED":
-        return "FILLED"
-    if s == "REJECTED":
-        return "REJECTED"
-    if s == "CANCELED":
-        return "CANCELED"
-    if s == "NEW":
-        return "NEW"
-    return s
+    canonical = _STATUS_MAP.get(status)
+    return canonical if canonical is not None else status.upper()
 
 
 async def _latest_candle(session: AsyncSession, symbol: str) -> Candle | None:
-    stmt = (
-        select(Candle)
-        .where(Candle.symbol == symbol, Candle.timeframe == Config.TIMEFRAME)
-        .order_by(Candle.open_time.desc())
-        .limit(1)
-    )
-    res = await session.execute(stmt)
-    return res.scalar_one_or_none()
-
-
-async def _order_fill_id(session: AsyncSession, order_id: int) -> int | None:
-    stmt = select(Fill.id).where(Fill.order_id == order_id).limit(1)
-    res = await session.execute(stmt)
-    return res.scalar_one_or_none()
+    # Pre-flight read served from the shared latest-candle cache; the DB is only hit on a miss
+    bind = session.get_bind()
+    candle = latest_cache.get(bind, symbol, Config.TIMEFRAME)
+    if candle is not None:
+        return candle
+    res = await session.execute(_LATEST_CANDLE_STMT, {"symbol": symbol, "timeframe": Config.TIMEFRAME})
+    candle = res.scalar_one_or_none()
+    if candle is not None:
+        latest_cache.set(bind, candle)
+    return candle
+
+
+async def _order_out(session: AsyncSession, stmt, params: dict) -> dict | None:
+    row = (await session.execute(stmt, params)).first()
+    if row is None:
+        return None
+    return {
+        "order_id": row.id,
+        "status": _normalize_status(row.status),
+        "reason": row.reason,
+        "fill_id": row.fill_id,
+    }
 
 
 def _validate_payload(payload: OMSPlaceOrderIn) -> str | None:
@@ -80,9 +118,8 @@ async def _validate_margin(
 ) -> str | None:
     state = await compute_account_state(session, candle)
 
-    stmt_pos = select(Position).where(Position.symbol == symbol.upper())
-    res_pos = await session.execute(stmt_pos)
-    pos = res_pos.scalar_one_or_none()
+    # Primary-key lookup: the risk check has usually loaded the position already
+    pos = await session.get(Position, symbol.upper())
 
     current_qty = pos.qty_signed if pos is not None else 0.0
     qty_signed = qty if side == "BUY" else -qty
@@ -104,17 +141,11 @@ async def place_order(session: AsyncSession, payload: OMSPlaceOrderIn) -> dict:
     symbol = payload.symbol.upper()
 
     if payload.idempotency_key:
-        stmt_existing = select(Order).where(Order.idempotency_key == payload.idempotency_key)
-        res_existing = await session.execute(stmt_existing)
-        existing = res_existing.scalar_one_or_none()
+        existing = await _order_out(
+            session, _ORDER_WITH_FILL_BY_IDEMPOTENCY_KEY, {"idempotency_key": payload.idempotency_key}
+        )
         if existing is not None:
-            fill_id = await _order_fill_id(session, existing.id)
-            return {
-                "order_id": existing.id,
-                "status": _normalize_status(existing.status),
-                "reason": existing.reason,
-                "fill_id": fill_id,
-            }
+            return existing
 
     precheck_reason = _validate_payload(payload)
 
@@ -276,11 +307,28 @@ async def list_orders(
     from_ts: datetime | None = None,
     to_ts: datetime | None = None,
 ) -> list[dict]:
-    stmt = select(Order)
+    stmt = select(
+        Order.id,
+        Order.ts,
+        Order.symbol,
+        Order.side,
+        Order.type,
+        Order.qty,
+        Order.status,
+        Order.reason,
+        Order.requested_price,
+        Order.idempotency_key,
+        Fill.id.label("fill_id"),
+    ).outerjoin(Fill, Fill.order_id == Order.id)
     if symbol:
         stmt = stmt.where(Order.symbol == symbol.upper())
     if status:
-        stmt = stmt.where(func.upper(Order.status) == status.upper())
+        # Status is stored canonically (upper-case) and bound values are case-folded,
+        # so plain equality matches and can use ix_orders_symbol_status_ts; open
+        # orders use the inline predicate of the ix_orders_open_ts partial index.
+        stmt = stmt.where(
+            OPEN_ORDER_FILTER if status.upper() == OrderStatus.NEW.value else Order.status == status
+        )
     if from_ts:
         stmt = stmt.where(Order.ts >= from_ts)
     if to_ts:
@@ -288,64 +336,42 @@ async def list_orders(
 
     stmt = stmt.order_by(Order.ts.desc()).limit(limit)
     res = await session.execute(stmt)
-    orders = list(res.scalars().all())
 
     rows: list[dict] = []
-    for order in orders:
-        fill_id = await _order_fill_id(session, order.id)
-        rows.append(
-            {
-                "id": order.id,
-                "ts": order.ts,
-                "symbol": order.symbol,
-                "side": order.side,
-                "type": order.type,
-                "qty": float(order.qty),
-                "status": _normalize_status(order.status),
-                "reason": order.reason,
-                "requested_price": order.requested_price,
-                "idempotency_key": order.idempotency_key,
-                "fill_id": fill_id,
-            }
-        )
+    for row in res.mappings().all():
+        order = dict(row)
+        order["qty"] = float(order["qty"])
+        order["status"] = _normalize_status(order["status"])
+        rows.append(order)
 
     return rows
 
 
 async def get_order(session: AsyncSession, order_id: int) -> dict | None:
-    stmt = select(Order).where(Order.id == order_id)
-    res = await session.execute(stmt)
-    order = res.scalar_one_or_none()
-    if order is None:
-        return None
-    return {
-        "order_id": order.id,
-        "status": _normalize_status(order.status),
-        "reason": order.reason,
-        "fill_id": await _order_fill_id(session, order.id),
-    }
+    return await _order_out(session, _ORDER_WITH_FILL_BY_ID, {"order_id": order_id})
 
 
 async def cancel_order(session: AsyncSession, order_id: int) -> dict | None:
     async with _transaction_scope(session):
-        stmt = select(Order).where(Order.id == order_id)
-        res = await session.execute(stmt)
-        order = res.scalar_one_or_none()
-        if order is None:
-            return None
-        if _normalize_status(order.status) != "NEW":
+        # One conditional UPDATE: check-and-set is atomic, with no read-modify-write window
+        res = await session.execute(_CANCEL_NEW_ORDER, {"order_id": order_id})
+        canceled = res.one_or_none()
+        if canceled is not None:
             return {
-                "order_id": order.id,
-                "status": _normalize_status(order.status),
-                "reason": "Only NEW orders can be canceled",
-                "fill_id": await _order_fill_id(session, order.id),
+                "order_id": canceled.id,
+                "status": "CANCELED",
+                "reason": canceled.reason,
+                "fill_id": None,
             }
 
-        order.status = "CANCELED"
-        order.reason = "canceled_by_user"
+        # Nothing updated: either the order does not exist or it is no longer NEW
+        order = await session.get(Order, order_id)
+        if order is None:
+            return None
+        res_fill = await session.execute(_FILL_ID_BY_ORDER, {"order_id": order.id})
         return {
             "order_id": order.id,
-            "status": "CANCELED",
-            "reason": order.reason,
-            "fill_id": None,
+            "status": _normalize_status(order.status),
+            "reason": "Only NEW orders can be canceled",
+            "fill_id": res_fill.scalar_one_or_none(),
         }
@@ -1,66 +1,71 @@
 """FastAPI API for Macro 9 orchestrator."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.marketdata.db import get_session
-from app.orchestrator.schemas import OrchestratorRunRequest, OrchestratorRunResult, RunReportModel
+from app.orchestrator.schemas import (
+    OrchestratorRunRequest,
+    OrchestratorRunResult,
+    RunReportModel,
+    RunReportSummaryModel,
+)
 from app.orchestrator.service import OrchestratorService
 
 router = APIRouter(prefix="/orchestrator", tags=["orchestrator"])
 
+_RUN_REPORTS = TypeAdapter(list[RunReportModel])
+_RUN_SUMMARIES = TypeAdapter(list[RunReportSummaryModel])
 
-@router.post("/run", response_model=OrchestratorRunResult)
+
+def _json_response(content: bytes | str) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+# Results and reports are built server-side from our own rows: construct them without
+# validation and serialize once with pydantic's JSON encoder (no response_model pass).
+@router.post("/run", response_model=None, responses={200: {"model": OrchestratorRunResult}})
 async def run_orchestration(
     payload: OrchestratorRunRequest,
     session: AsyncSession = Depends(get_session),
-) -> OrchestratorRunResult:
+) -> Response:
     service = OrchestratorService(session)
-    return await service.run_cycle(
+    result = await service.run_cycle(
         symbol=payload.symbol,
         timeframe=payload.timeframe,
         candle_ts=payload.candle_ts,
         mode=payload.mode,
     )
+    return _json_response(result.model_dump_json())
 
 
-@router.get("/runs", response_model=list[RunReportModel])
+@router.get(
+    "/runs",
+    response_model=None,
+    responses={200: {"model": list[RunReportModel] | list[RunReportSummaryModel]}},
+)
 async def list_runs(
     limit: int = Query(default=100, ge=1, le=500),
+    details: bool = Query(default=True, description="Include the JSON payloads of each run"),
     session: AsyncSession = Depends(get_session),
-) -> list[RunReportModel]:
+) -> Response:
     service = OrchestratorService(session)
-    rows = await service.list_runs(limit=limit)
-    return [
-        RunReportModel(
-            run_id=r.run_id,
-            symbol=r.symbol,
-            timeframe=r.timeframe,
-            candle_ts=r.candle_ts,
-            status=r.status,
-            intent_json=r.intent_json,
-            risk_json=r.risk_json,
-            order_json=r.order_json,
-            fill_json=r.fill_json,
-            positions_json=r.positions_json,
-            account_json=r.account_json,
-            summary_text=r.summary_text,
-            telegram_text=r.telegram_text,
-            error_text=r.error_text,
-            mode=r.mode,
-        )
-        for r in rows
-    ]
+    rows = await service.list_runs(limit=limit, details=details)
+    # Summaries use their own model, so omitted payloads are absent rather than null
+    model, adapter = (RunReportModel, _RUN_REPORTS) if details else (RunReportSummaryModel, _RUN_SUMMARIES)
+    construct = model.model_construct
+    return _json_response(adapter.dump_json([construct(**row) for row in rows]))
 
 
-@router.get("/runs/{run_id}", response_model=RunReportModel)
-async def get_run(run_id: str, session: AsyncSession = Depends(get_session)) -> RunReportModel:
+@router.get("/runs/{run_id}", response_model=None, responses={200: {"model": RunReportModel}})
+async def get_run(run_id: str, session: AsyncSession = Depends(get_session)) -> Response:
     service = OrchestratorService(session)
     row = await service.get_run(run_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Run report not found")
-    return RunReportModel(
+    report = RunReportModel.model_construct(
         run_id=row.run_id,
         symbol=row.symbol,
         timeframe=row.timeframe,
@@ -77,3 +82,4 @@ async def get_run(run_id: str, session: AsyncSession = Depends(get_session)) ->
         error_text=row.error_text,
         mode=row.mode,
     )
+    return _json_response(report.model_dump_json())
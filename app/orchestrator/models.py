@@ -1,8 +1,13 @@
 """Macro 9 orchestration persistence models."""
-from sqlalchemy import Column, DateTime, Index, JSON, String, Text, UniqueConstraint
+from sqlalchemy import Column, DateTime, Index, JSON, String, Text, UniqueConstraint, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB
 
 from app.marketdata.models import Base
 
+# Report payloads: binary JSONB on PostgreSQL, generic JSON elsewhere. Missing
+# payloads are stored as SQL NULL rather than encoded as the JSON text 'null'.
+ReportJSON = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 
 class RunReport(Base):
     __tablename__ = "run_reports"
@@ -16,12 +21,12 @@ class RunReport(Base):
     candle_ts = Column(DateTime(timezone=True), nullable=False)
     status = Column(String(10), nullable=False)
 
-    intent_json = Column(JSON, nullable=True)
-    risk_json = Column(JSON, nullable=True)
-    order_json = Column(JSON, nullable=True)
-    fill_json = Column(JSON, nullable=True)
-    positions_json = Column(JSON, nullable=True)
-    account_json = Column(JSON, nullable=True)
+    intent_json = Column(ReportJSON, nullable=True)
+    risk_json = Column(ReportJSON, nullable=True)
+    order_json = Column(ReportJSON, nullable=True)
+    fill_json = Column(ReportJSON, nullable=True)
+    positions_json = Column(ReportJSON, nullable=True)
+    account_json = Column(ReportJSON, nullable=True)
 
     summary_text = Column(Text, nullable=False, default="")
     telegram_text = Column(Text, nullable=False, default="")
@@ -31,3 +36,17 @@ class RunReport(Base):
 
 Index("ix_run_reports_candle_ts", RunReport.candle_ts)
 Index("ix_run_reports_status", RunReport.status)
+
+# Terminal runs (OK/NOOP) are final for their candle; ERROR runs may be retried.
+_TERMINAL_RUN_PREDICATE = text("status IN ('OK', 'NOOP')")
+# Query-side form of the predicate, rendered inline so the planner can match the
+# partial index even under generic prepared plans.
+TERMINAL_RUN_FILTER = RunReport.status.in_([literal_column("'OK'"), literal_column("'NOOP'")])
+Index(
+    "ix_run_reports_terminal",
+    RunReport.symbol,
+    RunReport.timeframe,
+    RunReport.candle_ts,
+    postgresql_where=_TERMINAL_RUN_PREDICATE,
+    sqlite_where=_TERMINAL_RUN_PREDICATE,
+)
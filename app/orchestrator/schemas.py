@@ -38,6 +38,20 @@ class RunReportModel(BaseModel):
     mode: RunMode
 
 
+class RunReportSummaryModel(BaseModel):
+    """Run report without the JSON payloads (``/runs?details=false``)."""
+
+    run_id: str
+    symbol: str
+    timeframe: str
+    candle_ts: datetime
+    status: RunStatus
+    summary_text: str
+    telegram_text: str
+    error_text: str | None = None
+    mode: RunMode
+
+
 class OrchestratorRunRequest(BaseModel):
     symbol: str = Field(default="EURUSD")
     timeframe: str = Field(default="M5")
@@ -1,28 +1,135 @@
 """Macro 9 orchestration service."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+import time
 import uuid
-from typing import Any
+import weakref
+from typing import Any, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.accounting.service import AccountingEngine
+from app.config import Config
 from app.equity.service import mark_to_market_account
 from app.execution.models import Fill, Order, Position
+from app.marketdata.db import dump_json
+from app.marketdata.ingest import COPY_MIN_ROWS
 from app.marketdata.models import Candle
+from app.marketdata.write_hooks import on_table_write
 from app.oms.schemas import OMSPlaceOrderIn
 from app.oms.service import place_order
-from app.orchestrator.models import RunReport
-from app.orchestrator.schemas import OrderPlan, OrchestratorRunResult, RunMode, RunStatus
+from app.orchestrator.models import TERMINAL_RUN_FILTER, RunReport
+from app.orchestrator.schemas import (
+    OrderPlan,
+    OrchestratorRunResult,
+    RunMode,
+    RunReportModel,
+    RunReportSummaryModel,
+    RunStatus,
+)
 from app.risk.service import RiskEngine
+from app.strategy_engine.base import CandleBatch
 from app.strategy_engine.service import StrategyRunner
 from app.strategy_engine.schemas import StrategyIntent
 
 
 PIP_SIZE = 0.0001
+# Candles handed to the strategy, ending at the cycle's candle
+INTENT_WINDOW = 200
+# Built once: EmaAtrStrategy keeps no per-run state (reset() is a no-op), so cycles share it
+_EMA_ATR_STRATEGY = StrategyRunner.create_strategy("ema_atr", None)
+
+# Columns the run list serves; everything else on RunReport stays out of the list query
+_RUN_LIST_COLUMNS = tuple(getattr(RunReport, name) for name in RunReportModel.model_fields)
+# Run list without the JSON payloads
+_RUN_SUMMARY_COLUMNS = tuple(getattr(RunReport, name) for name in RunReportSummaryModel.model_fields)
+
+# Per-engine LRU of (symbol, timeframe, candle_ts, limit) -> (cached_at, candle window rows).
+# Replays, retries and webhook redeliveries re-read the same windows; any write to
+# candles (ingest overlap, retention) drops the engine's entries, and a short TTL
+# bounds staleness for writes made by other processes.
+WINDOW_CACHE_MAX_ENTRIES = 1024
+_window_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+on_table_write(("candles",), lambda bind: _window_cache.pop(bind, None))
+
+# Prebuilt statements: built and compiled once, executed with bound parameters
+_TERMINAL_RUN_STMT = select(RunReport).where(
+    RunReport.symbol == bindparam("symbol"),
+    RunReport.timeframe == bindparam("timeframe"),
+    RunReport.candle_ts == bindparam("candle_ts"),
+    TERMINAL_RUN_FILTER,
+)
+_RUN_BY_ID_STMT = select(RunReport).where(RunReport.run_id == bindparam("run_id"))
+# Plain columns rather than Candle entities: rows are read-only inputs, so skip ORM hydration
+_CANDLES_UPTO_STMT = (
+    select(
+        Candle.symbol,
+        Candle.timeframe,
+        Candle.open_time,
+        Candle.open,
+        Candle.high,
+        Candle.low,
+        Candle.close,
+        Candle.volume,
+    )
+    .where(
+        Candle.symbol == bindparam("symbol"),
+        Candle.timeframe == bindparam("timeframe"),
+        Candle.open_time <= bindparam("candle_ts"),
+    )
+    .order_by(Candle.open_time.desc())
+    .limit(bindparam("limit"))
+)
+# Also reads the order's post-fill Position: accounting never touches positions, so
+# this serves the positions snapshot taken later in the cycle.
+_ORDER_AND_FILL_STMT = (
+    select(Order, Fill, Position)
+    .outerjoin(Fill, (Fill.order_id == Order.id) & (Fill.id == bindparam("fill_id")))
+    .outerjoin(Position, Position.symbol == Order.symbol)
+    .where(Order.id == bindparam("order_id"))
+)
+
+# Columns of uq_run_reports_symbol_tf_ts, the upsert conflict target
+_RUN_NATURAL_KEY = ("symbol", "timeframe", "candle_ts")
+
+# Replayed reports are written in statements of at most this many rows
+REPORT_BATCH_SIZE = 500
+_REPORT_COLUMNS = tuple(c.key for c in RunReport.__table__.columns)
+_REPORT_JSON_COLUMNS = frozenset(name for name in _REPORT_COLUMNS if name.endswith("_json"))
+_REPORT_COLUMN_LIST = ", ".join(_REPORT_COLUMNS)
+# Session-private staging table for COPY, emptied on commit like candles_stage
+_CREATE_REPORT_STAGE_SQL = text(
+    "CREATE TEMP TABLE IF NOT EXISTS run_reports_stage "
+    "(LIKE run_reports INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+)
+_MERGE_REPORT_STAGE_SQL = text(
+    f"INSERT INTO run_reports ({_REPORT_COLUMN_LIST}) "
+    f"SELECT {_REPORT_COLUMN_LIST} FROM run_reports_stage "
+    f"ON CONFLICT ({', '.join(_RUN_NATURAL_KEY)}) DO UPDATE SET "
+    + ", ".join(f"{name} = EXCLUDED.{name}" for name in _REPORT_COLUMNS if name not in _RUN_NATURAL_KEY)
+)
+_TRUNCATE_REPORT_STAGE_SQL = text("TRUNCATE run_reports_stage")
+
+
+def _as_utc(ts: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def _dialect_insert(session: AsyncSession, model):
+    """Return an INSERT construct that supports ON CONFLICT for the bound dialect."""
+    bind = session.get_bind()
+    if bind is not None and bind.dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
 
 
 @asynccontextmanager
@@ -39,6 +146,12 @@ class OrchestratorService:
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        # Strategy windows fetched by _get_exact_candle, reused by _compute_intent_for_candle
+        self._windows: dict[tuple[str, str, datetime], list[Row]] = {}
+        # Position snapshots read by _get_order_and_fill, reused by _positions_snapshot
+        self._position_snapshots: dict[str, dict[str, Any]] = {}
+        # Set by run_cycles: reports are collected here, keyed by natural key, and written at the end
+        self._report_buffer: dict[tuple[str, str, datetime], dict[str, Any]] | None = None
 
     async def run_cycle(
         self,
@@ -50,31 +163,47 @@ class OrchestratorService:
     ) -> OrchestratorRunResult:
         symbol_norm = symbol.upper()
         timeframe_norm = timeframe.upper()
-        run_id = self._deterministic_run_id(symbol_norm, timeframe_norm, candle_ts)
+        candle_ts_iso = candle_ts.isoformat()
+        run_id = self._deterministic_run_id(symbol_norm, timeframe_norm, candle_ts_iso)
+        # Telegram lines other than status and summary are fixed for the cycle: format them once
+        telegram_head = f"run_id: {run_id}\nstatus: "
+        telegram_tail = (
+            f"\nsymbol: {symbol_norm}\ntimeframe: {timeframe_norm}\ncandle_ts: {candle_ts_iso}\nsummary: "
+        )
 
-        # A) Validate candle exists
-        candle = await self._get_exact_candle(symbol_norm, timeframe_norm, candle_ts)
-        if candle is None:
+        async def finish(
+            status: RunStatus,
+            summary_text: str,
+            *,
+            telegram_summary: str | None = None,
+            **payload: Any,
+        ) -> OrchestratorRunResult:
+            """Persist this cycle's report and return it as the run result."""
+            if telegram_summary is None:
+                telegram_summary = summary_text
             report = await self._upsert_report(
                 run_id=run_id,
                 symbol=symbol_norm,
                 timeframe=timeframe_norm,
                 candle_ts=candle_ts,
-                status="NOOP",
-                summary_text=f"{symbol_norm} {timeframe_norm} {candle_ts.isoformat()} => NOOP (missing_candle)",
-                telegram_text=self._format_telegram(
-                    run_id=run_id,
-                    status="NOOP",
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    summary="missing_candle",
-                ),
-                error_text="missing_candle",
+                status=status,
+                summary_text=summary_text,
+                telegram_text=f"{telegram_head}{status}{telegram_tail}{telegram_summary}",
                 mode=mode,
+                **payload,
             )
             return self._to_result(report)
 
+        # A) Validate candle exists
+        candle = await self._get_exact_candle(symbol_norm, timeframe_norm, candle_ts)
+        if candle is None:
+            return await finish(
+                "NOOP",
+                f"{symbol_norm} {timeframe_norm} {candle_ts_iso} => NOOP (missing_candle)",
+                telegram_summary="missing_candle",
+                error_text="missing_candle",
+            )
+
         # B) Idempotency check
         existing = await self._find_existing_terminal(symbol_norm, timeframe_norm, candle_ts)
         if existing is not None:
@@ -90,26 +219,7 @@ class OrchestratorService:
 
             # E) HOLD => NOOP
             if intent.action == "HOLD":
-                report = await self._upsert_report(
-                    run_id=run_id,
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    status="NOOP",
-                    intent_json=intent_json,
-                    account_json=account_mtm,
-                    summary_text=intent.summary,
-                    telegram_text=self._format_telegram(
-                        run_id=run_id,
-                        status="NOOP",
-                        symbol=symbol_norm,
-                        timeframe=timeframe_norm,
-                        candle_ts=candle_ts,
-                        summary=intent.summary,
-                    ),
-                    mode=mode,
-                )
-                return self._to_result(report)
+                return await finish("NOOP", intent.summary, intent_json=intent_json, account_json=account_mtm)
 
             # F) Risk + OrderPlan
             order_plan, risk_json = await self._build_order_plan(
@@ -119,95 +229,50 @@ class OrchestratorService:
             )
 
             if order_plan is None:
-                summary = f"{intent.summary} => NOOP (risk_rejected)"
-                report = await self._upsert_report(
-                    run_id=run_id,
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    status="NOOP",
+                return await finish(
+                    "NOOP",
+                    f"{intent.summary} => NOOP (risk_rejected)",
                     intent_json=intent_json,
                     risk_json=risk_json,
                     account_json=account_mtm,
-                    summary_text=summary,
-                    telegram_text=self._format_telegram(
-                        run_id=run_id,
-                        status="NOOP",
-                        symbol=symbol_norm,
-                        timeframe=timeframe_norm,
-                        candle_ts=candle_ts,
-                        summary=summary,
-                    ),
-                    mode=mode,
                 )
-                return self._to_result(report)
 
             if mode == "dry_run":
-                summary = f"{intent.summary} => NOOP (dry_run)"
-                report = await self._upsert_report(
-                    run_id=run_id,
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    status="NOOP",
+                return await finish(
+                    "NOOP",
+                    f"{intent.summary} => NOOP (dry_run)",
                     intent_json=intent_json,
                     risk_json=risk_json,
                     account_json=account_mtm,
-                    summary_text=summary,
-                    telegram_text=self._format_telegram(
-                        run_id=run_id,
-                        status="NOOP",
-                        symbol=symbol_norm,
-                        timeframe=timeframe_norm,
-                        candle_ts=candle_ts,
-                        summary=summary,
-                    ),
-                    mode=mode,
                 )
-                return self._to_result(report)
 
             # G) Create market order via OMS
             oms_out = await place_order(
                 self.session,
-                OMSPlaceOrderIn(
+                # Fields come from the validated OrderPlan: skip re-validating them
+                OMSPlaceOrderIn.model_construct(
                     symbol=symbol_norm,
                     side=order_plan.side,
                     qty=order_plan.qty,
                     type="market",
                     stop_loss=order_plan.stop_loss,
                     take_profit=order_plan.take_profit,
-                    idempotency_key=self._order_idempotency_key(symbol_norm, timeframe_norm, candle_ts, order_plan.side),
+                    idempotency_key=self._order_idempotency_key(symbol_norm, timeframe_norm, candle_ts_iso, order_plan.side),
                 ),
             )
 
             if oms_out["status"] != "FILLED":
-                summary = f"{intent.summary} => NOOP (order_{oms_out['status'].lower()})"
-                report = await self._upsert_report(
-                    run_id=run_id,
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    status="NOOP",
+                return await finish(
+                    "NOOP",
+                    f"{intent.summary} => NOOP (order_{oms_out['status'].lower()})",
                     intent_json=intent_json,
                     risk_json=risk_json,
                     order_json=oms_out,
                     account_json=account_mtm,
-                    summary_text=summary,
-                    telegram_text=self._format_telegram(
-                        run_id=run_id,
-                        status="NOOP",
-                        symbol=symbol_norm,
-                        timeframe=timeframe_norm,
-                        candle_ts=candle_ts,
-                        summary=summary,
-                    ),
-                    mode=mode,
                 )
-                return self._to_result(report)
 
             # H/I) Fill + positions/pnl/account update
-            fill_row = await self._get_fill(oms_out.get("fill_id"))
-            order_row = await self._get_order(oms_out.get("order_id"))
+            order_row, fill_row = await self._get_order_and_fill(oms_out.get("order_id"), oms_out.get("fill_id"))
 
             acct_snap = await AccountingEngine.process_accounting_for_candle(
                 self.session,
@@ -226,73 +291,78 @@ class OrchestratorService:
                 "asof_open_time": acct_snap.asof_open_time.isoformat(),
             }
 
-            summary = self._format_summary(symbol_norm, timeframe_norm, intent_json, order_plan, order_row, fill_row)
-            telegram_text = self._format_telegram(
-                run_id=run_id,
-                status="OK",
-                symbol=symbol_norm,
-                timeframe=timeframe_norm,
-                candle_ts=candle_ts,
-                summary=summary,
-            )
-
-            report = await self._upsert_report(
-                run_id=run_id,
-                symbol=symbol_norm,
-                timeframe=timeframe_norm,
-                candle_ts=candle_ts,
-                status="OK",
+            return await finish(
+                "OK",
+                self._format_summary(symbol_norm, timeframe_norm, intent_json, order_plan, order_row, fill_row),
                 intent_json=intent_json,
                 risk_json=risk_json,
                 order_json=order_row,
                 fill_json=fill_row,
                 positions_json=positions_json,
                 account_json=account_json,
-                summary_text=summary,
-                telegram_text=telegram_text,
-                mode=mode,
             )
-            return self._to_result(report)
 
         except Exception as exc:
-            report = await self._upsert_report(
-                run_id=run_id,
-                symbol=symbol_norm,
-                timeframe=timeframe_norm,
-                candle_ts=candle_ts,
-                status="ERROR",
-                summary_text=f"{symbol_norm} {timeframe_norm} {candle_ts.isoformat()} => ERROR",
-                telegram_text=self._format_telegram(
-                    run_id=run_id,
-                    status="ERROR",
-                    symbol=symbol_norm,
-                    timeframe=timeframe_norm,
-                    candle_ts=candle_ts,
-                    summary=str(exc),
-                ),
+            return await finish(
+                "ERROR",
+                f"{symbol_norm} {timeframe_norm} {candle_ts_iso} => ERROR",
+                telegram_summary=str(exc),
                 error_text=str(exc),
-                mode=mode,
             )
-            return self._to_result(report)
 
-    async def list_runs(self, *, limit: int = 100) -> list[RunReport]:
-        res = await self.session.execute(select(RunReport).order_by(RunReport.candle_ts.desc()).limit(limit))
-        return list(res.scalars().all())
+    async def run_cycles(
+        self,
+        *,
+        symbol: str,
+        timeframe: str,
+        candle_ts_list: Sequence[datetime],
+        mode: RunMode,
+    ) -> list[OrchestratorRunResult]:
+        """Replay run_cycle over historical candles, writing all reports in one batch.
+
+        Each distinct candle runs once, in the given order. Reports are buffered and
+        flushed together at the end (COPY on PostgreSQL), so they are not visible to
+        queries until the replay finishes.
+        """
+        self._report_buffer = {}
+        try:
+            results = [
+                await self.run_cycle(symbol=symbol, timeframe=timeframe, candle_ts=candle_ts, mode=mode)
+                for candle_ts in dict.fromkeys(candle_ts_list)
+            ]
+            await self._flush_reports(list(self._report_buffer.values()))
+        finally:
+            self._report_buffer = None
+        return results
+
+    async def list_runs(self, *, limit: int = 100, details: bool = True) -> list[dict[str, Any]]:
+        """Newest run reports as plain column dicts.
+
+        With details=False the six JSON payload columns are not selected, so they
+        are neither transferred nor decoded; get_run() still returns them.
+        """
+        columns = _RUN_LIST_COLUMNS if details else _RUN_SUMMARY_COLUMNS
+        stmt = select(*columns).order_by(RunReport.candle_ts.desc()).limit(limit)
+        res = await self.session.execute(stmt)
+        return [dict(row) for row in res.mappings()]
 
     async def get_run(self, run_id: str) -> RunReport | None:
-        res = await self.session.execute(select(RunReport).where(RunReport.run_id == run_id))
+        res = await self.session.execute(_RUN_BY_ID_STMT, {"run_id": run_id})
         return res.scalar_one_or_none()
 
     async def _compute_intent_for_candle(self, symbol: str, timeframe: str, candle_ts: datetime) -> StrategyIntent:
-        strategy = StrategyRunner.create_strategy("ema_atr", None)
-        candles = await self._fetch_candles_upto(symbol, timeframe, candle_ts, limit=200)
-        return strategy.compute_intent(candles)
+        strategy = _EMA_ATR_STRATEGY
+        candles = self._windows.pop((symbol, timeframe, candle_ts), None)
+        if candles is None:
+            candles = await self._fetch_candles_upto(symbol, timeframe, candle_ts, limit=INTENT_WINDOW)
+        # Hand the strategy its columns directly rather than per-candle rows
+        return strategy.compute_intent(CandleBatch.from_rows(candles) if candles else candles)
 
     async def _build_order_plan(
         self,
         *,
         symbol: str,
-        candle: Candle,
+        candle: Row,
         intent: StrategyIntent,
     ) -> tuple[OrderPlan | None, dict[str, Any]]:
         side = intent.action
@@ -339,43 +409,61 @@ class OrchestratorService:
 
     async def _find_existing_terminal(self, symbol: str, timeframe: str, candle_ts: datetime) -> RunReport | None:
         res = await self.session.execute(
-            select(RunReport).where(
-                RunReport.symbol == symbol,
-                RunReport.timeframe == timeframe,
-                RunReport.candle_ts == candle_ts,
-                RunReport.status.in_(["OK", "NOOP"]),
-            )
+            _TERMINAL_RUN_STMT, {"symbol": symbol, "timeframe": timeframe, "candle_ts": candle_ts}
         )
         return res.scalar_one_or_none()
 
-    async def _get_exact_candle(self, symbol: str, timeframe: str, candle_ts: datetime) -> Candle | None:
-        res = await self.session.execute(
-            select(Candle).where(
-                Candle.symbol == symbol,
-                Candle.timeframe == timeframe,
-                Candle.open_time == candle_ts,
-            )
-        )
-        return res.scalar_one_or_none()
+    async def _get_exact_candle(self, symbol: str, timeframe: str, candle_ts: datetime) -> Row | None:
+        # The strategy needs the window ending at this candle anyway: one query serves both.
+        window = await self._fetch_candles_upto(symbol, timeframe, candle_ts, limit=INTENT_WINDOW)
+        if not window or _as_utc(window[-1].open_time) != _as_utc(candle_ts):
+            return None
+        self._windows[(symbol, timeframe, candle_ts)] = window
+        return window[-1]
+
+    async def _fetch_candles_upto(self, symbol: str, timeframe: str, candle_ts: datetime, *, limit: int) -> list[Row]:
+        """Up to ``limit`` candles ending at candle_ts, oldest first, as attribute-accessible rows.
+
+        Windows are memoized per engine for CANDLE_WINDOW_CACHE_TTL_SEC or until the
+        next write to candles. Only windows ending at candle_ts are kept, so a cycle
+        that ran before its candle landed never caches the miss; sessions holding
+        unflushed changes always read afresh.
+        """
+        bind = self.session.get_bind()
+        candle_ts_utc = _as_utc(candle_ts)
+        key = (symbol, timeframe, candle_ts_utc, limit)
+        cacheable = not (self.session.new or self.session.dirty or self.session.deleted)
+        if cacheable:
+            entries = _window_cache.get(bind)
+            entry = entries.get(key) if entries is not None else None
+            if entry is not None:
+                cached_at, window = entry
+                if time.monotonic() - cached_at < Config.CANDLE_WINDOW_CACHE_TTL_SEC:
+                    entries.move_to_end(key)
+                    return window
+                del entries[key]
 
-    async def _fetch_candles_upto(self, symbol: str, timeframe: str, candle_ts: datetime, *, limit: int) -> list[Candle]:
         res = await self.session.execute(
-            select(Candle)
-            .where(
-                Candle.symbol == symbol,
-                Candle.timeframe == timeframe,
-                Candle.open_time <= candle_ts,
-            )
-            .order_by(Candle.open_time.desc())
-            .limit(limit)
+            _CANDLES_UPTO_STMT,
+            {"symbol": symbol, "timeframe": timeframe, "candle_ts": candle_ts, "limit": limit},
         )
-        out = list(res.scalars().all())
-        out.reverse()
-        return out
+        window = res.all()[::-1]
+        if cacheable and window and _as_utc(window[-1].open_time) == candle_ts_utc:
+            entries = _window_cache.setdefault(bind, OrderedDict())
+            entries[key] = (time.monotonic(), window)
+            if len(entries) > WINDOW_CACHE_MAX_ENTRIES:
+                entries.popitem(last=False)
+        return window
 
     async def _positions_snapshot(self, symbol: str) -> dict[str, Any]:
+        snapshot = self._position_snapshots.pop(symbol, None)
+        if snapshot is not None:
+            return snapshot
         res = await self.session.execute(select(Position).where(Position.symbol == symbol))
-        pos = res.scalar_one_or_none()
+        return self._position_dict(res.scalar_one_or_none())
+
+    @staticmethod
+    def _position_dict(pos: Position | None) -> dict[str, Any]:
         if pos is None:
             return {"position": None}
         return {
@@ -388,13 +476,22 @@ class OrchestratorService:
             }
         }
 
-    async def _get_fill(self, fill_id: int | None) -> dict[str, Any] | None:
-        if fill_id is None:
-            return None
-        res = await self.session.execute(select(Fill).where(Fill.id == fill_id))
-        fill = res.scalar_one_or_none()
-        if fill is None:
-            return None
+    async def _get_order_and_fill(
+        self, order_id: int | None, fill_id: int | None
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """Order and its fill as report dicts, read in one round-trip."""
+        if order_id is None:
+            return None, None
+        res = await self.session.execute(_ORDER_AND_FILL_STMT, {"order_id": order_id, "fill_id": fill_id})
+        row = res.one_or_none()
+        if row is None:
+            return None, None
+        order, fill, position = row
+        self._position_snapshots[order.symbol] = self._position_dict(position)
+        return self._order_dict(order), self._fill_dict(fill) if fill is not None else None
+
+    @staticmethod
+    def _fill_dict(fill: Fill) -> dict[str, Any]:
         return {
             "id": fill.id,
             "order_id": fill.order_id,
@@ -405,13 +502,8 @@ class OrchestratorService:
             "ts": fill.ts.isoformat(),
         }
 
-    async def _get_order(self, order_id: int | None) -> dict[str, Any] | None:
-        if order_id is None:
-            return None
-        res = await self.session.execute(select(Order).where(Order.id == order_id))
-        order = res.scalar_one_or_none()
-        if order is None:
-            return None
+    @staticmethod
+    def _order_dict(order: Order) -> dict[str, Any]:
         return {
             "id": order.id,
             "symbol": order.symbol,
@@ -441,54 +533,85 @@ class OrchestratorService:
         error_text: str | None = None,
         mode: RunMode,
     ) -> RunReport:
+        values = {
+            "run_id": run_id,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "candle_ts": candle_ts,
+            "status": status,
+            "intent_json": intent_json,
+            "risk_json": risk_json,
+            "order_json": order_json,
+            "fill_json": fill_json,
+            "positions_json": positions_json,
+            "account_json": account_json,
+            "summary_text": summary_text,
+            "telegram_text": telegram_text,
+            "error_text": error_text,
+            "mode": mode,
+        }
+        if self._report_buffer is not None:
+            # Replay: keep the last report per candle; _flush_reports writes them all
+            self._report_buffer[(symbol, timeframe, candle_ts)] = values
+            return RunReport(**values)
+        # One statement: the database decides insert vs update on the natural key.
+        stmt = _dialect_insert(self.session, RunReport).values(**values)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=_RUN_NATURAL_KEY,
+                set_={k: v for k, v in values.items() if k not in _RUN_NATURAL_KEY},
+            )
+            .returning(RunReport)
+            .execution_options(populate_existing=True)
+        )
+        async with _transaction_scope(self.session):
+            res = await self.session.execute(stmt)
+            return res.scalar_one()
+
+    async def _flush_reports(self, rows: list[dict[str, Any]]) -> None:
+        """Upsert buffered report rows, COPY-staged on PostgreSQL for large batches."""
+        if not rows:
+            return
+        use_copy = self.session.get_bind().dialect.name == "postgresql"
         async with _transaction_scope(self.session):
-            res = await self.session.execute(
-                select(RunReport).where(
-                    RunReport.symbol == symbol,
-                    RunReport.timeframe == timeframe,
-                    RunReport.candle_ts == candle_ts,
+            for offset in range(0, len(rows), REPORT_BATCH_SIZE):
+                chunk = rows[offset:offset + REPORT_BATCH_SIZE]
+                if use_copy and len(chunk) >= COPY_MIN_ROWS:
+                    await self._copy_upsert_reports(chunk)
+                    continue
+                stmt = _dialect_insert(self.session, RunReport).values(chunk)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=_RUN_NATURAL_KEY,
+                    set_={name: stmt.excluded[name] for name in _REPORT_COLUMNS if name not in _RUN_NATURAL_KEY},
                 )
-            )
-            row = res.scalar_one_or_none()
-            if row is None:
-                row = RunReport(
-                    run_id=run_id,
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    candle_ts=candle_ts,
-                    status=status,
-                    intent_json=intent_json,
-                    risk_json=risk_json,
-                    order_json=order_json,
-                    fill_json=fill_json,
-                    positions_json=positions_json,
-                    account_json=account_json,
-                    summary_text=summary_text,
-                    telegram_text=telegram_text,
-                    error_text=error_text,
-                    mode=mode,
+                await self.session.execute(stmt)
+
+    async def _copy_upsert_reports(self, rows: list[dict[str, Any]]) -> None:
+        """COPY report rows into a staging table, then merge them with one INSERT ... SELECT."""
+        await self.session.execute(_CREATE_REPORT_STAGE_SQL)
+        conn = await self.session.connection()
+        raw = await conn.get_raw_connection()
+        # COPY bypasses SQLAlchemy's JSON type: encode payloads as it would (None stays NULL)
+        await raw.driver_connection.copy_records_to_table(
+            "run_reports_stage",
+            records=[
+                tuple(
+                    dump_json(row[name])
+                    if name in _REPORT_JSON_COLUMNS and row[name] is not None
+                    else row[name]
+                    for name in _REPORT_COLUMNS
                 )
-                self.session.add(row)
-            else:
-                row.run_id = run_id
-                row.status = status
-                row.intent_json = intent_json
-                row.risk_json = risk_json
-                row.order_json = order_json
-                row.fill_json = fill_json
-                row.positions_json = positions_json
-                row.account_json = account_json
-                row.summary_text = summary_text
-                row.telegram_text = telegram_text
-                row.error_text = error_text
-                row.mode = mode
-
-            await self.session.flush()
-            return row
+                for row in rows
+            ],
+            columns=list(_REPORT_COLUMNS),
+        )
+        await self.session.execute(_MERGE_REPORT_STAGE_SQL)
+        await self.session.execute(_TRUNCATE_REPORT_STAGE_SQL)
 
     @staticmethod
     def _to_result(row: RunReport) -> OrchestratorRunResult:
-        return OrchestratorRunResult(
+        # Every field comes from the report row we just wrote or read: skip validation
+        return OrchestratorRunResult.model_construct(
             run_id=row.run_id,
             status=row.status,
             candle_ts=row.candle_ts,
@@ -507,13 +630,16 @@ class OrchestratorService:
         )
 
     @staticmethod
-    def _deterministic_run_id(symbol: str, timeframe: str, candle_ts: datetime) -> str:
-        seed = f"macro9:{symbol}:{timeframe}:{candle_ts.isoformat()}"
+    @lru_cache(maxsize=4096)
+    def _deterministic_run_id(symbol: str, timeframe: str, candle_ts_iso: str) -> str:
+        # Pure function of its inputs; keyed on the ISO string so equal instants
+        # written with different offsets keep distinct ids, as before.
+        seed = f"macro9:{symbol}:{timeframe}:{candle_ts_iso}"
         return str(uuid.uuid5(uuid.NAMESPACE_URL, seed))
 
     @staticmethod
-    def _order_idempotency_key(symbol: str, timeframe: str, candle_ts: datetime, side: str) -> str:
-        return f"macro9:{symbol}:{timeframe}:{candle_ts.isoformat()}:{side}"
+    def _order_idempotency_key(symbol: str, timeframe: str, candle_ts_iso: str, side: str) -> str:
+        return f"macro9:{symbol}:{timeframe}:{candle_ts_iso}:{side}"
 
     @staticmethod
     def _format_summary(
@@ -535,23 +661,3 @@ class OrchestratorService:
             f"qty={order_plan.qty}, fill={fill_price}, order_status={(order_row or {}).get('status')}"
         )
 
-    @staticmethod
-    def _format_telegram(
-        *,
-        run_id: str,
-        status: str,
-        symbol: str,
-        timeframe: str,
-        candle_ts: datetime,
-        summary: str,
-    ) -> str:
-        return "\n".join(
-            [
-                f"run_id: {run_id}",
-                f"status: {status}",
-                f"symbol: {symbol}",
-                f"timeframe: {timeframe}",
-                f"candle_ts: {candle_ts.isoformat()}",
-                f"summary: {summary}",
-            ]
-        )
@@ -70,8 +70,7 @@ async def risk_status(
 ) -> RiskStatusOut:
     asof = await _resolve_asof(session, symbol, asof_open_time)
     async with session.begin():
-        limits = await RiskEngine._ensure_limits(session, account_id)
-        snapshot = await RiskEngine.compute_snapshot(session, account_id, asof, symbol=symbol)
+        snapshot, limits, _ = await RiskEngine.compute_snapshot_with_limits(session, account_id, asof, symbol=symbol)
 
     return RiskStatusOut(
         account_id=account_id,
@@ -13,21 +13,18 @@ class RiskManager:
         self.max_positions = max_positions
 
     def validate_trade(self, symbol: str, quantity: float, entry_price: float, side: str) -> bool:
-        try:
-            open_positions = len(self.broker.get_positions())
-            if open_positions >= self.max_positions:
-                logger.warning("Max positions (%s) reached", self.max_positions)
-                return False
-
-            position_value = quantity * entry_price
-            if position_value > self.max_position_size:
-                logger.warning("Position size %s exceeds max %s", position_value, self.max_position_size)
-                return False
-
-            return True
-        except Exception as e:
-            logger.error("Error validating trade: %s", e)
-            return False
+        max_positions = self.max_positions
+        max_position_size = self.max_position_size
+        # Size the broker's live position dict; get_positions() would copy it on every check
+        open_positions = len(self.broker.positions)
+        position_value = quantity * entry_price
+        allowed = open_positions < max_positions and position_value <= max_position_size
+        if not allowed and logger.isEnabledFor(logging.WARNING):
+            if open_positions >= max_positions:
+                logger.warning("Max positions (%s) reached", max_positions)
+            else:
+                logger.warning("Position size %s exceeds max %s", position_value, max_position_size)
+        return allowed
 
     def get_available_balance(self) -> float:
         return self.broker.get_balance()
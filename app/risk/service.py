@@ -5,8 +5,10 @@ from dataclasses import dataclass
 from datetime import datetime
 import math
 
-from sqlalchemy import select
+from sqlalchemy import String, bindparam, func, select, true
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.config import Config
 from app.equity.service import compute_account_state
@@ -17,6 +19,54 @@ from app.risk.models import DailyEquity, RiskLimits
 
 PIP_VALUE_PER_UNIT = 0.0001
 
+# Every order check and /risk/status call runs these lookups; account, day and
+# symbol values are bound per call so each statement shape is compiled once
+_LIMITS_STMT = select(RiskLimits).where(RiskLimits.account_id == bindparam("account_id"))
+_ACCOUNT_STMT = select(Account).where(Account.id == bindparam("account_id"))
+_ACCOUNT_AND_LIMITS_STMT = (
+    select(Account, RiskLimits)
+    .outerjoin(RiskLimits, RiskLimits.account_id == Account.id)
+    .where(Account.id == bindparam("account_id"))
+)
+# Latest candle per symbol with a per-symbol LIMIT 1, so each lookup is an index
+# seek on (symbol, timeframe, open_time) instead of ranking the whole history.
+# PostgreSQL drives a LATERAL join from the bound symbol array; SQLite resolves
+# a correlated max(open_time) per symbol instead.
+_SYMBOLS = func.unnest(bindparam("symbols", type_=postgresql.ARRAY(String))).table_valued("symbol").render_derived()
+_LATEST_PER_SYMBOL = (
+    select(Candle)
+    .where(
+        Candle.symbol == _SYMBOLS.c.symbol,
+        Candle.timeframe == bindparam("timeframe"),
+        Candle.open_time <= bindparam("asof_open_time"),
+    )
+    .order_by(Candle.open_time.desc())
+    .limit(1)
+    .lateral()
+)
+_LATEST_CANDLES_PG_STMT = (
+    select(aliased(Candle, _LATEST_PER_SYMBOL)).select_from(_SYMBOLS).join(_LATEST_PER_SYMBOL, true())
+)
+_PRIOR_CANDLE = aliased(Candle)
+_LATEST_CANDLES_STMT = select(Candle).where(
+    Candle.symbol.in_(bindparam("symbols", expanding=True)),
+    Candle.timeframe == bindparam("timeframe"),
+    Candle.open_time
+    == select(func.max(_PRIOR_CANDLE.open_time))
+    .where(
+        _PRIOR_CANDLE.symbol == Candle.symbol,
+        _PRIOR_CANDLE.timeframe == Candle.timeframe,
+        _PRIOR_CANDLE.open_time <= bindparam("asof_open_time"),
+    )
+    .scalar_subquery(),
+)
+_DAILY_EQUITY_STMT = select(DailyEquity).where(
+    DailyEquity.account_id == bindparam("account_id"),
+    DailyEquity.day == bindparam("day"),
+)
+# Flat (zero-qty) position rows never reach Python
+_OPEN_POSITIONS_STMT = select(Position).where(Position.qty_signed != 0)
+
 
 @dataclass(frozen=True)
 class RiskDecision:
@@ -29,8 +79,7 @@ class RiskDecision:
 class RiskEngine:
     @staticmethod
     async def _ensure_limits(session: AsyncSession, account_id: int) -> RiskLimits:
-        stmt = select(RiskLimits).where(RiskLimits.account_id == account_id)
-        res = await session.execute(stmt)
+        res = await session.execute(_LIMITS_STMT, {"account_id": account_id})
         limits = res.scalar_one_or_none()
         if limits is not None:
             return limits
@@ -52,8 +101,7 @@ class RiskEngine:
 
     @staticmethod
     async def _get_account(session: AsyncSession, account_id: int, asof_open_time: datetime) -> Account:
-        stmt = select(Account).where(Account.id == account_id)
-        res = await session.execute(stmt)
+        res = await session.execute(_ACCOUNT_STMT, {"account_id": account_id})
         account = res.scalar_one_or_none()
         if account is not None:
             return account
@@ -73,32 +121,42 @@ class RiskEngine:
         return account
 
     @staticmethod
-    async def _latest_candle_at_or_before(
+    async def _get_account_and_limits(
         session: AsyncSession,
-        symbol: str,
+        account_id: int,
+        asof_open_time: datetime,
+    ) -> tuple[Account, RiskLimits]:
+        """Load the account and its limits in one query; create whichever is missing."""
+        res = await session.execute(_ACCOUNT_AND_LIMITS_STMT, {"account_id": account_id})
+        row = res.one_or_none()
+        account, limits = row if row is not None else (None, None)
+        if account is None:
+            account = await RiskEngine._get_account(session, account_id, asof_open_time)
+        if limits is None:
+            limits = await RiskEngine._ensure_limits(session, account_id)
+        return account, limits
+
+    @staticmethod
+    async def _latest_candles_for_symbols(
+        session: AsyncSession,
+        symbols: set[str],
         timeframe: str,
         asof_open_time: datetime,
-    ) -> Candle | None:
+    ) -> dict[str, Candle]:
+        """Latest candle at or before asof for each symbol, in one round-trip."""
         stmt = (
-            select(Candle)
-            .where(
-                Candle.symbol == symbol,
-                Candle.timeframe == timeframe,
-                Candle.open_time <= asof_open_time,
-            )
-            .order_by(Candle.open_time.desc())
-            .limit(1)
+            _LATEST_CANDLES_PG_STMT
+            if session.get_bind().dialect.name == "postgresql"
+            else _LATEST_CANDLES_STMT
+        )
+        res = await session.execute(
+            stmt,
+            {"symbols": sorted(symbols), "timeframe": timeframe, "asof_open_time": asof_open_time},
         )
-        res = await session.execute(stmt)
-        return res.scalar_one_or_none()
+        return {candle.symbol: candle for candle in res.scalars()}
 
     @staticmethod
-    async def _get_reference_candle(
-        session: AsyncSession,
-        symbol: str,
-        asof_open_time: datetime,
-    ) -> Candle:
-        candle = await RiskEngine._latest_candle_at_or_before(session, symbol, Config.TIMEFRAME, asof_open_time)
+    def _require_reference_candle(candle: Candle | None) -> Candle:
         if candle is None:
             raise RuntimeError(
                 "No market data available for risk checks: deterministic risk requires candle.open_time"
@@ -112,8 +170,7 @@ class RiskEngine:
         day,
         equity: float,
     ) -> DailyEquity:
-        stmt = select(DailyEquity).where(DailyEquity.account_id == account_id, DailyEquity.day == day)
-        res = await session.execute(stmt)
+        res = await session.execute(_DAILY_EQUITY_STMT, {"account_id": account_id, "day": day})
         row = res.scalar_one_or_none()
         if row is None:
             row = DailyEquity(
@@ -137,29 +194,41 @@ class RiskEngine:
         asof_open_time: datetime,
         symbol: str | None = None,
     ) -> dict:
+        snapshot, _, _ = await RiskEngine.compute_snapshot_with_limits(session, account_id, asof_open_time, symbol)
+        return snapshot
+
+    @staticmethod
+    async def compute_snapshot_with_limits(
+        session: AsyncSession,
+        account_id: int,
+        asof_open_time: datetime,
+        symbol: str | None = None,
+    ) -> tuple[dict, RiskLimits, Candle]:
+        """Snapshot plus the limits and reference candle it was computed from."""
         symbol = (symbol or Config.SYMBOL).upper()
 
-        await RiskEngine._get_account(session, account_id, asof_open_time)
-        limits = await RiskEngine._ensure_limits(session, account_id)
-        ref_candle = await RiskEngine._get_reference_candle(session, symbol, asof_open_time)
+        account, limits = await RiskEngine._get_account_and_limits(session, account_id, asof_open_time)
 
-        acct_state = await compute_account_state(session, ref_candle)
+        res_pos = await session.execute(_OPEN_POSITIONS_STMT)
+        positions = res_pos.scalars().all()
 
-        stmt_pos = select(Position)
-        res_pos = await session.execute(stmt_pos)
-        positions = [p for p in res_pos.scalars().all() if p.qty_signed != 0]
+        # Reference and position marks come from one batched latest-candle lookup
+        candles = await RiskEngine._latest_candles_for_symbols(
+            session,
+            {symbol, *(pos.symbol for pos in positions)},
+            Config.TIMEFRAME,
+            asof_open_time,
+        )
+        ref_candle = RiskEngine._require_reference_candle(candles.get(symbol))
+
+        acct_state = await compute_account_state(session, ref_candle, account, positions=positions)
 
         total_notional = 0.0
         symbol_notional = 0.0
         open_positions_per_symbol = 0
 
         for pos in positions:
-            pos_candle = await RiskEngine._latest_candle_at_or_before(
-                session,
-                pos.symbol,
-                Config.TIMEFRAME,
-                asof_open_time,
-            )
+            pos_candle = candles.get(pos.symbol)
             if pos_candle is None:
                 continue
             mid = float(pos_candle.open)
@@ -188,7 +257,7 @@ class RiskEngine:
             if float(acct_state["equity"]) <= amt_threshold:
                 daily_loss_breached = True
 
-        return {
+        snapshot = {
             "account_id": account_id,
             "asof_open_time": ref_candle.open_time,
             "day": day,
@@ -204,6 +273,7 @@ class RiskEngine:
             "min_equity": float(daily.min_equity),
             "daily_loss_breached": daily_loss_breached,
         }
+        return snapshot, limits, ref_candle
 
     @staticmethod
     def _floor_to_step(value: float, step: float) -> float:
@@ -229,8 +299,10 @@ class RiskEngine:
         if qty <= 0:
             return RiskDecision(False, 0.0, "qty must be > 0", metrics={})
 
-        limits = await RiskEngine._ensure_limits(session, account_id)
-        snapshot = await RiskEngine.compute_snapshot(session, account_id, asof_open_time, symbol=symbol)
+        # Limits and the reference candle come with the snapshot; no second lookup
+        snapshot, limits, candle = await RiskEngine.compute_snapshot_with_limits(
+            session, account_id, asof_open_time, symbol=symbol
+        )
 
         if snapshot["daily_loss_breached"]:
             return RiskDecision(False, 0.0, "Daily loss limit breached", metrics=snapshot)
@@ -241,7 +313,6 @@ class RiskEngine:
         if snapshot["open_positions_per_symbol"] >= int(limits.max_open_positions_per_symbol):
             return RiskDecision(False, 0.0, "Max open positions per symbol limit reached", metrics=snapshot)
 
-        candle = await RiskEngine._get_reference_candle(session, symbol, asof_open_time)
         mid_price = float(candle.open)
 
         approved_qty = float(qty)
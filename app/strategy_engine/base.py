@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Generic, Sequence, TypeVar
 
 from app.marketdata.models import Candle
 from app.strategy_engine.schemas import StrategyIntent
@@ -10,6 +13,37 @@ from app.strategy_engine.schemas import StrategyIntent
 
 ParamsT = TypeVar("ParamsT", bound=dict[str, Any])
 
+_BATCH_FIELDS = attrgetter("open_time", "high", "low", "close")
+
+
+@dataclass(frozen=True, slots=True)
+class CandleBatch:
+    """Candle history of one series as aligned columns (struct of arrays), oldest first."""
+
+    symbol: str
+    timeframe: str
+    open_time: Sequence[datetime]
+    high: Sequence[float]
+    low: Sequence[float]
+    close: Sequence[float]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "CandleBatch":
+        """Transpose non-empty Candle entities or column rows into one batch."""
+        open_time, high, low, close = zip(*map(_BATCH_FIELDS, rows))
+        latest = rows[-1]
+        return cls(
+            symbol=latest.symbol,
+            timeframe=latest.timeframe,
+            open_time=open_time,
+            high=list(map(float, high)),
+            low=list(map(float, low)),
+            close=list(map(float, close)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
 
 class BaseStrategy(ABC, Generic[ParamsT]):
     """Base class for pure deterministic strategies."""
@@ -31,8 +65,8 @@ class BaseStrategy(ABC, Generic[ParamsT]):
         """Return minimum number of candles required for a stable signal."""
 
     @abstractmethod
-    def compute_intent(self, candles: list[Candle]) -> StrategyIntent:
-        """Compute an intent from deterministic candle history."""
+    def compute_intent(self, candles: CandleBatch | list[Candle]) -> StrategyIntent:
+        """Compute an intent from deterministic candle history (a CandleBatch, or Candle rows)."""
 
     def reset(self) -> None:
         """Reset internal strategy state (MVP strategies are stateless)."""
@@ -4,8 +4,8 @@ from __future__ import annotations
 from typing import Any, TypedDict
 
 from app.marketdata.models import Candle
-from app.strategy_engine.base import BaseStrategy
-from app.strategy_engine.indicators import compute_atr, compute_ema
+from app.strategy_engine.base import BaseStrategy, CandleBatch
+from app.strategy_engine.indicators import ema_atr_last
 from app.strategy_engine.schemas import StrategyIndicators, StrategyIntent, StrategyRiskHints
 
 
@@ -52,8 +52,8 @@ class EmaAtrStrategy(BaseStrategy[EmaAtrParams]):
     def minimum_candles(self) -> int:
         return max(self.params["ema_slow_period"] + 1, self.params["atr_period"] + 1)
 
-    def compute_intent(self, candles: list[Candle]) -> StrategyIntent:
-        if not candles:
+    def compute_intent(self, candles: list[Candle] | CandleBatch) -> StrategyIntent:
+        if not len(candles):
             return StrategyIntent(
                 action="HOLD",
                 reason="insufficient_data",
@@ -65,10 +65,10 @@ class EmaAtrStrategy(BaseStrategy[EmaAtrParams]):
                 summary="no candles => HOLD (insufficient_data)",
             )
 
-        latest = candles[-1]
-        symbol = str(latest.symbol).upper()
-        timeframe = str(latest.timeframe).upper()
-        ts = latest.open_time
+        batch = candles if isinstance(candles, CandleBatch) else CandleBatch.from_rows(candles)
+        symbol = str(batch.symbol).upper()
+        timeframe = str(batch.timeframe).upper()
+        ts = batch.open_time[-1]
 
         if len(candles) < self.minimum_candles():
             return StrategyIntent(
@@ -85,22 +85,19 @@ class EmaAtrStrategy(BaseStrategy[EmaAtrParams]):
                 ),
             )
 
-        closes = [float(c.close) for c in candles]
-        highs = [float(c.high) for c in candles]
-        lows = [float(c.low) for c in candles]
-
-        ema_fast_series = compute_ema(closes, self.params["ema_fast_period"])
-        ema_slow_series = compute_ema(closes, self.params["ema_slow_period"])
-        atr_series = compute_atr(highs, lows, closes, self.params["atr_period"])
-
-        idx = len(candles) - 1
-        prev_idx = idx - 1
-
-        ema_fast = ema_fast_series[idx]
-        ema_slow = ema_slow_series[idx]
-        atr = atr_series[idx]
-        prev_fast = ema_fast_series[prev_idx]
-        prev_slow = ema_slow_series[prev_idx]
+        closes = batch.close
+        highs = batch.high
+        lows = batch.low
+
+        # Only the latest two EMA points and the latest ATR are needed; no full series
+        ema_fast, ema_slow, atr, prev_fast, prev_slow = ema_atr_last(
+            highs,
+            lows,
+            closes,
+            self.params["ema_fast_period"],
+            self.params["ema_slow_period"],
+            self.params["atr_period"],
+        )
 
         if None in (ema_fast, ema_slow, atr, prev_fast, prev_slow):
             return StrategyIntent(
@@ -124,7 +121,7 @@ class EmaAtrStrategy(BaseStrategy[EmaAtrParams]):
             action = "SELL"
             reason = "cross_down"
 
-        close_price = closes[idx]
+        close_price = closes[-1]
         stop_loss = None
         take_profit = None
         if action == "BUY":
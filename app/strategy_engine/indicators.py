@@ -1,6 +1,7 @@
 """Indicator calculations for MACRO 8."""
 from __future__ import annotations
 
+from itertools import islice
 from typing import Sequence
 
 
@@ -26,10 +27,6 @@ def compute_ema(values: Sequence[float], period: int) -> list[float | None]:
     return out
 
 
-def _true_range(curr_high: float, curr_low: float, prev_close: float) -> float:
-    return max(curr_high - curr_low, abs(curr_high - prev_close), abs(curr_low - prev_close))
-
-
 def compute_atr(
     highs: Sequence[float],
     lows: Sequence[float],
@@ -43,23 +40,102 @@ def compute_atr(
         raise ValueError("highs/lows/closes must have same length")
 
     n = len(closes)
-    out: list[float | None] = [None] * n
-    if n < 2:
-        return out
+    if n <= period:
+        return [None] * n
+
+    # True range inlined over zipped columns: no max()/helper call or index lookups per bar
+    tr_values: list[float] = []
+    append_tr = tr_values.append
+    prev_close = closes[0]
+    for high, low, close in zip(highs[1:], lows[1:], closes[1:]):
+        tr = high - low
+        gap = abs(high - prev_close)
+        if gap > tr:
+            tr = gap
+        gap = abs(low - prev_close)
+        if gap > tr:
+            tr = gap
+        append_tr(tr)
+        prev_close = close
+
+    first_atr = sum(tr_values[:period]) / period
+    out: list[float | None] = [None] * period
+    out.append(first_atr)
+
+    append = out.append
+    carry = period - 1
+    prev_atr = first_atr
+    for tr in tr_values[period:]:
+        prev_atr = ((prev_atr * carry) + tr) / period
+        append(prev_atr)
 
-    tr_values: list[float] = [0.0]
-    for i in range(1, n):
-        tr_values.append(_true_range(highs[i], lows[i], closes[i - 1]))
+    return out
 
-    if n <= period:
-        return out
 
-    first_atr = sum(tr_values[1 : period + 1]) / period
-    out[period] = first_atr
+def _ema_tail(values: Sequence[float], period: int) -> tuple[float | None, float | None]:
+    """Return the EMA at the second-to-last and last positions of ``values``."""
+    if len(values) < period:
+        return None, None
 
-    prev_atr = first_atr
-    for i in range(period + 1, n):
-        prev_atr = ((prev_atr * (period - 1)) + tr_values[i]) / period
-        out[i] = prev_atr
+    ema = sum(values[:period]) / period
+    prev = None
+    alpha = 2.0 / (period + 1.0)
+    for value in islice(values, period, None):
+        prev = ema
+        ema = ((value - ema) * alpha) + ema
+    return prev, ema
 
-    return out
+
+def _atr_last(
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
+    period: int,
+) -> float | None:
+    """Return the Wilder ATR at the last position, matching ``compute_atr(...)[-1]``."""
+    if len(closes) <= period:
+        return None
+
+    tr_head: list[float] = []
+    atr = None
+    carry = period - 1
+    prev_close = closes[0]
+    for high, low, close in zip(islice(highs, 1, None), islice(lows, 1, None), islice(closes, 1, None)):
+        tr = high - low
+        gap = abs(high - prev_close)
+        if gap > tr:
+            tr = gap
+        gap = abs(low - prev_close)
+        if gap > tr:
+            tr = gap
+        prev_close = close
+        if atr is None:
+            tr_head.append(tr)
+            if len(tr_head) == period:
+                atr = sum(tr_head) / period
+        else:
+            atr = ((atr * carry) + tr) / period
+    return atr
+
+
+def ema_atr_last(
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
+    fast_period: int,
+    slow_period: int,
+    atr_period: int,
+) -> tuple[float | None, float | None, float | None, float | None, float | None]:
+    """Return (ema_fast, ema_slow, atr, prev_fast, prev_slow) at the latest candle.
+
+    Same values as indexing the compute_ema/compute_atr series, without materializing them.
+    """
+    if fast_period <= 0 or slow_period <= 0 or atr_period <= 0:
+        raise ValueError("period must be > 0")
+    if not (len(highs) == len(lows) == len(closes)):
+        raise ValueError("highs/lows/closes must have same length")
+
+    prev_fast, ema_fast = _ema_tail(closes, fast_period)
+    prev_slow, ema_slow = _ema_tail(closes, slow_period)
+    atr = _atr_last(highs, lows, closes, atr_period)
+    return ema_fast, ema_slow, atr, prev_fast, prev_slow
@@ -1,14 +1,15 @@
 """Service layer for MACRO 8 strategy execution."""
 from __future__ import annotations
 
-from datetime import timedelta
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Sequence
 
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.marketdata.models import Candle
-from app.strategy_engine.base import BaseStrategy
+from app.strategy_engine.base import BaseStrategy, CandleBatch
 from app.strategy_engine.ema_atr import EmaAtrStrategy
 from app.strategy_engine.schemas import StrategyCatalogItem, StrategyIndicators, StrategyIntent, StrategyRiskHints
 
@@ -64,10 +65,13 @@ class StrategyRunner:
         strategy = self.create_strategy(strategy_name, params)
 
         candles = await self._fetch_recent_candles(symbol_norm, timeframe_norm, limit=self.warmup_limit)
+        # One transpose at the fetch boundary; the strategy and gap check read columns
+        batch = CandleBatch.from_rows(candles) if candles else None
+        open_times = batch.open_time if batch is not None else ()
         if len(candles) < strategy.minimum_candles():
-            latest_ts = candles[-1].open_time if candles else None
+            latest_ts = open_times[-1] if open_times else None
             reason = "insufficient_data"
-            if self._has_gap(candles, timeframe_norm):
+            if self._has_gap(open_times, timeframe_norm):
                 reason = "insufficient_data,data_gap_detected"
             return StrategyIntent(
                 action="HOLD",
@@ -83,7 +87,7 @@ class StrategyRunner:
                 ),
             )
 
-        intent = strategy.compute_intent(candles)
+        intent = strategy.compute_intent(batch)
         if intent.symbol and intent.symbol != symbol_norm:
             raise RuntimeError("Strategy output symbol mismatch")
         if intent.timeframe and intent.timeframe != timeframe_norm:
@@ -92,30 +96,29 @@ class StrategyRunner:
         intent.symbol = symbol_norm
         intent.timeframe = timeframe_norm
 
-        if self._has_gap(candles, timeframe_norm):
+        if self._has_gap(open_times, timeframe_norm):
             intent.reason = f"{intent.reason},data_gap_detected"
             intent.summary = f"{intent.summary} [data_gap_detected]"
 
         return intent
 
-    async def _fetch_recent_candles(self, symbol: str, timeframe: str, *, limit: int) -> list[Candle]:
+    async def _fetch_recent_candles(self, symbol: str, timeframe: str, *, limit: int) -> list[Row]:
+        # Only the columns strategies read: plain rows, no Candle entity hydration
         stmt = (
-            select(Candle)
+            select(Candle.symbol, Candle.timeframe, Candle.open_time, Candle.high, Candle.low, Candle.close)
             .where(Candle.symbol == symbol, Candle.timeframe == timeframe)
             .order_by(Candle.open_time.desc())
             .limit(limit)
         )
         res = await self.session.execute(stmt)
-        candles_desc = list(res.scalars().all())
-        candles_desc.reverse()
-        return candles_desc
+        return res.all()[::-1]
 
     @staticmethod
-    def _has_gap(candles: list[Candle], timeframe: str) -> bool:
-        if len(candles) < 2:
+    def _has_gap(open_times: Sequence[datetime], timeframe: str) -> bool:
+        if len(open_times) < 2:
             return False
         expected_step = _timeframe_to_timedelta(timeframe)
-        for prev, curr in zip(candles[:-1], candles[1:]):
-            if (curr.open_time - prev.open_time) != expected_step:
+        for prev, curr in zip(open_times[:-1], open_times[1:]):
+            if (curr - prev) != expected_step:
                 return True
         return False
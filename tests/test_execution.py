@@ -5,7 +5,9 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 from sqlalchemy import text, select, func
 from app.marketdata.models import Base as MarketBase, Candle
 from app.execution.models import Account, Position, Order, Fill, Trade
-from app.execution.service import place_market_order, update_on_candle, mark_to_market, ensure_account
+from app.execution.service import (
+    bulk_record_trades, place_market_order, update_on_candle, update_on_candles, mark_to_market, ensure_account,
+)
 from datetime import datetime, timezone, timedelta
 
 
@@ -93,6 +95,35 @@ async def test_sl_trigger(session):
     assert len(executed) == 1
 
 
+@pytest.mark.asyncio
+async def test_update_on_candles_closes_batch(session):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    session.add_all([make_candle("EURUSD", close=1.3000, open_time=t0), make_candle("GBPUSD", close=1.2000, open_time=t0)])
+    await session.commit()
+    await place_market_order(session, "EURUSD", "BUY", 1.0, sl=1.2950)
+    await place_market_order(session, "GBPUSD", "SELL", 1.0, tp=1.1900)
+    balance_before = (await ensure_account(session)).balance
+
+    t1 = t0 + timedelta(minutes=5)
+    batch = [
+        Candle(symbol="EURUSD", timeframe="M5", open_time=t1, open=1.3000, high=1.3005, low=1.2940, close=1.2955, volume=0.0, source="mock"),
+        Candle(symbol="GBPUSD", timeframe="M5", open_time=t1, open=1.2000, high=1.2000, low=1.1890, close=1.1895, volume=0.0, source="mock"),
+    ]
+    session.add_all(batch)
+    await session.commit()
+
+    executed = await update_on_candles(session, batch)
+    assert [(e["symbol"], e["reason"]) for e in executed] == [("EURUSD", "stop_loss"), ("GBPUSD", "take_profit")]
+    assert (await session.execute(select(func.count()).select_from(Position))).scalar() == 0
+    assert (await session.execute(select(func.count(Trade.id)))).scalar() == 2
+
+    acct = (await session.execute(select(Account).execution_options(populate_existing=True))).scalar_one()
+    assert acct.balance == pytest.approx(balance_before + sum(e["pnl"] for e in executed))
+
+    # Re-running the same batch is a no-op.
+    assert await update_on_candles(session, batch) == []
+
+
 @pytest.mark.asyncio
 async def test_replay_determinism(session):
     # Create sequence of two candles
@@ -114,3 +145,112 @@ async def test_replay_determinism(session):
     res = await session.execute(stmt)
     count1 = res.scalar() or 0
     assert count1 >= 1
+
+
+@pytest.mark.asyncio
+async def test_latest_candle_cache_follows_candle_writes(session):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    session.add(make_candle(close=1.1000, open_time=t0))
+    await session.commit()
+    order1, _ = await place_market_order(session, "EURUSD", "BUY", 1.0)
+    assert order1.ts.replace(tzinfo=timezone.utc) == t0
+
+    # ORM insert of a newer candle must be visible to the next order.
+    session.add(make_candle(close=1.2000, open_time=t0 + timedelta(minutes=5)))
+    await session.commit()
+    order2, fill2 = await place_market_order(session, "EURUSD", "BUY", 1.0)
+    assert order2.ts.replace(tzinfo=timezone.utc) == t0 + timedelta(minutes=5)
+    assert fill2.price > 1.2
+
+    # Raw SQL deletes bypass the ORM and must still invalidate the cache.
+    await session.execute(text("DELETE FROM candles WHERE close > 1.15"))
+    await session.commit()
+    order3, fill3 = await place_market_order(session, "EURUSD", "SELL", 1.0)
+    assert order3.ts.replace(tzinfo=timezone.utc) == t0
+    assert fill3.price < 1.1
+
+
+@pytest.mark.asyncio
+async def test_place_market_order_rejects_unknown_side(session):
+    session.add(make_candle(close=1.1000, open_time=datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)))
+    await session.commit()
+
+    _, fill = await place_market_order(session, "EURUSD", "buy", 1.0)
+    assert fill.side == "BUY"
+
+    with pytest.raises(RuntimeError, match="Unsupported side"):
+        await place_market_order(session, "EURUSD", "HOLD", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_mark_to_market_cache_tracks_orders(session):
+    session.add(make_candle(close=1.1000, open_time=datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)))
+    await session.commit()
+    flat = await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    assert flat["unrealized"] == 0.0
+    assert await mark_to_market(session, "EURUSD", 1.2, 1.2002) == flat
+
+    # A new order moves the position, so the memoized result must be dropped.
+    await place_market_order(session, "EURUSD", "BUY", 1.0)
+    opened = await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    assert opened["unrealized"] > 0
+
+
+@pytest.mark.asyncio
+async def test_mark_to_market_skips_store_when_write_overlaps_read(session, monkeypatch):
+    from app.execution import service as execution_service
+
+    await ensure_account(session)
+    await session.commit()
+    real_execute = session.execute
+    calls = []
+
+    async def execute_with_concurrent_write(*args, **kwargs):
+        result = await real_execute(*args, **kwargs)
+        calls.append(args[0])
+        if len(calls) == 1:
+            # Another connection commits (and invalidates) while this read is in flight
+            execution_service._invalidate_mtm(session.get_bind())
+        return result
+
+    monkeypatch.setattr(session, "execute", execute_with_concurrent_write)
+    await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    assert len(calls) == 2  # the overlapped read was not cached
+
+    await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(execution_service, "MTM_CACHE_TTL_SECONDS", 0.0)
+    await mark_to_market(session, "EURUSD", 1.2, 1.2002)
+    assert len(calls) == 3  # expired entries are recomputed
+
+
+@pytest.mark.asyncio
+async def test_bulk_record_trades_skips_recorded_exits(session):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    row = {
+        "symbol": "EURUSD", "side": "SELL", "qty": 1.0, "exit_price": 1.09, "exit_reason": "stop_loss",
+        "ts": t0, "entry_ts": t0, "entry_price": 1.1, "pnl": -0.01, "entry_order_id": None,
+    }
+    first = await bulk_record_trades(session, [row])
+    second = await bulk_record_trades(session, [row])
+    await session.commit()
+
+    assert first[0] is not None and second == [None]
+    assert await session.scalar(select(func.count()).select_from(Trade)) == 1
+    assert await session.scalar(select(func.count()).select_from(Order)) == 1
+    assert await session.scalar(select(func.count()).select_from(Fill)) == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_closes_on_same_candle_record_separate_trades(session):
+    session.add(make_candle(close=1.1000, open_time=datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)))
+    await session.commit()
+
+    await place_market_order(session, "EURUSD", "BUY", 0.3)
+    await place_market_order(session, "EURUSD", "SELL", 0.1)
+    await place_market_order(session, "EURUSD", "SELL", 0.1)
+
+    reasons = (await session.execute(select(Trade.exit_reason))).scalars().all()
+    assert reasons == ["manual_close", "manual_close"]
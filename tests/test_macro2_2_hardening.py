@@ -11,6 +11,7 @@ from app.config import Config
 from app.execution.models import Fill, Order, Position
 from app.execution.service import ensure_account, place_market_order
 from app.marketdata.models import Base, Candle
+from app.marketdata.partitions import partition_bounds
 from app.marketdata.retention import prune_old_candles
 
 
@@ -182,8 +183,17 @@ async def test_prune_uses_open_time_not_ingested_time(session, monkeypatch):
 
     result = await prune_old_candles(session)
 
-    remaining = (await session.execute(select(func.count(Candle.id)))).scalar() or 0
+    remaining = (await session.execute(select(func.count()).select_from(Candle))).scalar() or 0
 
     assert result["deleted_count"] == 1
+    assert result["dropped_partitions"] == []
     assert "cutoff_time" in result
     assert remaining == 1
+
+
+def test_partition_bounds_skips_unrecognized_children():
+    lower, upper = partition_bounds("candles_2024_12")
+    assert lower == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert upper == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert partition_bounds("candles_default") is None
+    assert partition_bounds("candles_2024_13") is None
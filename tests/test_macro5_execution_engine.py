@@ -177,3 +177,20 @@ async def test_idempotency_no_duplicate_fill(session, monkeypatch):
     assert len(fills_first) == 1
     assert len(fills_second) == 0
     assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_order_enums_stored_in_canonical_case(session):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    t1 = t0 + timedelta(minutes=5)
+    session.add_all([make_candle(t0, 1.1000), make_candle(t1, 1.1010)])
+    session.add(Order(ts=t0, symbol="EURUSD", side="buy", type="MARKET", qty=1.0, status="new"))
+    await session.commit()
+
+    row = (await session.execute(select(Order.status, Order.side, Order.type))).one()
+    assert tuple(row) == ("NEW", "BUY", "market")
+
+    session.expire_all()
+    fills = await process_new_orders_for_candle(session, t1, symbol="EURUSD")
+    assert len(fills) == 1
+    assert (await session.execute(select(Order.status))).scalar_one() == "FILLED"
@@ -326,6 +326,30 @@ async def test_idempotent_daily_equity_creation_single_row(session):
     assert count == 1
 
 
+@pytest.mark.asyncio
+async def test_snapshot_marks_each_position_at_its_latest_candle(session):
+    t0 = await seed_basics(session)
+    t1 = t0 + timedelta(minutes=5)
+    session.add_all(
+        [
+            make_candle("GBPUSD", t1, 1.3000),
+            make_candle("GBPUSD", t1 + timedelta(minutes=5), 9.9999),
+            Position(symbol="EURUSD", qty_signed=2.0, avg_price=1.1, opened_at=t0, updated_at=t0),
+            Position(symbol="GBPUSD", qty_signed=-1.0, avg_price=1.25, opened_at=t0, updated_at=t0),
+        ]
+    )
+    await session.commit()
+
+    async with session.begin():
+        snapshot = await RiskEngine.compute_snapshot(session, account_id=1, asof_open_time=t1, symbol="EURUSD")
+
+    assert snapshot["asof_open_time"].replace(tzinfo=timezone.utc) == t0
+    assert snapshot["open_positions_count"] == 2
+    assert snapshot["open_positions_per_symbol"] == 1
+    assert snapshot["notional_per_symbol"] == pytest.approx(2.2)
+    assert snapshot["total_notional"] == pytest.approx(2.2 + 1.3)
+
+
 @pytest.mark.asyncio
 async def test_oms_integration_rejects_before_new_when_risk_denies(session):
     t0 = await seed_basics(session)
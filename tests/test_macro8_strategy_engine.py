@@ -4,6 +4,7 @@ import pytest
 
 from app.marketdata.models import Candle
 from app.strategy_engine.ema_atr import EmaAtrStrategy
+from app.strategy_engine.indicators import compute_atr, compute_ema, ema_atr_last
 from app.strategy_engine.service import StrategyRunner
 
 
@@ -118,3 +119,21 @@ def test_atr_risk_hints_sanity_for_buy():
 
     assert sl_dist == pytest.approx(1.5 * atr, rel=1e-9)
     assert tp_dist == pytest.approx(2.0 * atr, rel=1e-9)
+
+
+def test_ema_atr_last_matches_full_series():
+    closes = [1.1 + 0.001 * ((i * 7) % 11 - 5) for i in range(60)]
+    highs = [c + 0.0004 for c in closes]
+    lows = [c - 0.0006 for c in closes]
+
+    ema_fast = compute_ema(closes, 5)
+    ema_slow = compute_ema(closes, 20)
+    atr = compute_atr(highs, lows, closes, 14)
+
+    assert ema_atr_last(highs, lows, closes, 5, 20, 14) == (
+        ema_fast[-1],
+        ema_slow[-1],
+        atr[-1],
+        ema_fast[-2],
+        ema_slow[-2],
+    )
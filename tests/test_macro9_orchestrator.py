@@ -1,11 +1,15 @@
+import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.config import Config
+from app.marketdata.models import Candle
+from app.orchestrator.api import list_runs
 from app.orchestrator.models import RunReport
 from app.orchestrator.schemas import OrderPlan
 from app.orchestrator.service import OrchestratorService
@@ -93,11 +97,11 @@ async def test_idempotency_same_candle_no_second_trade(session: AsyncSession, mo
             "fill_id": 201,
         }
 
-    async def fake_get_fill(_fill_id: int):
-        return {"id": 201, "price": 1.1002, "qty": 1.0, "side": "BUY"}
-
-    async def fake_get_order(_order_id: int):
-        return {"id": 101, "status": "FILLED", "side": "BUY", "qty": 1.0}
+    async def fake_get_order_and_fill(_order_id: int, _fill_id: int):
+        return (
+            {"id": 101, "status": "FILLED", "side": "BUY", "qty": 1.0},
+            {"id": 201, "price": 1.1002, "qty": 1.0, "side": "BUY"},
+        )
 
     async def fake_process_accounting(*args, **kwargs):
         return SnapStub(
@@ -116,8 +120,7 @@ async def test_idempotency_same_candle_no_second_trade(session: AsyncSession, mo
     monkeypatch.setattr(service, "_compute_intent_for_candle", fake_intent)
     monkeypatch.setattr(service, "_build_order_plan", fake_plan)
     monkeypatch.setattr("app.orchestrator.service.place_order", fake_place_order)
-    monkeypatch.setattr(service, "_get_fill", fake_get_fill)
-    monkeypatch.setattr(service, "_get_order", fake_get_order)
+    monkeypatch.setattr(service, "_get_order_and_fill", fake_get_order_and_fill)
     monkeypatch.setattr("app.orchestrator.service.AccountingEngine.process_accounting_for_candle", fake_process_accounting)
     monkeypatch.setattr(service, "_positions_snapshot", fake_positions)
 
@@ -188,3 +191,145 @@ async def test_error_persists_run_report_with_error_text(session: AsyncSession,
     assert row.status == "ERROR"
     assert row.error_text is not None
     assert "forced_failure" in row.error_text
+
+
+@pytest.mark.asyncio
+async def test_rerun_after_error_upserts_same_report(session: AsyncSession, monkeypatch):
+    candle_ts = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    service = OrchestratorService(session)
+    fail = {"on": True}
+
+    async def fake_get_exact(symbol: str, timeframe: str, ts: datetime):
+        return CandleStub(open_time=ts, open=1.1000)
+
+    async def fake_mtm(_session: AsyncSession, candle: CandleStub):
+        if fail["on"]:
+            raise RuntimeError("forced_failure")
+        return {"equity": 10000.0, "ts": candle.open_time.isoformat()}
+
+    async def fake_intent(symbol: str, timeframe: str, ts: datetime):
+        return StrategyIntent(
+            action="HOLD",
+            reason="no_cross",
+            symbol=symbol,
+            timeframe=timeframe,
+            ts=ts,
+            indicators=StrategyIndicators(ema_fast=1.1, ema_slow=1.1, atr=0.001),
+            risk_hints=StrategyRiskHints(stop_loss_price=None, take_profit_price=None),
+            summary="hold signal",
+        )
+
+    monkeypatch.setattr(service, "_get_exact_candle", fake_get_exact)
+    monkeypatch.setattr("app.orchestrator.service.mark_to_market_account", fake_mtm)
+    monkeypatch.setattr(service, "_compute_intent_for_candle", fake_intent)
+
+    first = await service.run_cycle(symbol="EURUSD", timeframe="M5", candle_ts=candle_ts, mode="execute")
+    fail["on"] = False
+    second = await service.run_cycle(symbol="EURUSD", timeframe="M5", candle_ts=candle_ts, mode="execute")
+
+    assert first.status == "ERROR"
+    assert second.status == "NOOP"
+    assert second.run_id == first.run_id
+    row = (await session.execute(select(RunReport))).scalar_one()
+    assert row.status == "NOOP"
+    assert row.error_text is None
+
+
+@pytest.mark.asyncio
+async def test_list_runs_summary_skips_json_payloads(session: AsyncSession, monkeypatch):
+    candle_ts = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    service = OrchestratorService(session)
+
+    async def fake_get_exact(symbol: str, timeframe: str, ts: datetime):
+        return None
+
+    monkeypatch.setattr(service, "_get_exact_candle", fake_get_exact)
+    await service.run_cycle(symbol="EURUSD", timeframe="M5", candle_ts=candle_ts, mode="execute")
+
+    full = await service.list_runs(limit=10)
+    summary = await service.list_runs(limit=10, details=False)
+
+    assert len(full) == len(summary) == 1
+    assert "intent_json" in full[0]
+    assert not any(key.endswith("_json") for key in summary[0])
+    assert summary[0]["run_id"] == full[0]["run_id"]
+    assert summary[0]["status"] == "NOOP"
+
+
+@pytest.mark.asyncio
+async def test_runs_endpoint_summary_omits_payload_keys(session: AsyncSession, monkeypatch):
+    candle_ts = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    service = OrchestratorService(session)
+
+    async def fake_get_exact(symbol: str, timeframe: str, ts: datetime):
+        return None
+
+    monkeypatch.setattr(service, "_get_exact_candle", fake_get_exact)
+    await service.run_cycle(symbol="EURUSD", timeframe="M5", candle_ts=candle_ts, mode="execute")
+
+    full = json.loads((await list_runs(limit=10, details=True, session=session)).body)
+    summary = json.loads((await list_runs(limit=10, details=False, session=session)).body)
+
+    assert "intent_json" in full[0]
+    # Omitted payloads are absent, not reported as null
+    assert not any(key.endswith("_json") for key in summary[0])
+    assert summary[0]["run_id"] == full[0]["run_id"]
+
+
+@pytest.mark.asyncio
+async def test_run_cycles_writes_buffered_reports_once(session: AsyncSession, monkeypatch):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    t1 = datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc)
+    service = OrchestratorService(session)
+    executed = []
+
+    async def fake_get_exact(symbol: str, timeframe: str, ts: datetime):
+        executed.append(ts)
+        return None
+
+    monkeypatch.setattr(service, "_get_exact_candle", fake_get_exact)
+
+    results = await service.run_cycles(symbol="EURUSD", timeframe="M5", candle_ts_list=[t0, t1, t0], mode="execute")
+
+    assert executed == [t0, t1]
+    assert [r.status for r in results] == ["NOOP", "NOOP"]
+    rows = (await session.execute(select(RunReport).order_by(RunReport.candle_ts))).scalars().all()
+    assert [r.run_id for r in rows] == [r.run_id for r in results]
+    assert all(r.error_text == "missing_candle" for r in rows)
+
+
+@pytest.mark.asyncio
+async def test_window_cache_skips_misses_and_expires(tmp_path, monkeypatch):
+    # Two engines on one file: writes through the second are invisible to the first's write hooks
+    url = f"sqlite+aiosqlite:///{tmp_path / 'windows.db'}"
+    reader_engine = create_async_engine(url)
+    writer_engine = create_async_engine(url)
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(Candle.__table__.create)
+    candle_ts = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+
+    async with async_sessionmaker(reader_engine, expire_on_commit=False)() as session:
+        service = OrchestratorService(session)
+        assert await service._get_exact_candle("EURUSD", "M5", candle_ts) is None
+
+        async with writer_engine.begin() as conn:
+            await conn.execute(
+                Candle.__table__.insert().values(
+                    symbol="EURUSD", timeframe="M5", open_time=candle_ts,
+                    open=1.1, high=1.1, low=1.1, close=1.1, volume=0.0, source="mock",
+                )
+            )
+        # The earlier miss was not cached
+        row = await service._get_exact_candle("EURUSD", "M5", candle_ts)
+        assert row is not None and row.close == 1.1
+
+        async with writer_engine.begin() as conn:
+            await conn.execute(update(Candle.__table__).values(high=1.2, close=1.2))
+        assert (await service._get_exact_candle("EURUSD", "M5", candle_ts)).close == 1.1
+
+        # Expired entries are read afresh
+        monkeypatch.setattr(Config, "CANDLE_WINDOW_CACHE_TTL_SEC", 0.0)
+        assert (await service._get_exact_candle("EURUSD", "M5", candle_ts)).close == 1.2
+
+    await reader_engine.dispose()
+    await writer_engine.dispose()
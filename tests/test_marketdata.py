@@ -82,21 +82,42 @@ async def test_mock_provider_alignment(provider):
     assert first_time.minute % 5 == 0  # Should be on 5-minute boundary
 
 
+@pytest.mark.asyncio
+async def test_mock_provider_columns_match_dicts(provider):
+    """Test that the columnar batch and the list-of-dicts view carry the same candles."""
+    start = datetime(2024, 1, 31, 0, 0, 0, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 31, 1, 0, 0, tzinfo=timezone.utc)
+    
+    columns = await provider.fetch_candle_columns("EURUSD", "M5", start, end)
+    candles = await provider.fetch_candles("EURUSD", "M5", start, end)
+    
+    assert {len(values) for values in columns.values()} == {12}
+    assert [c["open_time"] for c in candles] == columns["open_time"]
+    assert [c["close"] for c in candles] == columns["close"]
+
+
 @pytest.mark.asyncio
 async def test_ingestion_idempotent(ingest_service, db_session):
     """Test that ingestion is idempotent (no duplicates on repeated ingest)."""
+    from sqlalchemy import select, func
+    
+    count_stmt = select(func.count()).select_from(Candle).where(
+        (Candle.symbol == "EURUSD") &
+        (Candle.timeframe == "M5")
+    )
     
     # First ingestion
     result1 = await ingest_service.ingest(db_session, "EURUSD", "M5")
-    count1 = result1["total_processed"]
+    count1 = (await db_session.execute(count_stmt)).scalar_one()
     
-    # Second ingestion (should have same result due to UPSERT)
-    result2 = await ingest_service.ingest(db_session, "EURUSD", "M5")
-    count2 = result2["total_processed"]
+    # Second ingestion only revisits the overlap window (UPSERT, no new rows)
+    await ingest_service.ingest(db_session, "EURUSD", "M5")
+    count2 = (await db_session.execute(count_stmt)).scalar_one()
     
-    # Count should be stable
-    assert count1 > 0
-    assert count2 >= count1  # Might have more due to overlap
+    assert result1["total_processed"] > 0
+    assert count1 == result1["total_processed"]
+    # At most one new candle, if the clock crossed a candle boundary in between
+    assert count1 <= count2 <= count1 + 1
 
 
 @pytest.mark.asyncio
@@ -107,26 +128,44 @@ async def test_integrity_detects_gaps(ingest_service, db_session):
     await ingest_service.ingest(db_session, "EURUSD", "M5")
     
     # Introduce a gap by deleting a candle
-    from sqlalchemy import delete, select, func
+    from sqlalchemy import delete, select
     
-    # Get a candle to delete
+    # Get a candle inside the integrity window (not at its edges) to delete
+    window_start = datetime.now(timezone.utc) - timedelta(days=3)
     stmt = select(Candle).where(
         (Candle.symbol == "EURUSD") &
-        (Candle.timeframe == "M5")
-    ).limit(1)
+        (Candle.timeframe == "M5") &
+        (Candle.open_time >= window_start)
+    ).order_by(Candle.open_time).offset(10).limit(1)
     result = await db_session.execute(stmt)
-    candle_to_delete = result.scalar()
+    candle_to_delete = result.scalar_one()
+    
+    delete_stmt = delete(Candle).where(
+        (Candle.symbol == candle_to_delete.symbol) &
+        (Candle.timeframe == candle_to_delete.timeframe) &
+        (Candle.open_time == candle_to_delete.open_time)
+    )
+    await db_session.execute(delete_stmt)
+    await db_session.commit()
+    
+    # Check integrity
+    integrity = await check_integrity(db_session, "EURUSD", "M5", days=7)
     
-    if candle_to_delete:
-        delete_stmt = delete(Candle).where(Candle.id == candle_to_delete.id)
-        await db_session.execute(delete_stmt)
-        await db_session.commit()
-        
-        # Check integrity
-        integrity = await check_integrity(db_session, "EURUSD", "M5", days=7)
-        
-        # Should detect missing
-        assert integrity["missing_count"] > 0 or integrity["actual_count"] < integrity["expected_count"]
+    # Should detect missing
+    assert integrity["missing_count"] > 0
+    assert integrity["actual_count"] < integrity["expected_count"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_skips_unchanged_overlap(ingest_service, db_session):
+    """Test that re-ingesting the overlap window does not rewrite stored candles."""
+    
+    await ingest_service.ingest(db_session, "EURUSD", "M5")
+    result = await ingest_service.ingest(db_session, "EURUSD", "M5")
+    
+    # Overlap candles come back identical from the deterministic provider
+    assert result["total_processed"] > 0
+    assert result["updated"] == 0
 
 
 @pytest.mark.asyncio
@@ -168,3 +207,40 @@ async def test_candle_ohlc_validation(ingest_service, db_session):
         ingest_service._normalize_and_validate(
             invalid_candles[0], "EURUSD", "M5"
         )
+
+
+@pytest.mark.asyncio
+async def test_get_candles_keyset_pagination(ingest_service, db_session):
+    """Test that the `after` cursor continues exactly where the previous page ended."""
+    from app.marketdata.router import get_candles
+    from app.marketdata.schemas import CandleListSchema
+    
+    start = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    await ingest_service.backfill(db_session, "EURUSD", "M5", start, start + timedelta(hours=1))
+    
+    page1 = CandleListSchema.model_validate_json((await get_candles(
+        symbol="EURUSD", timeframe="M5", start=None, end=None, after=None, limit=5, session=db_session
+    )).body)
+    page2 = CandleListSchema.model_validate_json((await get_candles(
+        symbol="EURUSD", timeframe="M5", start=None, end=None,
+        after=page1.latest, limit=5, session=db_session,
+    )).body)
+    
+    assert page1.count == 5 and page2.count == 5
+    assert page2.earliest - page1.latest == timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+async def test_latest_endpoint_cache_follows_ingest(ingest_service, db_session):
+    """Test that /latest serves from cache but sees candles ingested afterwards."""
+    from app.marketdata.router import get_latest_candle
+    
+    start = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    await ingest_service.backfill(db_session, "EURUSD", "M5", start, start + timedelta(hours=1))
+    first = await get_latest_candle(symbol="EURUSD", timeframe="M5", session=db_session)
+    again = await get_latest_candle(symbol="EURUSD", timeframe="M5", session=db_session)
+    assert again == first
+    
+    await ingest_service.backfill(db_session, "EURUSD", "M5", start, start + timedelta(hours=2))
+    latest = await get_latest_candle(symbol="EURUSD", timeframe="M5", session=db_session)
+    assert latest.open_time - first.open_time == timedelta(hours=1)
@@ -0,0 +1,83 @@
+import json
+import threading
+from datetime import datetime
+
+from app import notifier as notifier_module
+from app.notifier import Notifier
+
+
+class _Response:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+
+def test_send_event_queues_and_close_delivers(monkeypatch):
+    notifier = Notifier("http://webhook.invalid/hook")
+    delivered = []
+    release = threading.Event()
+
+    def fake_post(url, data, headers, timeout):
+        release.wait(timeout=5)
+        delivered.append(json.loads(data)["event_type"])
+        return _Response(200)
+
+    monkeypatch.setattr(notifier.session, "post", fake_post)
+
+    # Queueing returns immediately even while the webhook is blocked
+    assert notifier.send_started() is True
+    assert notifier.send_heartbeat({"iterations": 1}) is True
+    assert delivered == []
+
+    release.set()
+    notifier.close()
+    assert sorted(delivered) == ["heartbeat", "started"]
+
+
+def test_server_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(notifier_module, "RETRY_BASE_DELAY_SEC", 0.0)
+    notifier = Notifier("http://webhook.invalid/hook")
+    statuses = [503, 502, 200]
+
+    monkeypatch.setattr(notifier.session, "post", lambda *a, **kw: _Response(statuses.pop(0)))
+
+    notifier.send_event("error", {"message": "boom"})
+    notifier.close()
+    assert statuses == []
+
+
+def test_unencodable_event_is_dropped_without_killing_dispatcher(monkeypatch):
+    notifier = Notifier("http://webhook.invalid/hook")
+    delivered = []
+
+    def fake_post(url, data, headers, timeout):
+        delivered.append(json.loads(data)["event_type"])
+        return _Response(200)
+
+    monkeypatch.setattr(notifier.session, "post", fake_post)
+
+    assert notifier.send_event("bad", {"when": datetime(2025, 1, 1)}) is True
+    assert notifier.send_event("nan", {"value": float("nan")}) is True
+    assert notifier.send_event("good", {"message": "ok"}) is True
+    notifier.close()
+    assert delivered == ["good"]
+
+
+def test_dead_dispatcher_is_restarted(monkeypatch):
+    notifier = Notifier("http://webhook.invalid/hook")
+    delivered = []
+
+    def fake_post(url, data, headers, timeout):
+        delivered.append(json.loads(data)["event_type"])
+        return _Response(200)
+
+    monkeypatch.setattr(notifier.session, "post", fake_post)
+
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    notifier._dispatcher = dead
+
+    assert notifier.send_event("good", {"message": "ok"}) is True
+    notifier.close()
+    assert delivered == ["good"]
@@ -131,6 +131,8 @@ async def test_list_orders_filters_work(session):
     assert len(rows_filled) == 1
     assert len(rows_symbol) == 1
     assert rows_all[0]["ts"] >= rows_all[1]["ts"]
+    assert rows_filled[0]["fill_id"] is not None
+    assert {row["fill_id"] for row in rows_all if row["status"] == "REJECTED"} == {None}
 
 
 @pytest.mark.asyncio
@@ -157,3 +159,22 @@ async def test_cancel_new_order(session):
 
     order_db = (await session.execute(select(Order).where(Order.id == order.id))).scalar_one()
     assert order_db.status == "CANCELED"
+
+
+@pytest.mark.asyncio
+async def test_cancel_only_applies_to_new_orders(session):
+    t0 = datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc)
+    session.add(make_candle(t0, 1.1000))
+    await session.commit()
+
+    placed = await place_order(session, OMSPlaceOrderIn(symbol="EURUSD", side="BUY", qty=0.1, type="market"))
+    assert placed["status"] == "FILLED"
+
+    out = await cancel_order(session, placed["order_id"])
+    assert out == {
+        "order_id": placed["order_id"],
+        "status": "FILLED",
+        "reason": "Only NEW orders can be canceled",
+        "fill_id": placed["fill_id"],
+    }
+    assert await cancel_order(session, placed["order_id"] + 1000) is None